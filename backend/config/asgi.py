@@ -1,14 +1,5 @@
-
-cat > asgi.py << 'EOF'
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 application = get_asgi_application()
-EOF
-
-
-cat asgi.py
-
-
-cd ..
\ No newline at end of file
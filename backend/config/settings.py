@@ -22,6 +22,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tasks.metrics.MetricsMiddleware',
+    'tasks.instrumentation.ServerTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',  
     'django.middleware.security.SecurityMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -30,6 +32,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Must stay last: profiles only the view
+    'tasks.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -56,9 +60,33 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests so pragmas are applied once per connection
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # Seconds a writer waits for the lock before "database is locked"
+            'timeout': 20,
+        },
     }
 }
 
+# Applied by tasks.database on every new SQLite connection (defaults live there)
+# TASK_SQLITE_PRAGMAS = {'journal_mode': 'WAL', 'synchronous': 'NORMAL', ...}
+
+# analyze/suggest results are cached per dataset version; LocMemCache evicts
+# least recently used entries once MAX_ENTRIES is reached
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'analysis': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'task-analysis',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 256},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -120,11 +148,54 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
+    'x-profile-token',
 ]
 
+# Lets the frontend read ETags for conditional requests and stage timings
+CORS_EXPOSE_HEADERS = ['ETag', 'Server-Timing', 'X-Profile-Id']
+
+# Per-request Server-Timing headers (stages, SQL time, query count); the
+# middleware removes itself when this is off. Slower requests are logged.
+TASK_INSTRUMENTATION = False
+TASK_REQUEST_BUDGET_MS = 1000
+
+# tracemalloc peak/retained memory per stage, logged per request. A budget
+# (also enables tracking) aborts requests past it with a 503 instead of
+# letting the worker run out of memory.
+TASK_MEMORY_TRACKING = False
+TASK_MEMORY_BUDGET_MB = None
+
+# Directory shared by all worker processes so /api/metrics can sum their
+# counters; None keeps metrics per process
+TASK_METRICS_DIR = None
+
+# Requests carrying this token (X-Profile-Token header or ?profile=) run under
+# cProfile and dump .prof/.collapsed/.json files to TASK_PROFILING_DIR.
+# Leave either unset to remove the hook entirely.
+TASK_PROFILING_DIR = None
+TASK_PROFILING_TOKEN = None
+
 CORS_PREFLIGHT_MAX_AGE = 86400
 
 CSRF_TRUSTED_ORIGINS = [
     'http://localhost:3000',
     'http://127.0.0.1:3000',
-]
\ No newline at end of file
+]
+# CPU executor behind the async analyze/suggest/check_cycles endpoints:
+# 'thread' keeps the event loop free, 'process' also scores in parallel.
+# At most workers + queue depth jobs are admitted; the rest get a 503.
+TASK_ASYNC_EXECUTOR = 'thread'
+TASK_ASYNC_WORKERS = None
+TASK_ASYNC_QUEUE_DEPTH = 16
+
+# Stored scores: signals keep edits current and `manage.py rollover_scores`
+# (run daily after midnight, e.g. from cron) moves urgency with the date.
+# Requests only score up to this many never-scored tasks themselves.
+TASK_LAZY_RESCORE_LIMIT = 500
+
+# Batch scoring of at least TASK_PARALLEL_SCORING_THRESHOLD tasks is spread
+# over TASK_SCORING_WORKERS processes through shared memory; 1 keeps every
+# call in-process. Callers can override both per call.
+TASK_SCORING_WORKERS = 1
+TASK_PARALLEL_SCORING_THRESHOLD = 100000
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from tasks.views import metrics
 
 def api_root(request):
     return JsonResponse({
@@ -11,11 +12,13 @@ def api_root(request):
             'analyze': '/api/tasks/analyze/',
             'suggest': '/api/tasks/suggest/',
             'health': '/api/tasks/health/',
+            'metrics': '/api/metrics',
         }
     })
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api_root, name='api_root'),
+    path('api/metrics', metrics, name='metrics'),
     path('api/tasks/', include('tasks.urls')),
 ]
\ No newline at end of file
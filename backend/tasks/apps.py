@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'tasks'
+    
+    def ready(self):
+        # Keep persisted priority scores in sync with task and dependency changes
+        from . import signals  # noqa: F401
+        # Apply SQLite pragmas to every new connection
+        from . import database  # noqa: F401
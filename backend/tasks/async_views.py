@@ -0,0 +1,164 @@
+import json
+import traceback
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, HttpResponse, HttpResponseNotAllowed
+from .models import Task
+from .scoring import STRATEGIES
+from .dependencies import DependencyGraph, agraph_version, afetch_edges, afetch_neighbourhood_edges
+from .result_cache import aget_or_compute, aresult_key
+from .etags import adataset_etag, etag_matches
+from .offload import get_executor, ExecutorSaturated, RETRY_AFTER_SECONDS
+from .stored_scores import ensure_scores_current, score_field
+from .views import build_analysis, build_suggestions, build_cycle_report
+
+
+# Async counterparts of TaskViewSet.analyze, suggest and check_cycles for ASGI
+# deployments. Loading goes through the async ORM; scoring, graph work and
+# serialization run on the bounded executor, so one slow analyze never holds
+# the event loop. Responses match the sync endpoints.
+
+
+def analysis_job(tasks, edges, strategy):
+    graph = DependencyGraph()
+    graph.load_edges(edges)
+    return build_analysis(tasks, graph, strategy)
+
+
+def suggestion_job(winners, edges, strategy):
+    graph = DependencyGraph()
+    graph.load_edges(edges)
+    return build_suggestions(winners, graph, strategy)
+
+
+def cycle_job(titles, edges):
+    graph = DependencyGraph()
+    graph.load_edges(edges)
+    return build_cycle_report(titles, graph)
+
+
+def _read_json(request):
+    if not request.body:
+        return {}
+    data = json.loads(request.body)
+    if not isinstance(data, dict):
+        raise ValueError('Request body must be a JSON object')
+    return data
+
+
+def _saturated(e):
+    response = JsonResponse({'success': False, 'message': str(e)}, status=503)
+    response['Retry-After'] = str(RETRY_AFTER_SECONDS)
+    return response
+
+
+async def analyze(request):
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        data = _read_json(request)
+    except ValueError as e:
+        return JsonResponse({'message': f'Malformed request body: {str(e)}'}, status=400)
+    
+    try:
+        strategy = data.get('strategy', 'smart_balance')
+        if strategy not in STRATEGIES:
+            return JsonResponse(
+                {'message': f'Invalid strategy. Choose from: {", ".join(STRATEGIES)}'},
+                status=400
+            )
+        
+        fingerprint = await agraph_version()
+        etag = await adataset_etag('analyze', strategy, fingerprint=fingerprint)
+        if etag_matches(request, etag):
+            return HttpResponse(status=304, headers={'ETag': etag})
+        
+        async def compute():
+            tasks = [task async for task in Task.objects.all()]
+            if not tasks:
+                return {
+                    'strategy': strategy,
+                    'count': 0,
+                    'tasks': [],
+                    'message': 'No tasks to analyze'
+                }
+            edges = await afetch_edges()
+            return await get_executor().run(analysis_job, tasks, edges, strategy)
+        
+        result, hit = await aget_or_compute(await aresult_key('analyze', strategy, fingerprint=fingerprint), compute)
+        response = JsonResponse(result)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        response['ETag'] = etag
+        return response
+    
+    except ExecutorSaturated as e:
+        return _saturated(e)
+    except Exception as e:
+        traceback.print_exc()
+        return JsonResponse({'message': f'Analysis failed: {str(e)}'}, status=500)
+
+
+async def suggest(request):
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        data = _read_json(request)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': f'Malformed request body: {str(e)}'}, status=400)
+    
+    try:
+        count = int(data.get('count', 3))
+        strategy = data.get('strategy', 'smart_balance')
+        
+        async def compute():
+            await sync_to_async(ensure_scores_current)()
+            field = score_field(strategy)
+            queryset = Task.objects.order_by(f'-{field}', '-created_at')[:max(count, 0)]
+            winners = [task async for task in queryset]
+            if not winners:
+                return {
+                    'success': True,
+                    'suggested_tasks': [],
+                    'message': 'No tasks available'
+                }
+            edges = await afetch_neighbourhood_edges([task.id for task in winners])
+            return await get_executor().run(suggestion_job, winners, edges, strategy)
+        
+        result, hit = await aget_or_compute(await aresult_key('suggest', strategy, count), compute)
+        response = JsonResponse(result)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
+    
+    except ExecutorSaturated as e:
+        return _saturated(e)
+    except Exception as e:
+        traceback.print_exc()
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+async def check_cycles(request):
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    try:
+        titles = {task_id: title async for task_id, title in Task.objects.values_list('id', 'title')}
+        if not titles:
+            return JsonResponse({
+                'has_cycles': False,
+                'cycle_count': 0,
+                'cycles': [],
+                'affected_tasks': []
+            })
+        
+        edges = await afetch_edges()
+        return JsonResponse(await get_executor().run(cycle_job, titles, edges))
+    
+    except ExecutorSaturated as e:
+        return _saturated(e)
+    except Exception as e:
+        traceback.print_exc()
+        return JsonResponse({'message': f'Cycle check failed: {str(e)}'}, status=500)
+
+
+# Plain Django views get no DRF csrf_exempt, and Django 4.2's decorator is sync-only
+analyze.csrf_exempt = True
+suggest.csrf_exempt = True
+check_cycles.csrf_exempt = True
@@ -0,0 +1,287 @@
+import json
+import math
+import platform
+import random
+import statistics
+import time
+from datetime import date, timedelta
+import django
+import numpy as np
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from .holidays import calculate_business_days
+from .exporter import DEFAULT_CHUNK_SIZE
+from .result_cache import get_cache
+from .instrumentation import profile_request
+from .scoring import INPUT_ROWS, score_components
+from .parallel_scoring import score_parallel
+
+
+SHAPES = ['chain', 'fan_out', 'random_dag', 'cycles']
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+DEFAULT_REPEAT = 3
+
+PARALLEL_SIZES = [100000, 1000000]
+
+API_URL = '/api/tasks/'
+
+
+def _task_row(index, rng, today):
+    return {
+        'ref': str(index),
+        'title': f'Benchmark task {index}',
+        'due_date': (today + timedelta(days=rng.randint(-10, 60))).isoformat(),
+        'estimated_hours': rng.choice([0.5, 1, 2, 3, 5, 8, 13]),
+        'importance': rng.randint(1, 10),
+        'dependencies': [],
+    }
+
+
+def generate_tasks(shape, size, seed=0, today=None):
+    """
+    Synthetic import rows for a graph shape; dependencies name other rows by ref
+    chain: every task depends on the previous one
+    fan_out: a few hub tasks each block about a thousand others
+    random_dag: up to three dependencies on earlier tasks
+    cycles: random_dag plus one planted cycle per thousand tasks
+    """
+    if shape not in SHAPES:
+        raise ValueError(f'Unknown shape: {shape}. Choose from: {", ".join(SHAPES)}')
+    
+    rng = random.Random(seed)
+    today = today or date.today()
+    rows = [_task_row(i, rng, today) for i in range(size)]
+    
+    if shape == 'chain':
+        for i in range(1, size):
+            rows[i]['dependencies'] = [str(i - 1)]
+    
+    elif shape == 'fan_out':
+        hubs = max(1, size // 1000)
+        for i in range(hubs, size):
+            rows[i]['dependencies'] = [str(i % hubs)]
+    
+    else:
+        for i in range(1, size):
+            deps = {rng.randrange(i) for _ in range(rng.randint(0, 3))}
+            rows[i]['dependencies'] = [str(d) for d in sorted(deps)]
+        
+        if shape == 'cycles':
+            for _ in range(max(1, size // 1000)):
+                members = rng.sample(range(size), min(size, rng.randint(2, 6)))
+                for position, i in enumerate(members):
+                    dep = str(members[position - 1])
+                    if dep not in rows[i]['dependencies']:
+                        rows[i]['dependencies'].append(dep)
+    
+    return rows
+
+
+# Query ceilings per operation as a function of task count; exceeding one is a regression.
+# bulk_import is linear because SQLite caps parameters per INSERT, but far below one query per row.
+QUERY_CEILINGS = {
+    'bulk_import': lambda n: 10 + math.ceil(n / 25),
+    'analyze': lambda n: 4,
+    'analyze_cached': lambda n: 2,
+    'suggest': lambda n: 5,
+    'check_cycles': lambda n: 2,
+    'export': lambda n: 3 + math.ceil(n / DEFAULT_CHUNK_SIZE),
+    'calculate_business_days': lambda n: 0,
+}
+
+
+class BenchmarkRunner:
+    """
+    Times API operations against generated graphs and records query counts.
+    Each (shape, size) case is imported through bulk_import inside a
+    transaction that is rolled back afterwards, so cases never see each
+    other's rows and teardown is free.
+    """
+    
+    def __init__(self, repeat=DEFAULT_REPEAT, seed=0, strategy='smart_balance', memory=False):
+        self.repeat = max(1, repeat)
+        self.seed = seed
+        self.strategy = strategy
+        self.memory = memory
+        self.client = Client()
+        self.results = []
+    
+    def measure(self, shape, size, operation, func, repeat=None):
+        """
+        Run func repeat times; record timings and the query count of the first run.
+        With memory on, one extra untimed run records per-stage traced memory.
+        """
+        timings = []
+        queries = None
+        for _ in range(repeat or self.repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - started)
+            if queries is None:
+                queries = len(captured.captured_queries)
+        
+        ceiling = QUERY_CEILINGS[operation](size)
+        result = {
+            'shape': shape,
+            'size': size,
+            'operation': operation,
+            'runs': len(timings),
+            'seconds': {
+                'min': round(min(timings), 6),
+                'median': round(statistics.median(timings), 6),
+                'max': round(max(timings), 6),
+            },
+            'queries': queries,
+            'query_ceiling': ceiling,
+            'within_budget': queries <= ceiling,
+        }
+        if self.memory and operation != 'bulk_import':
+            with profile_request(memory=True) as profile:
+                func()
+                result['memory'] = profile.memory_summary()
+        
+        self.results.append(result)
+        return result
+    
+    def _post(self, path, payload):
+        response = self.client.post(API_URL + path, json.dumps(payload), content_type='application/json')
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} returned {response.status_code}')
+        return response
+    
+    def _get(self, path):
+        response = self.client.get(API_URL + path)
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} returned {response.status_code}')
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+    
+    def run_case(self, shape, size):
+        rows = generate_tasks(shape, size, self.seed)
+        strategy = {'strategy': self.strategy}
+        
+        def cold(func):
+            # Time the real computation, not a result cache hit
+            def run():
+                get_cache().clear()
+                func()
+            return run
+        
+        with transaction.atomic():
+            self.measure(shape, size, 'bulk_import', lambda: self._post('bulk_import/', {'tasks': rows}), repeat=1)
+            self.measure(shape, size, 'analyze', cold(lambda: self._post('analyze/', strategy)))
+            self.measure(shape, size, 'analyze_cached', lambda: self._post('analyze/', strategy))
+            self.measure(shape, size, 'suggest', cold(lambda: self._post('suggest/', {**strategy, 'count': 10})))
+            self.measure(shape, size, 'check_cycles', lambda: self._get('check_cycles/'))
+            self.measure(shape, size, 'export', lambda: self._get('export/?format=ndjson'))
+            
+            today = date.today()
+            due_dates = [row['due_date'] for row in rows]
+            self.measure(shape, size, 'calculate_business_days',
+                         lambda: [calculate_business_days(today, due) for due in due_dates])
+            
+            transaction.set_rollback(True)
+    
+    def run(self, shapes=None, sizes=None):
+        for size in sizes or DEFAULT_SIZES:
+            for shape in shapes or SHAPES:
+                self.run_case(shape, size)
+        return self.report()
+    
+    def report(self):
+        """Diffable result document: stable key order, one entry per case and operation"""
+        return {
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'numpy': np.__version__,
+                'database': connection.vendor,
+                'repeat': self.repeat,
+                'seed': self.seed,
+                'strategy': self.strategy,
+                'memory': self.memory,
+            },
+            'results': sorted(self.results, key=lambda r: (r['size'], r['shape'], r['operation'])),
+        }
+
+
+def compare_reports(baseline, current):
+    """
+    Median time ratio (current / baseline) for every case present in both
+    Returns: list of dicts sorted by ratio, slowest regressions first
+    """
+    def index(report):
+        return {(r['shape'], r['size'], r['operation']): r for r in report['results']}
+    
+    before, after = index(baseline), index(current)
+    rows = []
+    for key in before.keys() & after.keys():
+        old, new = before[key]['seconds']['median'], after[key]['seconds']['median']
+        rows.append({
+            'shape': key[0],
+            'size': key[1],
+            'operation': key[2],
+            'baseline': old,
+            'current': new,
+            'ratio': round(new / old, 3) if old else None,
+            'queries_delta': after[key]['queries'] - before[key]['queries'],
+        })
+    return sorted(rows, key=lambda r: -(r['ratio'] or 0))
+
+
+def synthetic_inputs(size, seed=0):
+    """Random score input matrix (see scoring.score_inputs) without touching the database"""
+    rng = np.random.default_rng(seed)
+    inputs = np.empty((len(INPUT_ROWS), size), dtype=np.float64)
+    inputs[0] = rng.integers(-10, 60, size)
+    inputs[1] = rng.random(size) < 0.9
+    inputs[2] = rng.integers(1, 11, size)
+    inputs[3] = rng.choice([0.5, 1, 2, 3, 5, 8, 13], size)
+    inputs[4] = rng.poisson(1.0, size)
+    inputs[5] = rng.poisson(1.0, size)
+    return inputs
+
+
+def parallel_speedup(sizes=None, worker_counts=(2, 4), repeat=DEFAULT_REPEAT, seed=0, k=10):
+    """
+    Median time to score and take the top k of synthetic inputs in-process
+    versus on process pools of each worker count. Model-to-array conversion
+    stays serial, so this isolates the part process-pool scoring speeds up.
+    Returns: list of dicts, one per (size, workers); workers 1 is in-process
+    """
+    rows = []
+    for size in sizes or PARALLEL_SIZES:
+        inputs = synthetic_inputs(size, seed)
+        
+        def inline():
+            scores = score_components(inputs)[1][:, 0]
+            np.argpartition(-scores, min(k, size - 1))[:k]
+        
+        cases = [(1, inline)] + [
+            (workers, lambda workers=workers: score_parallel(inputs, workers, k, matrices=False))
+            for workers in worker_counts
+        ]
+        baseline = None
+        for workers, func in cases:
+            # Warm-up run starts the pool's processes outside the timings
+            func()
+            timings = []
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - started)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            rows.append({
+                'size': size,
+                'workers': workers,
+                'median_seconds': round(median, 6),
+                'speedup': round(baseline / median, 2) if median else None,
+            })
+    return rows
@@ -0,0 +1,222 @@
+import math
+from collections import deque
+from datetime import datetime
+import numpy as np
+from django.conf import settings
+from .dependencies import DependencyGraph
+from .holidays import add_business_days, calculate_business_days_batch, holiday_calendar
+
+
+DEFAULT_HOURS_PER_DAY = 8
+
+
+def get_hours_per_day(value=None):
+    """Working hours per business day from an explicit value or the TASK_HOURS_PER_DAY setting"""
+    if value:
+        return max(0.5, float(value))
+    return getattr(settings, 'TASK_HOURS_PER_DAY', DEFAULT_HOURS_PER_DAY)
+
+
+class CriticalPath:
+    """
+    Longest chain of dependent work weighted by estimated_hours.
+    A task can start once all of its dependencies have finished, so one
+    topological pass (Kahn's algorithm) gives every task's earliest start
+    and finish, and a reverse pass gives the latest finish that does not
+    delay the whole project. Tasks caught in dependency cycles have no
+    valid order and are reported separately.
+    Tasks are addressed by row internally and edges are kept as flat
+    CSR lists, so a pass costs one list walk per task and per edge.
+    """
+    
+    def __init__(self, tasks, graph, today=None, hours_per_day=None):
+        """
+        tasks: iterable of (id, title, estimated_hours, due_date)
+        graph: a DependencyGraph, or (task_id, dependency_id) pairs such as
+        the dependencies through table's values_list
+        """
+        if today is None:
+            today = datetime.now().date()
+        self.today = today
+        self.hours_per_day = get_hours_per_day(hours_per_day)
+        
+        self.ids = []
+        self.titles = []
+        self.hours = []
+        self.due_dates = []
+        for task_id, title, estimated_hours, due_date in tasks:
+            self.ids.append(task_id)
+            self.titles.append(title)
+            self.hours.append(max(0.0, float(estimated_hours or 0)))
+            self.due_dates.append(due_date)
+        self.rows = {task_id: row for row, task_id in enumerate(self.ids)}
+        
+        self._compute(*self._edge_rows(graph))
+    
+    def _edge_rows(self, graph):
+        """(task rows, dependency rows) for edges between known tasks only"""
+        if isinstance(graph, DependencyGraph):
+            pairs = [(task_id, dep) for task_id, deps in graph.graph.items() for dep in deps]
+        else:
+            pairs = list(graph)
+        edges = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+        if not self.ids or not len(edges):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        
+        ids = np.array(self.ids, dtype=np.int64)
+        by_id = np.argsort(ids)
+        positions = np.minimum(np.searchsorted(ids[by_id], edges), len(ids) - 1)
+        known = (ids[by_id][positions] == edges).all(axis=1)
+        rows = by_id[positions[known]]
+        return rows[:, 0], rows[:, 1]
+    
+    def _compute(self, task_rows, dep_rows):
+        n = len(self.ids)
+        hours = self.hours
+        
+        # dependents[offsets[row]:offsets[row + 1]] are the rows waiting on row
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(dep_rows, minlength=n))
+        offsets = offsets.tolist()
+        dependents = task_rows[np.argsort(dep_rows, kind='stable')].tolist()
+        remaining = np.bincount(task_rows, minlength=n).tolist()
+        
+        earliest_start = [0.0] * n
+        earliest_finish = [None] * n
+        predecessor = [-1] * n
+        order = []
+        ready = deque(row for row in range(n) if remaining[row] == 0)
+        
+        while ready:
+            row = ready.popleft()
+            order.append(row)
+            finish = earliest_start[row] + hours[row]
+            earliest_finish[row] = finish
+            
+            for dependent in dependents[offsets[row]:offsets[row + 1]]:
+                if finish > earliest_start[dependent] or predecessor[dependent] < 0:
+                    earliest_start[dependent] = finish
+                    predecessor[dependent] = row
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        
+        self._order = order
+        self._earliest_start = earliest_start
+        self._earliest_finish = earliest_finish
+        self.order = [self.ids[row] for row in order]
+        self._split_unscheduled(task_rows, dep_rows)
+        self.total_hours = max((earliest_finish[row] for row in order), default=0.0)
+        
+        # Reverse pass: latest finish that keeps the project on total_hours;
+        # unscheduled (cyclic or blocked) dependents stay at infinity and never bind
+        latest_finish = [math.inf] * n
+        for row in reversed(order):
+            latest = self.total_hours
+            for dependent in dependents[offsets[row]:offsets[row + 1]]:
+                candidate = latest_finish[dependent] - hours[dependent]
+                if candidate < latest:
+                    latest = candidate
+            latest_finish[row] = latest
+        self._latest_finish = latest_finish
+        
+        self.path = []
+        if order:
+            row = max(order, key=earliest_finish.__getitem__)
+            while row >= 0:
+                self.path.append(self.ids[row])
+                row = predecessor[row]
+            self.path.reverse()
+    
+    def _split_unscheduled(self, task_rows, dep_rows):
+        """
+        Tasks Kahn's pass never reached are either in a cycle (cyclic_task_ids)
+        or only wait on one (blocked_task_ids); SCCs over just those rows tell them apart
+        """
+        unscheduled = np.array([finish is None for finish in self._earliest_finish], dtype=bool)
+        ids = np.array(self.ids, dtype=np.int64)
+        inside = unscheduled[task_rows] & unscheduled[dep_rows] if len(task_rows) else np.empty(0, dtype=bool)
+        graph = DependencyGraph()
+        graph.load_edges(
+            zip(ids[task_rows[inside]].tolist(), ids[dep_rows[inside]].tolist()),
+            ids[unscheduled].tolist()
+        )
+        cycle_nodes = graph.get_cycle_nodes()
+        
+        self.cyclic_task_ids = [task_id for task_id in ids[unscheduled].tolist() if task_id in cycle_nodes]
+        self.blocked_task_ids = [task_id for task_id in ids[unscheduled].tolist() if task_id not in cycle_nodes]
+    
+    def business_days_needed(self, hours):
+        return math.ceil(hours / self.hours_per_day) if hours > 0 else 0
+    
+    def finish_date(self, hours):
+        """Calendar date a piece of work ending at `hours` completes, starting today"""
+        return add_business_days(self.today, self.business_days_needed(hours))
+    
+    def _available_days(self, rows):
+        # Business days available up to and including each due date; counting
+        # the due date itself avoids stepping past date.max
+        due_dates = [self.due_dates[row] for row in rows]
+        return [
+            days + (due_date >= self.today and holiday_calendar.is_business_day(due_date))
+            for days, due_date in zip(calculate_business_days_batch(self.today, due_dates), due_dates)
+        ]
+    
+    def at_risk_ids(self):
+        """Scheduled tasks whose earliest finish misses their due date, in schedule order"""
+        rows = [row for row in self._order if self.due_dates[row] is not None]
+        return [
+            self.ids[row] for row, available_days in zip(rows, self._available_days(rows))
+            if round(available_days - self._earliest_finish[row] / self.hours_per_day, 2) < 0
+        ]
+    
+    def task_details(self, task_ids=None):
+        """Schedule and due-date slack for tasks (all scheduled tasks by default)"""
+        if task_ids is None:
+            rows = self._order
+        else:
+            rows = [self.rows[task_id] for task_id in task_ids if task_id in self.rows]
+            rows = [row for row in rows if self._earliest_finish[row] is not None]
+        
+        dated = [row for row in rows if self.due_dates[row] is not None]
+        available = dict(zip(dated, self._available_days(dated)))
+        
+        # Many tasks share a finish day, so resolve each day count once
+        finish_dates = {}
+        
+        details = []
+        for row in rows:
+            finish = self._earliest_finish[row]
+            latest = self._latest_finish[row]
+            due_date = self.due_dates[row]
+            days_needed = self.business_days_needed(finish)
+            if days_needed not in finish_dates:
+                finish_dates[days_needed] = str(add_business_days(self.today, days_needed))
+            slack = None
+            if row in available:
+                slack = round(available[row] - finish / self.hours_per_day, 2)
+            details.append({
+                'id': self.ids[row],
+                'title': self.titles[row],
+                'estimated_hours': self.hours[row],
+                'earliest_start_hours': self._earliest_start[row],
+                'earliest_finish_hours': finish,
+                'float_hours': round(latest - finish, 4),
+                'earliest_finish_date': finish_dates[days_needed],
+                'due_date': str(due_date) if due_date else None,
+                'slack_business_days': slack,
+                'is_critical': latest - finish <= 1e-9,
+            })
+        return details
+    
+    def summary(self):
+        return {
+            'total_hours': self.total_hours,
+            'business_days': self.business_days_needed(self.total_hours),
+            'finish_date': str(self.finish_date(self.total_hours)),
+            'hours_per_day': self.hours_per_day,
+            'path_length': len(self.path),
+            'scheduled_count': len(self.order),
+            'cyclic_task_ids': self.cyclic_task_ids,
+            'blocked_task_ids': self.blocked_task_ids,
+        }
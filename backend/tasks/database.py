@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# WAL lets readers proceed while a bulk import holds the write lock;
+# synchronous=NORMAL is durable under WAL except on power loss
+DEFAULT_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative values are KiB rather than pages
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def get_sqlite_pragmas():
+    """Pragmas applied to each new SQLite connection; TASK_SQLITE_PRAGMAS setting"""
+    return getattr(settings, 'TASK_SQLITE_PRAGMAS', DEFAULT_SQLITE_PRAGMAS)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas().items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from django.db.models import Q, Count, Max
 
 
 class DependencyGraph:
@@ -9,70 +10,399 @@ class DependencyGraph:
         self.graph = {}  
         self.reverse_graph = {} 
     
+    @classmethod
+    def from_database(cls, task_ids=None):
+        """
+        Build the graph from the dependencies through table in one query.
+        When task_ids is given only those tasks (and edges between them)
+        are included, otherwise every task with an edge is.
+        """
+        from .models import Task
+        
+        edges = Task.dependencies.through.objects.values_list('from_task_id', 'to_task_id')
+        graph = cls()
+        graph.load_edges(edges, task_ids)
+        return graph
+    
+    @classmethod
+    def from_neighbourhood(cls, task_ids):
+        """
+        Build the graph of every edge touching task_ids, so each of those
+        tasks has complete direct fan-in and fan-out
+        """
+        from .models import Task
+        
+        task_ids = list(task_ids)
+        through = Task.dependencies.through
+        edges = []
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            edges.extend(
+                through.objects.filter(Q(from_task_id__in=chunk) | Q(to_task_id__in=chunk))
+                .values_list('from_task_id', 'to_task_id')
+            )
+        
+        graph = cls()
+        graph.load_edges(edges)
+        return graph
+    
+    def load_edges(self, edges, task_ids=None):
+        """Build forward and reverse adjacency sets from (task_id, dependency_id) pairs"""
+        self.graph = {}
+        self.reverse_graph = {}
+        
+        if task_ids is not None:
+            for task_id in task_ids:
+                self.graph[task_id] = set()
+                self.reverse_graph[task_id] = set()
+        
+        for task_id, dep_id in edges:
+            if task_id not in self.graph:
+                if task_ids is not None:
+                    continue
+                self.graph[task_id] = set()
+                self.reverse_graph[task_id] = set()
+            if dep_id not in self.graph:
+                if task_ids is not None:
+                    continue
+                self.graph[dep_id] = set()
+                self.reverse_graph[dep_id] = set()
+            self.graph[task_id].add(dep_id)
+            self.reverse_graph[dep_id].add(task_id)
+    
     def build_graph(self, tasks):
         """Build dependency graph from tasks"""
         self.graph = {}
         self.reverse_graph = {}
         
         for task in tasks:
-            self.graph[task.id] = []
-            self.reverse_graph[task.id] = []
+            self.graph[task.id] = set()
+            self.reverse_graph[task.id] = set()
         
         for task in tasks:
             try:
                 deps = task.dependencies.all() if hasattr(task.dependencies, 'all') else (task.dependencies or [])
                 for dep in deps:
                     dep_id = dep.id if hasattr(dep, 'id') else dep
-                    if dep_id not in self.graph[task.id]:
-                        self.graph[task.id].append(dep_id)
-                    if task.id not in self.reverse_graph.get(dep_id, []):
-                        self.reverse_graph[dep_id].append(task.id)
+                    if dep_id in self.reverse_graph:
+                        self.graph[task.id].add(dep_id)
+                        self.reverse_graph[dep_id].add(task.id)
             except:
                 pass
     
-    def detect_cycles(self, tasks):
-        """Detect circular dependencies using DFS"""
-        self.build_graph(tasks)
-        visited = set()
-        rec_stack = set()
-        cycles = []
-        
-        def dfs(node, path):
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
+    def strongly_connected_components(self):
+        """
+        Tarjan's algorithm, iterative so long dependency chains cannot hit
+        the recursion limit. Runs in O(V + E) and returns every component
+        as a list of task ids in discovery order.
+        """
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+        
+        for root in self.graph:
+            if root in index:
+                continue
             
-            for neighbor in self.graph.get(node, []):
-                if neighbor not in visited:
-                    if dfs(neighbor, path[:]):
-                        return True
-                elif neighbor in rec_stack:
-                    # Found a cycle
-                    cycle_start = path.index(neighbor)
-                    cycle = path[cycle_start:] + [neighbor]
-                    cycles.append(cycle)
-                    return True
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.graph.get(root, ())))]
             
-            rec_stack.remove(node)
-            return False
+            while work:
+                node, neighbors = work[-1]
+                descended = False
+                
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self.graph.get(neighbor, ()))))
+                        descended = True
+                        break
+                    elif neighbor in on_stack and index[neighbor] < lowlink[node]:
+                        lowlink[node] = index[neighbor]
+                
+                if descended:
+                    continue
+                
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.reverse()
+                    components.append(component)
         
-        for task in tasks:
-            if task.id not in visited:
-                dfs(task.id, [])
-        
-        return cycles
+        return components
     
-    def get_dependency_info(self, tasks):
-        """Get dependency information for all tasks"""
+    def find_cycles(self):
+        """Every cyclic component (more than one task, or a task depending on itself) as task ids"""
+        return [
+            component for component in self.strongly_connected_components()
+            if len(component) > 1 or component[0] in self.graph.get(component[0], ())
+        ]
+    
+    def get_cycle_nodes(self):
+        """Set of task ids that take part in any circular dependency"""
+        return {task_id for component in self.find_cycles() for task_id in component}
+    
+    def reachability(self):
+        """Transitive reachability index for this graph, built on first use"""
+        if getattr(self, '_reachability', None) is None:
+            self._reachability = ReachabilityIndex(self)
+        return self._reachability
+    
+    def get_blocked_tasks(self, task_id):
+        """Every task this task is transitively blocked by (all upstream tasks)"""
+        return self.reachability().upstream(task_id)
+    
+    def get_blocking_tasks(self, task_id):
+        """Every task this task transitively blocks (all downstream tasks)"""
+        return self.reachability().downstream(task_id)
+    
+    def detect_cycles(self, tasks):
+        """Detect circular dependencies among tasks"""
         self.build_graph(tasks)
+        return self.find_cycles()
+    
+    def get_dependency_info(self, tasks, rebuild=True):
+        """Get dependency information for all tasks"""
+        if rebuild:
+            self.build_graph(tasks)
         info = {}
         
         for task in tasks:
             info[task.id] = {
-                'blocked_by': self.graph.get(task.id, []),
-                'blocks': self.reverse_graph.get(task.id, []),
+                'blocked_by': sorted(self.graph.get(task.id, [])),
+                'blocks': sorted(self.reverse_graph.get(task.id, [])),
                 'blocked_count': len(self.graph.get(task.id, [])),
                 'blocking_count': len(self.reverse_graph.get(task.id, []))
             }
         
-        return info
\ No newline at end of file
+        return info
+
+
+class ReachabilityIndex:
+    """
+    Transitive closure over the condensed dependency DAG.
+    Strongly connected components are collapsed to single nodes and each
+    component's upstream/downstream closure is kept as an int bitset over
+    component numbers, computed lazily and memoized, so repeated queries
+    cost one bitset walk instead of a graph traversal.
+    """
+    
+    def __init__(self, graph):
+        # Tarjan emits components in reverse topological order, so every
+        # component's dependencies get lower numbers than the component
+        self.components = graph.strongly_connected_components()
+        self.component_of = {}
+        for number, members in enumerate(self.components):
+            for task_id in members:
+                self.component_of[task_id] = number
+        
+        self._dependencies = [set() for _ in self.components]
+        self._dependents = [set() for _ in self.components]
+        for task_id, deps in graph.graph.items():
+            source = self.component_of[task_id]
+            for dep_id in deps:
+                target = self.component_of.get(dep_id)
+                if target is not None and target != source:
+                    self._dependencies[source].add(target)
+                    self._dependents[target].add(source)
+        
+        self._upstream = {}
+        self._downstream = {}
+    
+    def _closure(self, component, edges, memo):
+        """Bitset of components reachable from component along edges (iterative post-order)"""
+        stack = [component]
+        while stack:
+            current = stack[-1]
+            if current in memo:
+                stack.pop()
+                continue
+            
+            pending = [nxt for nxt in edges[current] if nxt not in memo]
+            if pending:
+                stack.extend(pending)
+                continue
+            
+            bits = 0
+            for nxt in edges[current]:
+                bits |= memo[nxt] | (1 << nxt)
+            memo[current] = bits
+            stack.pop()
+        
+        return memo[component]
+    
+    def _expand(self, task_id, bits):
+        """Task ids in the components of a bitset plus the task's own cycle mates"""
+        own = self.component_of[task_id]
+        result = [member for member in self.components[own] if member != task_id]
+        while bits:
+            lowest = bits & -bits
+            result.extend(self.components[lowest.bit_length() - 1])
+            bits ^= lowest
+        return result
+    
+    def upstream(self, task_id):
+        """Every task blocking task_id, directly or transitively"""
+        if task_id not in self.component_of:
+            return []
+        bits = self._closure(self.component_of[task_id], self._dependencies, self._upstream)
+        return self._expand(task_id, bits)
+    
+    def downstream(self, task_id):
+        """Every task blocked by task_id, directly or transitively"""
+        if task_id not in self.component_of:
+            return []
+        bits = self._closure(self.component_of[task_id], self._dependents, self._downstream)
+        return self._expand(task_id, bits)
+
+
+SUBGRAPH_DIRECTIONS = ['upstream', 'downstream', 'both']
+
+QUERY_CHUNK_SIZE = 500
+
+
+def extract_subgraph(seed_ids, hops=1, direction='both', max_nodes=None):
+    """
+    Bounded BFS from seed tasks over the indexed through table, one query
+    per hop and direction, so only the neighbourhood is ever loaded.
+    direction: 'upstream' follows dependencies, 'downstream' follows
+    dependents, 'both' follows either.
+    Returns: (graph induced on the reached tasks, {task_id: hops from seed}, truncated)
+    """
+    from .models import Task
+    
+    through = Task.dependencies.through
+    distance = {task_id: 0 for task_id in seed_ids}
+    frontier = list(distance)
+    truncated = False
+    
+    for hop in range(1, hops + 1):
+        if not frontier:
+            break
+        
+        reached = []
+        for start in range(0, len(frontier), QUERY_CHUNK_SIZE):
+            chunk = frontier[start:start + QUERY_CHUNK_SIZE]
+            if direction in ('upstream', 'both'):
+                reached.extend(through.objects.filter(from_task_id__in=chunk).values_list('to_task_id', flat=True))
+            if direction in ('downstream', 'both'):
+                reached.extend(through.objects.filter(to_task_id__in=chunk).values_list('from_task_id', flat=True))
+        
+        frontier = []
+        for task_id in reached:
+            if task_id in distance:
+                continue
+            if max_nodes is not None and len(distance) >= max_nodes:
+                truncated = True
+                break
+            distance[task_id] = hop
+            frontier.append(task_id)
+        if truncated:
+            break
+    
+    # Induced subgraph: every edge between reached tasks, not only BFS edges
+    node_ids = list(distance)
+    edges = []
+    for start in range(0, len(node_ids), QUERY_CHUNK_SIZE):
+        edges.extend(
+            through.objects.filter(from_task_id__in=node_ids[start:start + QUERY_CHUNK_SIZE])
+            .values_list('from_task_id', 'to_task_id')
+        )
+    
+    graph = DependencyGraph()
+    graph.load_edges(edges, task_ids=node_ids)
+    return graph, distance, truncated
+
+
+def _format_version(tasks, edges):
+    updated = tasks['updated'].isoformat() if tasks['updated'] else ''
+    return f"{tasks['count']}-{updated}-{edges['count']}-{edges['last'] or 0}"
+
+
+def graph_version():
+    """
+    Cheap fingerprint of tasks and dependency edges; changes whenever a
+    task is added, edited or deleted or an edge is added or removed
+    """
+    from .models import Task
+    
+    tasks = Task.objects.aggregate(count=Count('id'), updated=Max('updated_at'))
+    edges = Task.dependencies.through.objects.aggregate(count=Count('id'), last=Max('id'))
+    return _format_version(tasks, edges)
+
+
+async def agraph_version():
+    """graph_version() through the async ORM"""
+    from .models import Task
+    
+    tasks = await Task.objects.aaggregate(count=Count('id'), updated=Max('updated_at'))
+    edges = await Task.dependencies.through.objects.aaggregate(count=Count('id'), last=Max('id'))
+    return _format_version(tasks, edges)
+
+
+async def afetch_edges():
+    """Every (task_id, dependency_id) pair through the async ORM, for load_edges()"""
+    from .models import Task
+    
+    through = Task.dependencies.through
+    return [edge async for edge in through.objects.values_list('from_task_id', 'to_task_id')]
+
+
+async def afetch_neighbourhood_edges(task_ids):
+    """Async counterpart of the from_neighbourhood() edge query"""
+    from .models import Task
+    
+    task_ids = list(task_ids)
+    through = Task.dependencies.through
+    edges = []
+    for start in range(0, len(task_ids), QUERY_CHUNK_SIZE):
+        chunk = task_ids[start:start + QUERY_CHUNK_SIZE]
+        queryset = (
+            through.objects.filter(Q(from_task_id__in=chunk) | Q(to_task_id__in=chunk))
+            .values_list('from_task_id', 'to_task_id')
+        )
+        edges.extend([edge async for edge in queryset])
+    return edges
+
+
+# (graph_version(), index), replaced as one tuple so readers never mix the two
+_reachability_cache = {'entry': None}
+
+
+def get_reachability_index():
+    """
+    Process-wide reachability index over every task.
+    Tagged with the graph_version() fingerprint and rebuilt when it moves, so
+    bulk writes and other processes' edits are picked up without signals.
+    """
+    version = graph_version()
+    entry = _reachability_cache['entry']
+    if entry is None or entry[0] != version:
+        entry = (version, DependencyGraph.from_database().reachability())
+        _reachability_cache['entry'] = entry
+    return entry[1]
+
+
+def invalidate_reachability_index():
+    """Drop the cached index; called whenever dependencies change"""
+    _reachability_cache['entry'] = None
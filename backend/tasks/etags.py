@@ -0,0 +1,41 @@
+import hashlib
+from datetime import date
+from rest_framework import status
+from rest_framework.response import Response
+from .dependencies import graph_version, agraph_version
+
+
+def dataset_etag(*parts, today=None, fingerprint=None):
+    """
+    Strong ETag from the dataset fingerprint (task count, max updated_at,
+    edge count), the current date and request specific parts such as the
+    strategy or query string. Costs two aggregate queries, no scoring.
+    """
+    return _make_etag(fingerprint or graph_version(), today, parts)
+
+
+async def adataset_etag(*parts, today=None, fingerprint=None):
+    """dataset_etag() for async views"""
+    return _make_etag(fingerprint or await agraph_version(), today, parts)
+
+
+def _make_etag(version, today, parts):
+    today = today or date.today()
+    raw = ':'.join([version, today.isoformat(), *map(str, parts)])
+    return '"' + hashlib.sha1(raw.encode('utf-8')).hexdigest()[:24] + '"'
+
+
+def etag_matches(request, etag):
+    """True when the client's If-None-Match already names etag"""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # Compression middleware may weaken the tag, so compare opaque values only
+    tags = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return etag in tags
+
+
+def not_modified(etag):
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
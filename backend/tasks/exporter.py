@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+import zlib
+from .models import Task
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+EXPORT_FIELDS = ['id', 'title', 'due_date', 'estimated_hours', 'importance']
+
+CSV_COLUMNS = ['ref', 'title', 'due_date', 'estimated_hours', 'importance', 'dependencies']
+
+
+def iter_task_chunks(queryset, include_deps=True, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield lists of export rows, chunk_size at a time.
+    Rows come from a server-side iterator and dependencies are fetched
+    once per chunk from the through table, so memory stays bounded.
+    """
+    through = Task.dependencies.through
+    chunk = []
+    
+    def finish(rows):
+        if include_deps:
+            deps = {row['id']: [] for row in rows}
+            for from_id, to_id in through.objects.filter(
+                from_task_id__in=list(deps)
+            ).values_list('from_task_id', 'to_task_id'):
+                deps[from_id].append(to_id)
+        
+        for row in rows:
+            row['due_date'] = str(row['due_date']) if row['due_date'] else None
+            row['estimated_hours'] = float(row['estimated_hours']) if row['estimated_hours'] else 0
+            row['importance'] = int(row['importance'])
+            if include_deps:
+                row['dependencies'] = deps[row['id']]
+        return rows
+    
+    for row in queryset.values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield finish(chunk)
+            chunk = []
+    
+    if chunk:
+        yield finish(chunk)
+
+
+def _import_row(row):
+    # 'ref' lets the file round-trip through stream_import
+    task_dict = {'ref': str(row['id'])}
+    task_dict.update({key: value for key, value in row.items() if key != 'id'})
+    if 'dependencies' in task_dict:
+        task_dict['dependencies'] = [str(dep) for dep in task_dict['dependencies']]
+    return task_dict
+
+
+def iter_ndjson(chunks):
+    for rows in chunks:
+        yield ''.join(json.dumps(_import_row(row), ensure_ascii=False) + '\n' for row in rows)
+
+
+def iter_csv(chunks, include_deps=True):
+    columns = CSV_COLUMNS if include_deps else CSV_COLUMNS[:-1]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    
+    for rows in chunks:
+        for row in rows:
+            task_dict = _import_row(row)
+            if include_deps:
+                task_dict['dependencies'] = ';'.join(task_dict['dependencies'])
+            writer.writerow(task_dict)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_stream(pieces):
+    """Compress a stream of text pieces into gzip bytes on the fly"""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for piece in pieces:
+        data = compressor.compress(piece.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,4 +1,5 @@
 from datetime import datetime, date, timedelta  
+import numpy as np
 
 def get_indian_holidays(year):
     """
@@ -28,60 +29,163 @@ def get_indian_holidays(year):
     ]
     return holidays
 
+# The Gregorian calendar repeats its weekdays every 400 years (146097 days,
+# a whole number of weeks) and the holidays fall on fixed dates, so one
+# compiled cycle answers business-day questions for every date
+CYCLE_DAYS = 146097
+
+CYCLE_START = date(2000, 1, 1).toordinal()
+
+
+class HolidayCalendar:
+    """
+    Precompiled holiday and business-day index.
+    Holidays are kept as a per-year frozenset of dates and business days
+    as a cumulative count over one 400-year cycle, so lookups and
+    business-day differences are constant time for any date once the
+    cycle is compiled.
+    """
+    
+    def __init__(self):
+        self._holiday_dates = {}
+        self._holiday_names = {}
+        # (prefix, business days per cycle), published as one tuple so
+        # readers on other threads never see half of a rebuild
+        self._index = None
+    
+    def holidays_for_year(self, year):
+        """Frozenset of holiday dates for a year, compiled on first use"""
+        dates = self._holiday_dates.get(year)
+        if dates is None:
+            holidays = get_indian_holidays(year)
+            for holiday in holidays:
+                self._holiday_names[holiday['date']] = holiday['name']
+            dates = frozenset(holiday['date'] for holiday in holidays)
+            self._holiday_dates[year] = dates
+        return dates
+    
+    def holiday_name(self, check_date):
+        """Holiday name for a date, or None"""
+        if check_date in self.holidays_for_year(check_date.year):
+            return self._holiday_names[check_date]
+        return None
+    
+    def is_business_day(self, check_date):
+        return check_date.weekday() < 5 and check_date not in self.holidays_for_year(check_date.year)
+    
+    def _get_index(self):
+        """Business-day prefix sums over one cycle from CYCLE_START, compiled on first use"""
+        index = self._index
+        if index is None:
+            # date.toordinal() is 1 for Monday 0001-01-01
+            business = (np.arange(CYCLE_START, CYCLE_START + CYCLE_DAYS) - 1) % 7 < 5
+            year = date.fromordinal(CYCLE_START).year
+            holidays = [
+                holiday['date'].toordinal() - CYCLE_START
+                for offset in range(400) for holiday in get_indian_holidays(year + offset)
+            ]
+            business[holidays] = False
+            
+            # prefix[i] = business days in [CYCLE_START, CYCLE_START + i)
+            prefix = np.zeros(CYCLE_DAYS + 1, dtype=np.int64)
+            np.cumsum(business, out=prefix[1:])
+            index = self._index = (prefix, int(prefix[-1]))
+        return index
+    
+    def _count(self, ordinal):
+        """Business days from CYCLE_START up to (not including) an ordinal, negative before it"""
+        prefix, per_cycle = self._get_index()
+        cycles, offset = divmod(ordinal - CYCLE_START, CYCLE_DAYS)
+        return cycles * per_cycle + int(prefix[offset])
+    
+    def business_days_between(self, from_date, to_date):
+        """Business days in [from_date, to_date)"""
+        if from_date >= to_date:
+            return 0
+        return self._count(to_date.toordinal()) - self._count(from_date.toordinal())
+    
+    def add_business_days(self, from_date, days):
+        """
+        Date on which the days-th business day counted from from_date
+        (inclusive) falls; from_date itself when days <= 0, and date.max
+        when that day lies past the end of the calendar
+        """
+        if days <= 0:
+            return from_date
+        
+        prefix, per_cycle = self._get_index()
+        target = self._count(from_date.toordinal()) + days
+        # First ordinal whose count reaches target, found within its cycle
+        cycles, remainder = divmod(target - 1, per_cycle)
+        position = int(np.searchsorted(prefix, remainder + 1))
+        ordinal = CYCLE_START + cycles * CYCLE_DAYS + position - 1
+        return date.fromordinal(min(ordinal, date.max.toordinal()))
+    
+    def business_days_until_many(self, from_date, to_dates):
+        """Business days from one date to each of many dates (None stays None)"""
+        present = [i for i, d in enumerate(to_dates) if d is not None]
+        result = [None] * len(to_dates)
+        if not present:
+            return result
+        
+        prefix, per_cycle = self._get_index()
+        ordinals = np.array([to_dates[i].toordinal() for i in present], dtype=np.int64)
+        cycles, offsets = np.divmod(ordinals - CYCLE_START, CYCLE_DAYS)
+        counts = np.maximum(0, cycles * per_cycle + prefix[offsets] - self._count(from_date.toordinal()))
+        for i, count in zip(present, counts.tolist()):
+            result[i] = count
+        return result
+
+
+holiday_calendar = HolidayCalendar()
+
+
+def _to_date(value):
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    elif isinstance(value, datetime):
+        return value.date()
+    return value
+
 def is_indian_holiday(check_date):
     """
     Check if a given date is an Indian holiday
     Returns: {'is_holiday': bool, 'name': str or None}
     """
-    if isinstance(check_date, str):
-        check_date = datetime.strptime(check_date, '%Y-%m-%d').date()
-    elif isinstance(check_date, datetime):
-        check_date = check_date.date()
-    
-    holidays = get_indian_holidays(check_date.year)
+    name = holiday_calendar.holiday_name(_to_date(check_date))
     
-    for holiday in holidays:
-        if holiday['date'] == check_date:
-            return {'is_holiday': True, 'name': holiday['name']}
-    
-    return {'is_holiday': False, 'name': None}
+    return {'is_holiday': name is not None, 'name': name}
 
 def is_weekend(check_date):
     """
     Check if a given date is a weekend (Saturday or Sunday)
     Returns: bool
     """
-    if isinstance(check_date, str):
-        check_date = datetime.strptime(check_date, '%Y-%m-%d').date()
-    elif isinstance(check_date, datetime):
-        check_date = check_date.date()
-
-    return check_date.weekday() in [5, 6]
+    return _to_date(check_date).weekday() >= 5
 
 def calculate_business_days(from_date, to_date):
     """
     Calculate business days between two dates (excluding weekends and Indian holidays)
     Returns: int
     """
-    if isinstance(from_date, str):
-        from_date = datetime.strptime(from_date, '%Y-%m-%d').date()
-    elif isinstance(from_date, datetime):
-        from_date = from_date.date()
-    
-    if isinstance(to_date, str):
-        to_date = datetime.strptime(to_date, '%Y-%m-%d').date()
-    elif isinstance(to_date, datetime):
-        to_date = to_date.date()
-    
-    business_days = 0
-    current_date = from_date
-    
-    while current_date < to_date:
-    
-        if not is_weekend(current_date) and not is_indian_holiday(current_date)['is_holiday']:
-            business_days += 1
-        current_date = current_date + timedelta(days=1) 
-    return business_days
+    return holiday_calendar.business_days_between(_to_date(from_date), _to_date(to_date))
+
+def calculate_business_days_batch(from_date, to_dates):
+    """
+    Calculate business days from one date to each of many due dates
+    Returns: list of int (None for missing dates)
+    """
+    return holiday_calendar.business_days_until_many(
+        _to_date(from_date),
+        [_to_date(d) if d else None for d in to_dates]
+    )
+
+def add_business_days(from_date, days):
+    """
+    Date of the days-th business day counted from from_date (inclusive)
+    Returns: date
+    """
+    return holiday_calendar.add_business_days(_to_date(from_date), days)
 
 def get_urgency_label(days_until_due):
     """
@@ -0,0 +1,250 @@
+import csv
+import json
+from datetime import datetime
+from django.conf import settings
+from django.db import transaction
+from .models import Task
+from .stored_scores import rescore_with_neighbours
+from .result_cache import bump_dataset_version
+from .dependencies import invalidate_reachability_index
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Separator for dependency references inside a single CSV cell
+CSV_DEPENDENCY_SEPARATOR = ';'
+
+
+def get_batch_size(value=None):
+    """Import batch size from an explicit value or the TASK_IMPORT_BATCH_SIZE setting"""
+    if value:
+        return max(1, int(value))
+    return getattr(settings, 'TASK_IMPORT_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def iter_ndjson_rows(lines):
+    """
+    Parse NDJSON incrementally
+    Yields: (row_number, dict) or (row_number, ValueError) for unparseable lines
+    """
+    row_number = 0
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.strip()
+        if not line:
+            continue
+        row_number += 1
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError('Each line must be a JSON object')
+            yield row_number, row
+        except ValueError as e:
+            yield row_number, ValueError(f'Invalid JSON: {str(e)}')
+
+
+def iter_csv_rows(lines):
+    """
+    Parse CSV incrementally; dependencies are separated by ';' in one cell
+    Yields: (row_number, dict)
+    """
+    decoded = (line.decode('utf-8') if isinstance(line, bytes) else line for line in lines)
+    for row_number, row in enumerate(csv.DictReader(decoded), start=1):
+        deps = (row.get('dependencies') or '').strip()
+        row['dependencies'] = [d.strip() for d in deps.split(CSV_DEPENDENCY_SEPARATOR) if d.strip()]
+        yield row_number, row
+
+
+def iter_rows(lines, format_type):
+    if format_type == 'ndjson':
+        return iter_ndjson_rows(lines)
+    elif format_type == 'csv':
+        return iter_csv_rows(lines)
+    raise ValueError(f'Unsupported import format: {format_type}')
+
+
+def clean_task_row(data):
+    """
+    Normalize one imported row into Task fields
+    Raises: ValueError with a per-row message
+    """
+    title = data.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise ValueError('Title is required')
+    if len(title.strip()) > 255:
+        raise ValueError('Title must be less than 255 characters')
+    
+    due_date = data.get('due_date') or None
+    if due_date:
+        try:
+            due_date = datetime.strptime(str(due_date), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError('Due date must be in YYYY-MM-DD format')
+    
+    try:
+        estimated_hours = float(data.get('estimated_hours')) if data.get('estimated_hours') else 0
+        importance = int(data.get('importance')) if data.get('importance') else 5
+    except (TypeError, ValueError) as e:
+        raise ValueError(f'Invalid data type: {str(e)}')
+    
+    return {
+        'title': title.strip(),
+        'due_date': due_date,
+        'estimated_hours': estimated_hours,
+        'importance': max(1, min(10, importance)),
+        'description': data.get('description') or '',
+    }
+
+
+class TaskImporter:
+    """
+    Batched task importer.
+    Rows are inserted with bulk_create in batches, each batch in its own
+    transaction. Dependencies may name a client 'ref' from anywhere in the
+    same import (including later rows) or an existing task id; they are
+    resolved once every row is in and written to the through table in bulk.
+    """
+    
+    def __init__(self, batch_size=None, collect_created=False):
+        self.batch_size = get_batch_size(batch_size)
+        self.collect_created = collect_created
+        
+        self.ref_ids = {}
+        self.seen_refs = set()
+        self.pending_edges = []
+        self.created_ids = []
+        self.created_tasks = []
+        self.failed_tasks = []
+        # Rows that were created but lost a dependency reference
+        self.warnings = []
+        self.total_rows = 0
+        
+        self._batch = []
+    
+    def run(self, rows):
+        """Import (row_number, data) pairs and return the summary"""
+        for row_number, data in rows:
+            self.add_row(row_number, data)
+        return self.finish()
+    
+    def add_row(self, row_number, data):
+        self.total_rows += 1
+        
+        if isinstance(data, Exception):
+            self._fail(row_number, None, 'Untitled', str(data))
+            return
+        if not isinstance(data, dict):
+            self._fail(row_number, None, 'Untitled', 'Each task must be an object')
+            return
+        
+        ref = data.get('ref')
+        ref = str(ref) if ref not in (None, '') else None
+        try:
+            cleaned = clean_task_row(data)
+            if ref is not None and ref in self.seen_refs:
+                raise ValueError(f'Duplicate ref: {ref}')
+        except ValueError as e:
+            self._fail(row_number, ref, data.get('title') or 'Untitled', str(e))
+            return
+        
+        deps = data.get('dependencies') or []
+        if not isinstance(deps, list):
+            deps = [deps]
+        if ref is not None:
+            self.seen_refs.add(ref)
+        
+        self._batch.append((row_number, ref, Task(**cleaned), [str(d) for d in deps]))
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+    
+    def finish(self):
+        self._flush()
+        self._write_edges()
+        
+        # bulk_create skips post_save, so refresh stored scores explicitly
+        if self.created_ids:
+            rescore_with_neighbours(self.created_ids, source='import')
+            bump_dataset_version()
+            invalidate_reachability_index()
+        
+        return {
+            'created_count': len(self.created_ids),
+            'failed_count': len(self.failed_tasks),
+            'total_rows': self.total_rows,
+            'created_tasks': self.created_tasks if self.collect_created else None,
+            'failed_tasks': self.failed_tasks if self.failed_tasks else None,
+            'warnings': self.warnings if self.warnings else None,
+        }
+    
+    def _fail(self, row_number, ref, title, error):
+        self.failed_tasks.append({
+            'index': row_number,
+            'ref': ref,
+            'title': title,
+            'error': error
+        })
+    
+    def _warn(self, row_number, ref, task_id, title, message):
+        self.warnings.append({
+            'index': row_number,
+            'ref': ref,
+            'id': task_id,
+            'title': title,
+            'warning': message
+        })
+    
+    def _flush(self):
+        if not self._batch:
+            return
+        
+        with transaction.atomic():
+            created = Task.objects.bulk_create([task for _, _, task, _ in self._batch])
+        
+        for (row_number, ref, _, deps), task in zip(self._batch, created):
+            self.created_ids.append(task.id)
+            if ref is not None:
+                self.ref_ids[ref] = task.id
+            for dep in deps:
+                self.pending_edges.append((row_number, ref, task.id, task.title, dep))
+            if self.collect_created:
+                self.created_tasks.append({'id': task.id, 'title': task.title, 'ref': ref, 'created': True})
+        
+        self._batch = []
+    
+    def _write_edges(self):
+        """Resolve dependency references and insert through rows in batches"""
+        # References not matching a ref in this import may be existing task ids
+        unresolved_ids = {
+            int(dep) for _, _, _, _, dep in self.pending_edges
+            if dep not in self.ref_ids and dep.isdigit()
+        }
+        existing_ids = set()
+        unresolved_list = list(unresolved_ids)
+        for start in range(0, len(unresolved_list), 500):
+            existing_ids.update(
+                Task.objects.filter(id__in=unresolved_list[start:start + 500]).values_list('id', flat=True)
+            )
+        
+        through = Task.dependencies.through
+        edges = []
+        for row_number, ref, task_id, title, dep in self.pending_edges:
+            if dep in self.ref_ids:
+                dep_id = self.ref_ids[dep]
+            elif dep.isdigit() and int(dep) in existing_ids:
+                dep_id = int(dep)
+            else:
+                self._warn(row_number, ref, task_id, title, f'Unknown dependency: {dep} (task created without it)')
+                continue
+            edges.append(through(from_task_id=task_id, to_task_id=dep_id))
+            
+            if len(edges) >= self.batch_size:
+                with transaction.atomic():
+                    through.objects.bulk_create(edges, ignore_conflicts=True)
+                edges = []
+        
+        if edges:
+            with transaction.atomic():
+                through.objects.bulk_create(edges, ignore_conflicts=True)
+        
+        self.pending_edges = []
@@ -0,0 +1,244 @@
+import logging
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import JsonResponse
+
+
+DEFAULT_REQUEST_BUDGET_MS = 1000
+
+MB = 1024 * 1024
+
+logger = logging.getLogger('tasks.instrumentation')
+
+_current = ContextVar('task_request_profile', default=None)
+
+# Shared no-op returned by stage() when no request is being profiled
+_NOOP = nullcontext()
+
+
+def instrumentation_enabled():
+    return getattr(settings, 'TASK_INSTRUMENTATION', False)
+
+
+def memory_tracking_enabled():
+    """tracemalloc stage tracking; on with TASK_MEMORY_TRACKING or a memory budget"""
+    return bool(getattr(settings, 'TASK_MEMORY_TRACKING', False) or get_memory_budget_mb())
+
+
+def get_request_budget_ms():
+    """Requests slower than this are logged; TASK_REQUEST_BUDGET_MS setting"""
+    return getattr(settings, 'TASK_REQUEST_BUDGET_MS', DEFAULT_REQUEST_BUDGET_MS)
+
+
+def get_memory_budget_mb():
+    """Peak traced memory a request may allocate; TASK_MEMORY_BUDGET_MB setting (None for no limit)"""
+    return getattr(settings, 'TASK_MEMORY_BUDGET_MB', None)
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised at a stage boundary once a request's traced peak passes its budget"""
+
+
+class RequestProfile:
+    """
+    Query count, SQL time and per-stage wall time for one request; with
+    memory=True also per-stage peak and retained traced memory.
+    tracemalloc is process wide, so concurrent requests in other threads
+    inflate each other's memory figures.
+    """
+    
+    def __init__(self, memory=False, memory_budget_mb=None):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.stages = {}
+        
+        self.memory = memory and tracemalloc.is_tracing()
+        self.memory_budget = memory_budget_mb * MB if memory_budget_mb else None
+        self.memory_stages = {}
+        self.budget_exceeded = None
+        # [start bytes, highest peak seen] for every open stage, outermost first
+        self._open = []
+        if self.memory:
+            tracemalloc.reset_peak()
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+            self.memory_peak = self.memory_start
+    
+    def __call__(self, execute, sql, params, many, context):
+        # Installed as a connection execute_wrapper
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+    
+    def add_stage(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+    
+    def _note_peak(self, peak):
+        # reset_peak() forgets earlier peaks, so carry them to every open stage
+        self.memory_peak = max(self.memory_peak, peak)
+        for entry in self._open:
+            entry[1] = max(entry[1], peak)
+    
+    def _check_budget(self):
+        if self.memory_budget and self.memory_peak - self.memory_start > self.memory_budget:
+            self.budget_exceeded = self.memory_peak - self.memory_start
+            raise MemoryBudgetExceeded(
+                f'Request memory budget exceeded: peak {self.budget_exceeded / MB:.1f}MB '
+                f'> {self.memory_budget / MB:.0f}MB'
+            )
+    
+    def enter_memory_stage(self):
+        current, peak = tracemalloc.get_traced_memory()
+        self._note_peak(peak)
+        self._check_budget()
+        tracemalloc.reset_peak()
+        self._open.append([current, current])
+    
+    def exit_memory_stage(self, name):
+        current, peak = tracemalloc.get_traced_memory()
+        start, stage_peak = self._open.pop()
+        stage_peak = max(stage_peak, peak)
+        self._note_peak(stage_peak)
+        
+        totals = self.memory_stages.setdefault(name, {'peak': 0, 'retained': 0})
+        totals['peak'] = max(totals['peak'], stage_peak - start)
+        totals['retained'] += current - start
+        self._check_budget()
+    
+    def memory_summary(self):
+        """Per-stage peak and retained traced memory in KiB, plus the request peak"""
+        current, peak = tracemalloc.get_traced_memory()
+        self._note_peak(peak)
+        return {
+            'peak_kb': round((self.memory_peak - self.memory_start) / 1024, 1),
+            'retained_kb': round((current - self.memory_start) / 1024, 1),
+            'stages': {
+                name: {'peak_kb': round(values['peak'] / 1024, 1), 'retained_kb': round(values['retained'] / 1024, 1)}
+                for name, values in self.memory_stages.items()
+            },
+        }
+    
+    def total_seconds(self):
+        return time.perf_counter() - self.started
+    
+    def server_timing(self, total_seconds):
+        """Server-Timing header value, durations in milliseconds"""
+        metrics = []
+        for name, seconds in self.stages.items():
+            metric = f'{name};dur={seconds * 1000:.2f}'
+            if name in self.memory_stages:
+                values = self.memory_stages[name]
+                metric += f';desc="peak {values["peak"] / MB:.2f}MB, retained {values["retained"] / MB:.2f}MB"'
+            metrics.append(metric)
+        metrics.append(f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.queries} queries"')
+        metrics.append(f'total;dur={total_seconds * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+class _Stage:
+    __slots__ = ('profile', 'name', 'started')
+    
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+    
+    def __enter__(self):
+        if self.profile.memory:
+            self.profile.enter_memory_stage()
+        self.started = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.profile.add_stage(self.name, time.perf_counter() - self.started)
+        if self.profile.memory:
+            self.profile.exit_memory_stage(self.name)
+        return False
+
+
+def stage(name):
+    """
+    Time a block as a named stage of the current request.
+    Outside a profiled request this is a shared no-op context manager.
+    """
+    profile = _current.get()
+    if profile is None:
+        return _NOOP
+    return _Stage(profile, name)
+
+
+@contextmanager
+def profile_request(memory=False, memory_budget_mb=None):
+    """Collect stages, queries and optionally memory for the enclosed block"""
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    
+    profile = RequestProfile(memory=memory, memory_budget_mb=memory_budget_mb)
+    token = _current.set(profile)
+    try:
+        with connection.execute_wrapper(profile):
+            yield profile
+    finally:
+        _current.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+class ServerTimingMiddleware:
+    """
+    Adds a Server-Timing header (stages, SQL time and query count, total)
+    and logs requests slower than the configured budget. With memory
+    tracking on it also logs per-stage memory and turns requests that
+    exceed TASK_MEMORY_BUDGET_MB into a clean 503.
+    Removed from the stack entirely unless TASK_INSTRUMENTATION or memory
+    tracking is on.
+    """
+    
+    def __init__(self, get_response):
+        self.timing = instrumentation_enabled()
+        self.memory = memory_tracking_enabled()
+        if not (self.timing or self.memory):
+            raise MiddlewareNotUsed
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.get_response = get_response
+        self.budget_ms = get_request_budget_ms()
+        self.memory_budget_mb = get_memory_budget_mb()
+    
+    def __call__(self, request):
+        with profile_request(memory=self.memory, memory_budget_mb=self.memory_budget_mb) as profile:
+            response = self.get_response(request)
+        
+        if profile.budget_exceeded:
+            logger.error('%s %s aborted: peak %.1fMB over the %sMB memory budget',
+                         request.method, request.path, profile.budget_exceeded / MB, self.memory_budget_mb)
+            return JsonResponse({
+                'success': False,
+                'message': 'Request exceeded its memory budget; narrow the request or raise TASK_MEMORY_BUDGET_MB',
+                'peak_mb': round(profile.budget_exceeded / MB, 1),
+                'budget_mb': self.memory_budget_mb,
+            }, status=503)
+        
+        total = profile.total_seconds()
+        if self.timing:
+            response['Server-Timing'] = profile.server_timing(total)
+        
+        if self.memory:
+            logger.info('%s %s memory %s', request.method, request.path, profile.memory_summary())
+        
+        if self.timing and total * 1000 > self.budget_ms:
+            logger.warning(
+                '%s %s took %.1fms (budget %sms): %d queries, %.1fms SQL, stages %s',
+                request.method, request.path, total * 1000, self.budget_ms,
+                profile.queries, profile.sql_seconds * 1000,
+                {name: round(seconds * 1000, 1) for name, seconds in profile.stages.items()}
+            )
+        return response
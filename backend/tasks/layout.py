@@ -0,0 +1,223 @@
+import math
+import numpy as np
+
+
+DEFAULT_ITERATIONS = 60
+
+DEFAULT_WIDTH = 1000
+
+DEFAULT_HEIGHT = 500
+
+DEFAULT_PADDING = 50
+
+# Largest quadtree depth; finest cells then hold a handful of nodes
+MAX_LEVELS = 10
+
+# Node-iterations budget; big graphs get fewer (still >= MIN_ITERATIONS) passes
+ITERATION_BUDGET = 300000
+
+MIN_ITERATIONS = 15
+
+
+def dependency_depths(graph, node_ids):
+    """
+    Depth level per task: 0 without dependencies, otherwise one more than
+    its deepest dependency. Cycles are collapsed so every member shares a level.
+    """
+    depth = {}
+    # Tarjan emits a component only after every component it depends on
+    for component in graph.strongly_connected_components():
+        members = set(component)
+        level = 0
+        for task_id in component:
+            for dep_id in graph.graph.get(task_id, ()):
+                if dep_id not in members and dep_id in depth:
+                    level = max(level, depth[dep_id] + 1)
+        for task_id in component:
+            depth[task_id] = level
+    
+    return np.array([depth.get(task_id, 0) for task_id in node_ids], dtype=np.int64)
+
+
+def _scatter_add(target, rows, values):
+    """target[rows] += values for repeated rows (np.bincount is far faster than np.add.at)"""
+    n = len(target)
+    target[:, 0] += np.bincount(rows, weights=values[:, 0], minlength=n)
+    target[:, 1] += np.bincount(rows, weights=values[:, 1], minlength=n)
+
+
+def _cell_aggregates(cells, positions, grid):
+    """
+    Dense cell table for one quadtree level: index of every cell into the
+    occupied-cell arrays (-1 when empty), plus their mass and centre of mass
+    """
+    keys = cells[:, 0] * grid + cells[:, 1]
+    unique_keys, inverse, mass = np.unique(keys, return_inverse=True, return_counts=True)
+    centre = np.zeros((len(unique_keys), 2))
+    _scatter_add(centre, inverse, positions)
+    centre /= mass[:, None]
+    
+    table = np.full(grid * grid, -1, dtype=np.int64)
+    table[unique_keys] = np.arange(len(unique_keys))
+    return table, mass, centre
+
+
+def barnes_hut_repulsion(positions, strength):
+    """
+    Approximate all-pairs repulsion strength / d in O(n log n).
+    Positions are in the unit square. The quadtree is stored level by level
+    as occupied-cell aggregates; at each level a node interacts with the
+    cells that are children of its parent's neighbours but not its own
+    neighbours (the standard Barnes-Hut/FMM interaction list), and with
+    individual nodes only inside its 3x3 neighbourhood at the finest level.
+    """
+    n = len(positions)
+    forces = np.zeros_like(positions)
+    if n < 2:
+        return forces
+    
+    levels = int(min(MAX_LEVELS, max(2, math.ceil(math.log(n, 4)) + 1)))
+    offsets = np.arange(-2, 4)
+    
+    for level in range(2, levels + 1):
+        grid = 2 ** level
+        cells = np.minimum((positions * grid).astype(np.int64), grid - 1)
+        table, mass, centre = _cell_aggregates(cells, positions, grid)
+        
+        parent = cells // 2
+        for dx in offsets:
+            cx = parent[:, 0] * 2 + dx
+            for dy in offsets:
+                cy = parent[:, 1] * 2 + dy
+                near = (np.abs(cx - cells[:, 0]) <= 1) & (np.abs(cy - cells[:, 1]) <= 1)
+                valid = ~near & (cx >= 0) & (cx < grid) & (cy >= 0) & (cy < grid)
+                if not valid.any():
+                    continue
+                
+                rows = np.flatnonzero(valid)
+                index = table[cx[rows] * grid + cy[rows]]
+                hit = index >= 0
+                rows, index = rows[hit], index[hit]
+                
+                delta = positions[rows] - centre[index]
+                dist_sq = np.maximum((delta ** 2).sum(axis=1), 1e-9)
+                forces[rows] += delta * (strength * mass[index] / dist_sq)[:, None]
+    
+    # Near field: exact interactions with nodes in the 3x3 finest-level neighbourhood
+    grid = 2 ** levels
+    cells = np.minimum((positions * grid).astype(np.int64), grid - 1)
+    keys = cells[:, 0] * grid + cells[:, 1]
+    order = np.argsort(keys, kind='stable')
+    cell_counts = np.bincount(keys, minlength=grid * grid)
+    cell_starts = np.cumsum(cell_counts) - cell_counts
+    
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            cx = cells[:, 0] + dx
+            cy = cells[:, 1] + dy
+            valid = (cx >= 0) & (cx < grid) & (cy >= 0) & (cy < grid)
+            query = np.where(valid, cx * grid + cy, 0)
+            start = cell_starts[query]
+            counts = np.where(valid, cell_counts[query], 0)
+            if not counts.any():
+                continue
+            
+            sources = np.repeat(np.arange(n), counts)
+            first = np.repeat(start, counts)
+            within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            targets = order[first + within]
+            keep = sources != targets
+            sources, targets = sources[keep], targets[keep]
+            
+            delta = positions[sources] - positions[targets]
+            dist_sq = np.maximum((delta ** 2).sum(axis=1), 1e-9)
+            _scatter_add(forces, sources, delta * (strength / dist_sq)[:, None])
+    
+    return forces
+
+
+def force_directed_layout(n, sources, targets, depths=None, iterations=DEFAULT_ITERATIONS, seed=0):
+    """
+    Fruchterman-Reingold layout in the unit square with Barnes-Hut repulsion.
+    sources/targets are index arrays of edges; depths seed the x axis so
+    dependency levels read left to right. Deterministic for a given seed.
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.random((n, 2))
+    if n == 0:
+        return positions
+    if depths is not None and depths.max() > 0:
+        positions[:, 0] = 0.1 + 0.8 * depths / depths.max() + rng.normal(0, 0.02, n)
+    
+    k = 1.0 / math.sqrt(n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    
+    for _ in range(iterations):
+        forces = barnes_hut_repulsion(positions, k * k)
+        
+        if len(sources):
+            delta = positions[sources] - positions[targets]
+            dist = np.maximum(np.sqrt((delta ** 2).sum(axis=1)), 1e-9)
+            pull = delta * (dist / k)[:, None]
+            _scatter_add(forces, sources, -pull)
+            _scatter_add(forces, targets, pull)
+        
+        length = np.maximum(np.sqrt((forces ** 2).sum(axis=1)), 1e-9)
+        positions += forces / length[:, None] * np.minimum(length, temperature)[:, None]
+        
+        # Re-normalize into the unit square for the next quadtree
+        low = positions.min(axis=0)
+        span = np.maximum(positions.max(axis=0) - low, 1e-9)
+        positions = (positions - low) / span * 0.999
+        temperature -= cooling
+    
+    return positions
+
+
+def compute_graph_layout(graph, tasks, width=DEFAULT_WIDTH, height=DEFAULT_HEIGHT,
+                         padding=DEFAULT_PADDING, iterations=None):
+    """
+    Layout payload for the dependency graph view
+    tasks: iterable of (id, title)
+    Returns: dict of parallel arrays plus an edge list of node indices
+    (dependency index -> dependent index)
+    """
+    node_ids = []
+    titles = []
+    for task_id, title in tasks:
+        node_ids.append(task_id)
+        titles.append(title)
+    position_of = {task_id: index for index, task_id in enumerate(node_ids)}
+    
+    edges = [
+        (position_of[dep_id], position_of[task_id])
+        for task_id in node_ids
+        for dep_id in graph.graph.get(task_id, ())
+        if dep_id in position_of
+    ]
+    edge_array = np.array(edges, dtype=np.int64).reshape(-1, 2)
+    
+    if iterations is None:
+        iterations = max(MIN_ITERATIONS, min(DEFAULT_ITERATIONS, ITERATION_BUDGET // max(len(node_ids), 1)))
+    
+    depths = dependency_depths(graph, node_ids)
+    positions = force_directed_layout(
+        len(node_ids), edge_array[:, 0], edge_array[:, 1], depths, iterations
+    )
+    
+    x = padding + positions[:, 0] * (width - 2 * padding)
+    y = padding + positions[:, 1] * (height - 2 * padding)
+    cycle_nodes = graph.get_cycle_nodes()
+    
+    return {
+        'width': width,
+        'height': height,
+        'ids': node_ids,
+        'titles': titles,
+        'x': np.round(x, 1).tolist(),
+        'y': np.round(y, 1).tolist(),
+        'depth': depths.tolist(),
+        'in_cycle': [task_id in cycle_nodes for task_id in node_ids],
+        'edges': edge_array.tolist(),
+    }
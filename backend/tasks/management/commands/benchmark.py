@@ -0,0 +1,86 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from tasks.benchmarks import BenchmarkRunner, compare_reports, parallel_speedup, SHAPES, DEFAULT_SIZES, DEFAULT_REPEAT, PARALLEL_SIZES
+from tasks.parallel_scoring import shutdown_pools
+
+
+class Command(BaseCommand):
+    help = 'Benchmark analyze, suggest, check_cycles, export, bulk_import and business-day math on synthetic graphs'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--shapes', default=','.join(SHAPES), help=f'Comma separated, from: {", ".join(SHAPES)}')
+        parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)), help='Comma separated task counts')
+        parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Timed runs per operation')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this path')
+        parser.add_argument('--compare', help='Baseline JSON report to diff against')
+        parser.add_argument('--memory', action='store_true', help='Also record per-stage tracemalloc peaks (one extra run each)')
+        parser.add_argument('--db-file', help='Run on a throwaway SQLite file instead of an in-memory test database')
+        parser.add_argument('--parallel-workers', help='Comma separated worker counts: also measure process-pool scoring speedup')
+        parser.add_argument('--parallel-sizes', default=','.join(map(str, PARALLEL_SIZES)), help='Task counts for --parallel-workers')
+    
+    def handle(self, *args, **options):
+        shapes = [shape.strip() for shape in options['shapes'].split(',') if shape.strip()]
+        unknown = set(shapes) - set(SHAPES)
+        if unknown:
+            raise CommandError(f'Unknown shapes: {", ".join(sorted(unknown))}')
+        sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        
+        # Never touch the real database: run against a fresh test database
+        if options['db_file']:
+            connection.settings_dict.setdefault('TEST', {})['NAME'] = options['db_file']
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            runner = BenchmarkRunner(repeat=options['repeat'], seed=options['seed'], memory=options['memory'])
+            for size in sizes:
+                for shape in shapes:
+                    start = len(runner.results)
+                    runner.run_case(shape, size)
+                    for result in runner.results[start:]:
+                        self.stdout.write(self._format(result))
+            report = runner.report()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        
+        if options['parallel_workers']:
+            worker_counts = [int(workers) for workers in options['parallel_workers'].split(',') if workers.strip()]
+            parallel_sizes = [int(size) for size in options['parallel_sizes'].split(',') if size.strip()]
+            try:
+                report['parallel_scoring'] = parallel_speedup(parallel_sizes, worker_counts, options['repeat'], options['seed'])
+            finally:
+                shutdown_pools()
+            for row in report['parallel_scoring']:
+                self.stdout.write(
+                    f"{'parallel_scoring':<24} {row['workers']:>2} workers {row['size']:>8}  "
+                    f"median {row['median_seconds']:.4f}s  speedup x{row['speedup']}"
+                )
+        
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+                f.write('\n')
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+        
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+            for row in compare_reports(baseline, report):
+                self.stdout.write(
+                    f"{row['operation']:<24} {row['shape']:<10} {row['size']:>7}  "
+                    f"{row['baseline']:.4f}s -> {row['current']:.4f}s  x{row['ratio']}  "
+                    f"queries {row['queries_delta']:+d}"
+                )
+        
+        over_budget = [r for r in report['results'] if not r['within_budget']]
+        if over_budget:
+            raise CommandError(f'{len(over_budget)} operations exceeded their query ceiling')
+    
+    def _format(self, result):
+        line = (
+            f"{result['operation']:<24} {result['shape']:<10} {result['size']:>7}  "
+            f"median {result['seconds']['median']:.4f}s  queries {result['queries']}/{result['query_ceiling']}"
+        )
+        if 'memory' in result:
+            line += f"  peak {result['memory']['peak_kb'] / 1024:.1f}MB"
+        return line if result['within_budget'] else self.style.ERROR(line)
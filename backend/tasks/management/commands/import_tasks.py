@@ -0,0 +1,33 @@
+import os
+from django.core.management.base import BaseCommand, CommandError
+from tasks.importer import TaskImporter, iter_rows
+
+
+class Command(BaseCommand):
+    help = 'Stream tasks from an NDJSON or CSV file into the database in batches'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='File to import')
+        parser.add_argument('--format', choices=['ndjson', 'csv'],
+                            help='Input format, guessed from the file extension by default')
+        parser.add_argument('--batch-size', type=int, help='Rows per bulk_create batch')
+    
+    def handle(self, *args, **options):
+        path = options['path']
+        format_type = options['format']
+        if not format_type:
+            format_type = 'csv' if os.path.splitext(path)[1].lower() == '.csv' else 'ndjson'
+        
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+        
+        with open(path, encoding='utf-8', newline='') as source:
+            result = TaskImporter(batch_size=options['batch_size']).run(iter_rows(source, format_type))
+        
+        for failure in result['failed_tasks'] or []:
+            self.stderr.write(f"Row {failure['index']}: {failure['error']}")
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created_count']} of {result['total_rows']} tasks "
+            f"({result['failed_count']} failed)"
+        ))
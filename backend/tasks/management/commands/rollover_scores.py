@@ -0,0 +1,18 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from tasks.stored_scores import rollover_scores
+
+
+class Command(BaseCommand):
+    help = 'Daily job: rescore tasks whose due date crossed an urgency boundary'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Rollover date (YYYY-MM-DD), defaults to today')
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            today = datetime.strptime(options['date'], '%Y-%m-%d').date()
+        
+        rescored = rollover_scores(today)
+        self.stdout.write(self.style.SUCCESS(f'Rescored {rescored} tasks'))
@@ -0,0 +1,258 @@
+import atexit
+import json
+import os
+import threading
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+
+TRACKED_ACTIONS = ['analyze', 'suggest', 'check_cycles', 'bulk_import', 'export']
+
+# Request latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+# Minimum seconds between writes of this process's snapshot to TASK_METRICS_DIR
+FLUSH_INTERVAL = 1.0
+
+LATENCY = 'task_analyzer_request_duration_seconds'
+CACHE_HITS = 'task_analyzer_result_cache_hits_total'
+CACHE_MISSES = 'task_analyzer_result_cache_misses_total'
+ROWS_SCORED = 'task_analyzer_rows_scored_total'
+SCORING_SECONDS = 'task_analyzer_scoring_seconds_total'
+
+# Who ran the batch scorer: API requests, save/m2m/delete signals, the daily
+# rollover or an import; kept apart so one-row signal rescores do not skew
+# request scoring throughput
+SCORING_SOURCES = ['request', 'signal', 'rollover', 'import']
+
+
+class MetricsStore:
+    """
+    Cumulative counters keyed by Prometheus series name.
+    Every thread increments its own shard, so there is no lock on the hot
+    path; snapshots sum the shards. When TASK_METRICS_DIR is set each
+    process periodically writes its snapshot there and scrapes sum every
+    process file, so any worker can answer for the whole deployment.
+    Files are named for pid and start time, removed at exit, and skipped
+    once their pid is gone, so dead or recycled workers never skew totals.
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._last_flush = 0.0
+        self._owner = None
+    
+    def _shard(self):
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = self._local.values = {}
+            self._shards.append(shard)
+        return shard
+    
+    def inc(self, series, amount=1.0):
+        shard = self._shard()
+        shard[series] = shard.get(series, 0.0) + amount
+        self._maybe_flush()
+    
+    def observe(self, name, value, buckets, **labels):
+        """Histogram observation: cumulative buckets, sum and count"""
+        shard = self._shard()
+        label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+        for bound in buckets:
+            if value <= bound:
+                series = f'{name}_bucket{{{label_text},le="{bound}"}}'
+                shard[series] = shard.get(series, 0.0) + 1
+        for suffix, amount in (('_sum', value), ('_count', 1)):
+            series = f'{name}{suffix}{{{label_text}}}'
+            shard[series] = shard.get(series, 0.0) + amount
+        self._maybe_flush()
+    
+    def snapshot(self):
+        """This process's totals"""
+        totals = {}
+        for shard in list(self._shards):
+            for series, value in shard.copy().items():
+                totals[series] = totals.get(series, 0.0) + value
+        return totals
+    
+    def _maybe_flush(self):
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+    
+    def _file_name(self):
+        # Forked workers inherit the store, so the identity is taken per pid
+        pid = os.getpid()
+        if self._owner is None or self._owner[0] != pid:
+            self._owner = (pid, time.time_ns())
+            atexit.register(self.remove_file)
+        return f'metrics-{pid}-{self._owner[1]}.json'
+    
+    def remove_file(self):
+        """Drop this process's snapshot so its totals leave the aggregate"""
+        directory = get_metrics_dir()
+        if directory and self._owner is not None and self._owner[0] == os.getpid():
+            try:
+                os.remove(os.path.join(directory, self._file_name()))
+            except OSError:
+                pass
+    
+    def flush(self):
+        directory = get_metrics_dir()
+        self._last_flush = time.monotonic()
+        if not directory:
+            return
+        
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, self._file_name())
+        temp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, path)
+    
+    def aggregate(self):
+        """Totals across every process sharing TASK_METRICS_DIR (or just this one)"""
+        directory = get_metrics_dir()
+        if not directory:
+            return self.snapshot()
+        
+        self.flush()
+        totals = {}
+        for name in os.listdir(directory):
+            if not (name.startswith('metrics-') and name.endswith('.json')):
+                continue
+            pid = name[len('metrics-'):-len('.json')].split('-')[0]
+            if not pid.isdigit() or not pid_alive(int(pid)):
+                continue
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    values = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for series, value in values.items():
+                totals[series] = totals.get(series, 0.0) + value
+        return totals
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def get_metrics_dir():
+    """Shared directory for multi-process aggregation; TASK_METRICS_DIR setting"""
+    return getattr(settings, 'TASK_METRICS_DIR', None)
+
+
+metrics = MetricsStore()
+
+
+def observe_latency(action, seconds):
+    metrics.observe(LATENCY, seconds, LATENCY_BUCKETS, action=action)
+
+
+def record_cache_lookup(hit):
+    metrics.inc(CACHE_HITS if hit else CACHE_MISSES)
+
+
+def record_scoring(rows, seconds, source='request'):
+    labels = f'{{source="{source}"}}'
+    metrics.inc(ROWS_SCORED + labels, rows)
+    metrics.inc(SCORING_SECONDS + labels, seconds)
+
+
+def _format(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_prometheus(totals, task_count, edge_count):
+    """Prometheus text exposition format (version 0.0.4)"""
+    lines = [
+        f'# HELP {LATENCY} Request latency per API action',
+        f'# TYPE {LATENCY} histogram',
+    ]
+    for action in TRACKED_ACTIONS:
+        labels = f'action="{action}"'
+        for bound in LATENCY_BUCKETS:
+            series = f'{LATENCY}_bucket{{{labels},le="{bound}"}}'
+            lines.append(f'{series} {_format(totals.get(series, 0))}')
+        sum_series = f'{LATENCY}_sum{{{labels}}}'
+        count = totals.get(f'{LATENCY}_count{{{labels}}}', 0)
+        lines.append(f'{LATENCY}_bucket{{{labels},le="+Inf"}} {_format(count)}')
+        lines.append(f'{sum_series} {_format(totals.get(sum_series, 0))}')
+        lines.append(f'{LATENCY}_count{{{labels}}} {_format(count)}')
+    
+    hits, misses = totals.get(CACHE_HITS, 0), totals.get(CACHE_MISSES, 0)
+    request_labels = '{source="request"}'
+    rows = totals.get(ROWS_SCORED + request_labels, 0)
+    seconds = totals.get(SCORING_SECONDS + request_labels, 0)
+    
+    for name, kind, description, value in (
+        ('task_analyzer_graph_tasks', 'gauge', 'Tasks in the dependency graph', task_count),
+        ('task_analyzer_graph_edges', 'gauge', 'Dependency edges in the graph', edge_count),
+        (CACHE_HITS, 'counter', 'analyze/suggest result cache hits', hits),
+        (CACHE_MISSES, 'counter', 'analyze/suggest result cache misses', misses),
+        ('task_analyzer_result_cache_hit_ratio', 'gauge', 'Cache hits over all lookups',
+         hits / (hits + misses) if hits + misses else 0),
+        ('task_analyzer_rows_scored_per_second', 'gauge', 'Request scoring throughput since start',
+         rows / seconds if seconds else 0),
+    ):
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.append(f'{name} {_format(value)}')
+    
+    for name, description in (
+        (ROWS_SCORED, 'Task rows scored by the batch scorer'),
+        (SCORING_SECONDS, 'Seconds spent in the batch scorer'),
+    ):
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} counter')
+        for source in SCORING_SOURCES:
+            series = f'{name}{{source="{source}"}}'
+            lines.append(f'{series} {_format(totals.get(series, 0))}')
+    
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """
+    Records request latency for the tracked TaskViewSet actions and their
+    async variants. Sync and async capable, so it never forces a thread
+    hop in front of the async views under ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self._record(request, started)
+        return response
+    
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self._record(request, started)
+        return response
+    
+    def _record(self, request, started):
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.url_name:
+            # async-analyze shares the analyze series
+            action = match.url_name.removeprefix('task-').removeprefix('async-').replace('-', '_')
+            if action in TRACKED_ACTIONS:
+                observe_latency(action, time.perf_counter() - started)
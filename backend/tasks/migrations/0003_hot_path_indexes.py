@@ -0,0 +1,29 @@
+# Generated by Django 4.2 on 2026-10-17 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_persisted_scores'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at'], name='task_created_at_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date', 'importance'], name='task_due_importance_idx'),
+        ),
+        # The auto-created through table takes no Meta.indexes. Covering
+        # (to_task_id, from_task_id) answers Task.objects.filter(dependencies=task)
+        # and reverse adjacency loads from the index alone.
+        migrations.RunSQL(
+            sql='CREATE INDEX IF NOT EXISTS "task_deps_reverse_idx" '
+                'ON "tasks_task_dependencies" ("to_task_id", "from_task_id")',
+            reverse_sql='DROP INDEX IF EXISTS "task_deps_reverse_idx"',
+        ),
+    ]
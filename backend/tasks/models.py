@@ -18,8 +18,21 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Persisted priority scores, kept current by tasks.signals and the rollover job
+    score_smart_balance = models.FloatField(default=0, db_index=True)
+    score_fastest_wins = models.FloatField(default=0, db_index=True)
+    score_high_impact = models.FloatField(default=0, db_index=True)
+    score_deadline_driven = models.FloatField(default=0, db_index=True)
+    scored_on = models.DateField(null=True, blank=True, db_index=True)
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Default list/analysis ordering
+            models.Index(fields=['-created_at'], name='task_created_at_desc_idx'),
+            # Due-date filtering with importance as tie-breaker
+            models.Index(fields=['due_date', 'importance'], name='task_due_importance_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -0,0 +1,114 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import django
+from django.conf import settings
+
+
+EXECUTOR_KINDS = ['thread', 'process']
+
+DEFAULT_QUEUE_DEPTH = 16
+
+# Seconds a client told to back off should wait before retrying
+RETRY_AFTER_SECONDS = 1
+
+
+class ExecutorSaturated(Exception):
+    """Raised instead of queueing once every worker is busy and the queue is full"""
+
+
+def get_executor_settings():
+    """(kind, workers, queue depth) from TASK_ASYNC_EXECUTOR, TASK_ASYNC_WORKERS and TASK_ASYNC_QUEUE_DEPTH"""
+    kind = getattr(settings, 'TASK_ASYNC_EXECUTOR', 'thread')
+    if kind not in EXECUTOR_KINDS:
+        raise ValueError(f'Unknown TASK_ASYNC_EXECUTOR: {kind}. Choose from: {", ".join(EXECUTOR_KINDS)}')
+    workers = getattr(settings, 'TASK_ASYNC_WORKERS', None) or min(4, os.cpu_count() or 1)
+    queue_depth = getattr(settings, 'TASK_ASYNC_QUEUE_DEPTH', DEFAULT_QUEUE_DEPTH)
+    return kind, workers, max(0, queue_depth)
+
+
+def _setup_worker(settings_module):
+    # Spawned workers start without Django; forked ones already have it
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+
+class BoundedExecutor:
+    """
+    Runs CPU-bound callables off the event loop in a thread or process pool.
+    At most workers + queue_depth jobs are admitted at a time, so a burst of
+    slow requests is turned away early rather than queueing without bound
+    behind each other. Threads keep the loop responsive but still share the
+    GIL; processes score in parallel at the cost of pickling arguments and
+    results, so their callables must be module level.
+    """
+    
+    def __init__(self, kind='thread', workers=1, queue_depth=DEFAULT_QUEUE_DEPTH):
+        self.kind = kind
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._pool = None
+        self._lock = threading.Lock()
+    
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                if self.kind == 'process':
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=_setup_worker,
+                        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'),)
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='task-cpu')
+            return self._pool
+    
+    async def run(self, func, *args):
+        """Await func(*args) on the pool; raises ExecutorSaturated when no slot is free"""
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorSaturated(
+                f'All {self.workers} workers busy and {self.queue_depth} jobs queued'
+            )
+        try:
+            if self.kind == 'process':
+                future = self._get_pool().submit(func, *args)
+            else:
+                # Carry context variables over so stage() timings still reach the request profile
+                future = self._get_pool().submit(contextvars.copy_context().run, func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        
+        # Free the slot when the job really finishes, even if the request was cancelled meanwhile
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+    
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+_executor = {'instance': None}
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide executor built from settings on first use"""
+    with _executor_lock:
+        if _executor['instance'] is None:
+            kind, workers, queue_depth = get_executor_settings()
+            _executor['instance'] = BoundedExecutor(kind, workers, queue_depth)
+        return _executor['instance']
+
+
+def reset_executor():
+    """Shut the executor down so the next get_executor() rereads settings"""
+    with _executor_lock:
+        executor, _executor['instance'] = _executor['instance'], None
+    if executor is not None:
+        executor.shutdown()
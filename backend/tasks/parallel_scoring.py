@@ -0,0 +1,183 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from django.conf import settings
+from .scoring import STRATEGIES, STRATEGY_WEIGHTS, score_components
+
+
+# Task counts below this are scored in-process: pool round trips cost more than they save
+DEFAULT_PARALLEL_THRESHOLD = 100000
+
+COMPONENTS = 4
+
+
+def get_parallel_settings():
+    """(workers, threshold) from TASK_SCORING_WORKERS and TASK_PARALLEL_SCORING_THRESHOLD"""
+    workers = getattr(settings, 'TASK_SCORING_WORKERS', 1)
+    threshold = getattr(settings, 'TASK_PARALLEL_SCORING_THRESHOLD', DEFAULT_PARALLEL_THRESHOLD)
+    return workers, threshold
+
+
+def use_parallel(n, workers=None, threshold=None):
+    """
+    Worker count to score n tasks with, or 0 to score in-process
+    None for either argument falls back to the settings
+    """
+    default_workers, default_threshold = get_parallel_settings()
+    workers = default_workers if workers is None else workers
+    threshold = default_threshold if threshold is None else threshold
+    if not workers or workers < 2 or n < max(threshold, workers):
+        return 0
+    return workers
+
+
+class SharedArray:
+    """
+    A NumPy array backed by a named shared memory block.
+    Workers attach by (name, shape, dtype) instead of receiving a pickled
+    copy; the creator unlinks the block on close.
+    """
+    
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self.block = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.block.buf)
+    
+    @property
+    def spec(self):
+        return self.block.name, self.shape, self.dtype.str
+    
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+    
+    def close(self):
+        # Views into the buffer must be gone before the mapping can close
+        self.array = None
+        self.block.close()
+        if self.owner:
+            self.block.unlink()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+
+def shard_bounds(n, shards):
+    """Contiguous [start, stop) column ranges of near equal size"""
+    edges = np.linspace(0, n, shards + 1).astype(np.int64).tolist()
+    return [(start, stop) for start, stop in zip(edges, edges[1:]) if stop > start]
+
+
+def shard_top_k(scores, k, offset=0):
+    """
+    The k best (row, score) pairs of a score vector, highest first, ties by
+    row; rows are shifted by offset so shards report global positions
+    """
+    n = len(scores)
+    if k < n:
+        kth_score = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        rows = np.concatenate([above, ties])
+    else:
+        rows = np.arange(n)
+    rows = rows[np.lexsort((rows, -scores[rows]))]
+    return rows + offset, scores[rows]
+
+
+def merge_top_k(shard_results, k):
+    """Global top k rows from per-shard top k results; same order as a full ranking"""
+    if not shard_results:
+        return np.empty(0, dtype=np.int64)
+    rows = np.concatenate([result[0] for result in shard_results])
+    scores = np.concatenate([result[1] for result in shard_results])
+    return rows[np.lexsort((rows, -scores))][:k]
+
+
+def _score_shard(input_spec, components_spec, scores_spec, start, stop, k, strategy_index):
+    """Worker: score columns [start, stop) into the shared outputs, return this shard's top k"""
+    inputs = SharedArray.attach(input_spec)
+    components = SharedArray.attach(components_spec)
+    scores = SharedArray.attach(scores_spec)
+    try:
+        shard_components, shard_scores = score_components(inputs.array[:, start:stop])
+        components.array[start:stop] = shard_components
+        scores.array[start:stop] = shard_scores
+        if k:
+            return shard_top_k(shard_scores[:, strategy_index], k, offset=start)
+        return None
+    finally:
+        inputs.close()
+        components.close()
+        scores.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(workers):
+    """Long-lived process pool per worker count, so calls do not pay process start-up"""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def score_parallel(inputs, workers, k=0, strategy='smart_balance', matrices=True):
+    """
+    Score an input matrix (see scoring.score_inputs) on a process pool.
+    The inputs are copied once into shared memory and split into one
+    column range per worker; workers write components and scores straight
+    into shared output arrays and, with k, return their shard's top k for
+    strategy, which are merged here. matrices=False skips copying the
+    full component and score matrices out when only the top k is needed.
+    Returns: (components, scores, top k rows or None)
+    """
+    if strategy not in STRATEGY_WEIGHTS:
+        strategy = 'smart_balance'
+    n = inputs.shape[1]
+    pool = get_pool(workers)
+    
+    with SharedArray(inputs.shape, np.float64) as shared_inputs, \
+            SharedArray((n, COMPONENTS), np.int64) as shared_components, \
+            SharedArray((n, len(STRATEGIES)), np.float64) as shared_scores:
+        shared_inputs.array[:] = inputs
+        futures = [
+            pool.submit(
+                _score_shard, shared_inputs.spec, shared_components.spec, shared_scores.spec,
+                start, stop, k, STRATEGIES.index(strategy)
+            )
+            for start, stop in shard_bounds(n, workers)
+        ]
+        results = [future.result() for future in futures]
+        components = shared_components.array.copy() if matrices else None
+        scores = shared_scores.array.copy() if matrices else None
+    
+    top = merge_top_k(results, k) if k else None
+    return components, scores, top
+
+
+def parallel_top_k(inputs, k, strategy='smart_balance', workers=None):
+    """Rows of the k best tasks for strategy, scored across workers processes"""
+    workers = workers or get_parallel_settings()[0] or os.cpu_count()
+    return score_parallel(inputs, max(1, workers), k, strategy, matrices=False)[2]
@@ -0,0 +1,172 @@
+import cProfile
+import hmac
+import json
+import os
+import pstats
+import time
+from datetime import datetime
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+
+PROFILE_HEADER = 'X-Profile-Token'
+
+PROFILE_PARAM = 'profile'
+
+# Collapsed stacks deeper than this are cut off; recursion is cut at the first repeat
+MAX_STACK_DEPTH = 64
+
+# Paths contributing less than this share of the profiled time are dropped,
+# which bounds the walk on call graphs with many distinct paths
+MIN_STACK_FRACTION = 1e-4
+
+
+def get_profiling_settings():
+    """(dump directory, token); profiling is only available when both are set"""
+    return getattr(settings, 'TASK_PROFILING_DIR', None), getattr(settings, 'TASK_PROFILING_TOKEN', None)
+
+
+def _frame_name(func):
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f'{os.path.basename(filename)}:{line}:{name}'
+
+
+def collapsed_stacks(stats):
+    """
+    Collapsed-stack lines ('root;caller;callee microseconds') for flamegraph.pl
+    or speedscope. cProfile only keeps caller/callee pairs, so each function's
+    time is split across the paths reaching it in proportion to the
+    cumulative time of each call edge.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_cumulative))
+    
+    lines = {}
+    threshold = stats.total_tt * MIN_STACK_FRACTION
+    
+    def walk(func, stack, share):
+        own_time, cumulative = stats.stats[func][2], stats.stats[func][3]
+        stack = stack + [_frame_name(func)]
+        self_time = own_time * share
+        if self_time >= threshold:
+            key = ';'.join(stack)
+            lines[key] = lines.get(key, 0.0) + self_time
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_cumulative in callees.get(func, ()):
+            callee_cumulative = stats.stats[callee][3]
+            if _frame_name(callee) in stack or not callee_cumulative:
+                continue
+            callee_share = edge_cumulative * share / callee_cumulative
+            if edge_cumulative * share >= threshold:
+                walk(callee, stack, callee_share)
+    
+    roots = [func for func, (_, _, _, _, callers) in stats.stats.items() if not callers]
+    for root in roots:
+        walk(root, [], 1.0)
+    
+    return [f'{stack} {round(seconds * 1e6)}' for stack, seconds in sorted(lines.items())]
+
+
+def _request_strategy(request):
+    strategy = request.GET.get('strategy')
+    if strategy is None and request.content_type == 'application/json' and request.body:
+        try:
+            strategy = json.loads(request.body).get('strategy')
+        except (ValueError, AttributeError):
+            strategy = None
+    return strategy or 'none'
+
+
+def write_profile(directory, profiler, request, response, seconds, strategy=None):
+    """
+    Dump <stem>.prof (pstats), <stem>.collapsed (flamegraph input) and
+    <stem>.json (tags plus the top functions by cumulative time);
+    strategy defaults to the one named by the request
+    Returns: the file stem
+    """
+    from .models import Task
+    
+    task_count = Task.objects.count()
+    if strategy is None:
+        strategy = _request_strategy(request)
+    action = request.path.strip('/').split('/')[-1] or 'root'
+    stem = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{action}-{strategy}-{task_count}tasks"
+    
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, stem)
+    profiler.dump_stats(base + '.prof')
+    
+    stats = pstats.Stats(profiler)
+    with open(base + '.collapsed', 'w') as f:
+        f.write('\n'.join(collapsed_stacks(stats)) + '\n')
+    
+    top = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:25]
+    with open(base + '.json', 'w') as f:
+        json.dump({
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'seconds': round(seconds, 6),
+            'task_count': task_count,
+            'strategy': strategy,
+            'top_cumulative': [
+                {'function': _frame_name(func), 'calls': calls, 'own': round(own, 6), 'cumulative': round(cumulative, 6)}
+                for func, (_, calls, own, cumulative, _) in top
+            ],
+        }, f, indent=2)
+    return stem
+
+
+class ProfilingMiddleware:
+    """
+    Runs a view under cProfile when the request carries the profiling token
+    in the X-Profile-Token header or ?profile= query parameter, and dumps the
+    results to TASK_PROFILING_DIR. Removed from the stack unless both
+    TASK_PROFILING_DIR and TASK_PROFILING_TOKEN are configured; untriggered
+    requests only pay for the token lookup.
+    Async views are passed through unprofiled.
+    Must be last in MIDDLEWARE: it profiles the view alone (the nested
+    middleware chain would tangle the call graph) and returns the response
+    from process_view, after every other middleware's process_view ran.
+    """
+    
+    def __init__(self, get_response):
+        self.directory, self.token = get_profiling_settings()
+        if not (self.directory and self.token):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        return self.get_response(request)
+    
+    def _triggered(self, request):
+        supplied = request.headers.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+        return bool(supplied) and hmac.compare_digest(supplied, self.token)
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self._triggered(request):
+            return None
+        # Async views run on an event loop in another thread, out of cProfile's reach
+        if iscoroutinefunction(view_func):
+            return None
+        
+        # Tag the strategy before the view runs and consumes the request stream
+        strategy = _request_strategy(request)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        response = profiler.runcall(view_func, request, *view_args, **view_kwargs)
+        seconds = time.perf_counter() - started
+        
+        # DRF responses render lazily, so profile JSON rendering as part of the request
+        if hasattr(response, 'render') and callable(response.render):
+            profiler.runcall(response.render)
+            seconds = time.perf_counter() - started
+        
+        response['X-Profile-Id'] = write_profile(self.directory, profiler, request, response, seconds, strategy)
+        return response
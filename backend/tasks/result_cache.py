@@ -0,0 +1,126 @@
+import threading
+import time
+from datetime import date
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches, DEFAULT_CACHE_ALIAS
+from .metrics import record_cache_lookup
+from .dependencies import graph_version, agraph_version
+
+
+# Cache alias used when settings.CACHES defines it, otherwise the default cache
+ANALYSIS_CACHE_ALIAS = 'analysis'
+
+VERSION_KEY = 'tasks:dataset-version'
+
+_stats = {'hits': 0, 'misses': 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    """The analysis cache backend (LocMemCache evicts least recently used entries)"""
+    alias = ANALYSIS_CACHE_ALIAS if ANALYSIS_CACHE_ALIAS in settings.CACHES else DEFAULT_CACHE_ALIAS
+    return caches[alias]
+
+
+def dataset_version():
+    """
+    Current dataset version, bumped on every task or dependency write
+    Seeded from the clock so an evicted counter never reuses an old version
+    """
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_dataset_version():
+    """Invalidate every cached result by moving to a new dataset version"""
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def result_key(action, strategy, *extra, today=None, fingerprint=None):
+    """
+    Cache key for (action, strategy, database fingerprint, dataset version,
+    current date, extra params). The graph_version() fingerprint comes from
+    the database, so writes made by other processes (or the import_tasks
+    command) invalidate results here too; pass it in when already computed.
+    """
+    if fingerprint is None:
+        fingerprint = graph_version()
+    return _format_key(action, strategy, fingerprint, dataset_version(), today, extra)
+
+
+def _format_key(action, strategy, fingerprint, version, today, extra):
+    today = today or date.today()
+    parts = [action, strategy, fingerprint, str(version), today.isoformat(), *map(str, extra)]
+    return 'tasks:result:' + ':'.join(parts)
+
+
+def get_or_compute(key, compute):
+    """
+    Cached result for key, computing and storing it on a miss
+    Returns: (result, hit)
+    """
+    cache = get_cache()
+    result = cache.get(key)
+    hit = result is not None
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+    record_cache_lookup(hit)
+    
+    if not hit:
+        result = compute()
+        cache.set(key, result)
+    return result, hit
+
+
+async def aget_or_compute(key, compute):
+    """
+    get_or_compute() for async callers; compute is awaited on a miss and
+    the cache is used through its async API
+    Returns: (result, hit)
+    """
+    cache = get_cache()
+    result = await cache.aget(key)
+    hit = result is not None
+    with _stats_lock:
+        _stats['hits' if hit else 'misses'] += 1
+    record_cache_lookup(hit)
+    
+    if not hit:
+        result = await compute()
+        await cache.aset(key, result)
+    return result, hit
+
+
+async def aresult_key(action, strategy, *extra, today=None, fingerprint=None):
+    """result_key() for async callers"""
+    if fingerprint is None:
+        fingerprint = await agraph_version()
+    version = await sync_to_async(dataset_version)()
+    return _format_key(action, strategy, fingerprint, version, today, extra)
+
+
+def cache_stats():
+    """Hit/miss counters for this process"""
+    with _stats_lock:
+        hits, misses = _stats['hits'], _stats['misses']
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats['hits'] = 0
+        _stats['misses'] = 0
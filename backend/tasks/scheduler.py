@@ -0,0 +1,187 @@
+import heapq
+import math
+from datetime import datetime
+from django.conf import settings
+from .critical_path import get_hours_per_day
+from .holidays import add_business_days, calculate_business_days
+
+
+DEFAULT_WORKERS = 1
+
+DEFAULT_HORIZON_DAYS = 260
+
+# Request-supplied bounds; workers sizes a list and the horizon caps the simulated span
+MAX_WORKERS = 1000
+
+MAX_HORIZON_DAYS = 2600
+
+
+def bounded_int(name, value, upper):
+    """int(value), or ValueError when it falls outside 1..upper"""
+    value = int(value)
+    if not 1 <= value <= upper:
+        raise ValueError(f'{name} must be between 1 and {upper}')
+    return value
+
+
+def check_schedule_bounds(workers, horizon_days):
+    """(workers, horizon_days) as ints within TASK_SCHEDULE_MAX_WORKERS and TASK_SCHEDULE_MAX_HORIZON_DAYS"""
+    return (
+        bounded_int('workers', workers, getattr(settings, 'TASK_SCHEDULE_MAX_WORKERS', MAX_WORKERS)),
+        bounded_int('horizon_days', horizon_days,
+                    getattr(settings, 'TASK_SCHEDULE_MAX_HORIZON_DAYS', MAX_HORIZON_DAYS)),
+    )
+
+
+class ScheduleSimulator:
+    """
+    Capacity-aware list scheduler.
+    Time runs in working hours from the start of the first business day;
+    each worker contributes hours_per_day per business day. Tasks become
+    ready once every dependency has finished and idle workers always take
+    the ready task with the highest strategy score. Running tasks live in
+    an event heap keyed by finish time, so the simulation is O(n log n).
+    """
+    
+    def __init__(self, tasks, graph, workers=DEFAULT_WORKERS, hours_per_day=None,
+                 start_date=None, horizon_days=DEFAULT_HORIZON_DAYS):
+        """tasks: iterable of (id, title, estimated_hours, due_date, priority_score)"""
+        if start_date is None:
+            start_date = datetime.now().date()
+        # Work starts on the first business day on or after start_date
+        self.start_date = add_business_days(start_date, 1)
+        self.workers, horizon_days = check_schedule_bounds(workers, horizon_days)
+        self.hours_per_day = get_hours_per_day(hours_per_day)
+        self.horizon_hours = horizon_days * self.hours_per_day
+        
+        self.titles = {}
+        self.hours = {}
+        self.due_dates = {}
+        self.scores = {}
+        for task_id, title, estimated_hours, due_date, score in tasks:
+            self.titles[task_id] = title
+            self.hours[task_id] = max(0.0, float(estimated_hours or 0))
+            self.due_dates[task_id] = due_date
+            self.scores[task_id] = score or 0
+        
+        self.dependencies = {
+            task_id: [dep for dep in graph.graph.get(task_id, ()) if dep in self.hours]
+            for task_id in self.hours
+        }
+        self.dependents = {
+            task_id: [dep for dep in graph.reverse_graph.get(task_id, ()) if dep in self.hours]
+            for task_id in self.hours
+        }
+        
+        self.assignments = {}
+        self.unscheduled_ids = []
+        self._simulate()
+    
+    def _simulate(self):
+        remaining = {task_id: len(deps) for task_id, deps in self.dependencies.items()}
+        
+        # Ready queue: best score first, then lowest id for a stable plan
+        ready = [(-self.scores[task_id], task_id) for task_id, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        running = []
+        idle_workers = list(range(1, self.workers + 1))
+        heapq.heapify(idle_workers)
+        now = 0.0
+        
+        while ready or running:
+            while ready and idle_workers and now < self.horizon_hours:
+                _, task_id = heapq.heappop(ready)
+                worker = heapq.heappop(idle_workers)
+                finish = now + self.hours[task_id]
+                self.assignments[task_id] = (worker, now, finish)
+                heapq.heappush(running, (finish, task_id, worker))
+            
+            if not running:
+                break
+            
+            # Advance to the next completion and release everything finishing then
+            now = running[0][0]
+            while running and running[0][0] == now:
+                _, task_id, worker = heapq.heappop(running)
+                heapq.heappush(idle_workers, worker)
+                for dependent in self.dependents[task_id]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        heapq.heappush(ready, (-self.scores[dependent], dependent))
+        
+        self.makespan_hours = max((finish for _, _, finish in self.assignments.values()), default=0.0)
+        self.unscheduled_ids = [task_id for task_id in self.hours if task_id not in self.assignments]
+    
+    def _day_index(self, hours, finish=False):
+        # A finish exactly on a day boundary belongs to the previous day
+        if finish and hours > 0:
+            return max(0, math.ceil(hours / self.hours_per_day) - 1)
+        return int(hours // self.hours_per_day)
+    
+    def _date(self, day_index, cache):
+        if day_index not in cache:
+            cache[day_index] = add_business_days(self.start_date, day_index + 1)
+        return cache[day_index]
+    
+    def task_plan(self):
+        """Per-task assignment with start/finish dates and deadline slips"""
+        dates = {}
+        plan = []
+        for task_id, (worker, start, finish) in sorted(self.assignments.items(), key=lambda item: (item[1][1], item[0])):
+            start_date = self._date(self._day_index(start), dates)
+            finish_date = self._date(self._day_index(finish, finish=True), dates)
+            due_date = self.due_dates[task_id]
+            
+            slip_days = 0
+            if due_date and finish_date > due_date:
+                slip_days = calculate_business_days(due_date, finish_date)
+            
+            plan.append({
+                'id': task_id,
+                'title': self.titles[task_id],
+                'worker': worker,
+                'estimated_hours': self.hours[task_id],
+                'start_date': str(start_date),
+                'finish_date': str(finish_date),
+                'due_date': str(due_date) if due_date else None,
+                'slips': bool(due_date and finish_date > due_date),
+                'slip_business_days': slip_days,
+            })
+        return plan
+    
+    def daily_plan(self):
+        """
+        Business day -> list of (task, worker, hours) worked that day, up to
+        the horizon; work past it only shows as a slip in task_plan
+        """
+        dates = {}
+        days = {}
+        for task_id, (worker, start, finish) in self.assignments.items():
+            finish = min(finish, self.horizon_hours)
+            current = start
+            while current < finish:
+                day_index = self._day_index(current)
+                day_end = (day_index + 1) * self.hours_per_day
+                worked = min(finish, day_end) - current
+                days.setdefault(day_index, []).append({
+                    'task_id': task_id,
+                    'worker': worker,
+                    'hours': round(worked, 2)
+                })
+                current = day_end
+        
+        return [
+            {'date': str(self._date(day_index, dates)), 'work': sorted(days[day_index], key=lambda w: w['worker'])}
+            for day_index in sorted(days)
+        ]
+    
+    def summary(self):
+        return {
+            'workers': self.workers,
+            'hours_per_day': self.hours_per_day,
+            'start_date': str(self.start_date),
+            'finish_date': str(self._date(self._day_index(self.makespan_hours, finish=True), {})),
+            'business_days': math.ceil(self.makespan_hours / self.hours_per_day),
+            'scheduled_count': len(self.assignments),
+            'unscheduled_task_ids': self.unscheduled_ids,
+        }
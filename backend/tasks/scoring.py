@@ -1,19 +1,42 @@
 from datetime import datetime, timedelta, date
+import time
+import numpy as np
 from .dependencies import DependencyGraph
+from .instrumentation import stage
+from .metrics import record_scoring
 from .holidays import calculate_business_days, is_indian_holiday, is_weekend, get_urgency_label  # Add this import
 
 
+# Component order: urgency, importance, efficiency, dependency
+STRATEGY_WEIGHTS = {
+    # Balanced approach
+    'smart_balance': (0.25, 0.35, 0.25, 0.15),
+    # Prioritize quick, important tasks
+    'fastest_wins': (0.15, 0.35, 0.40, 0.10),
+    # Prioritize important tasks that unblock others
+    'high_impact': (0.20, 0.45, 0.10, 0.25),
+    # Prioritize by deadline
+    'deadline_driven': (0.50, 0.25, 0.10, 0.15),
+}
+
+STRATEGIES = list(STRATEGY_WEIGHTS)
+
+# strategies x components, so components @ WEIGHT_MATRIX.T scores every strategy at once
+WEIGHT_MATRIX = np.array([STRATEGY_WEIGHTS[name] for name in STRATEGIES])
+
+
 class PriorityCalculator:
     
     def __init__(self):
         self.graph = DependencyGraph()
     
-    def calculate_urgency_score(self, task):
+    def calculate_urgency_score(self, task, today=None):
         """Calculate urgency based on due date"""
         if not task.due_date:
             return 20  # Low urgency if no due date
         
-        today = datetime.now().date()
+        if today is None:
+            today = datetime.now().date()
         days_until_due = (task.due_date - today).days
         
         if days_until_due < 0:
@@ -57,12 +80,16 @@ class PriorityCalculator:
         
         self.graph.build_graph(all_tasks)
         
+        return self.dependency_score_from_graph(task, self.graph)
+    
+    def dependency_score_from_graph(self, task, graph):
+        """Dependency score for a task against an already built graph"""
         # Count how many tasks depend on this task (blocking_count)
         # The more tasks this unblocks, the higher the score
-        dependents = len(self.graph.reverse_graph.get(task.id, []))
+        dependents = len(graph.reverse_graph.get(task.id, []))
         
         # Also consider tasks that block this task
-        dependencies = len(self.graph.graph.get(task.id, []))
+        dependencies = len(graph.graph.get(task.id, []))
         
         # Score: tasks that unblock many others get higher scores
         # Formula: (dependents * 50) - (dependencies * 10)
@@ -99,57 +126,45 @@ class PriorityCalculator:
         efficiency = self.calculate_efficiency_score(task)
         dependency = self.calculate_dependency_score(task, all_tasks)
         
-        if strategy == 'smart_balance':
-            # Balanced approach
-            score = (urgency * 0.25) + (importance * 0.35) + (efficiency * 0.25) + (dependency * 0.15)
-        
-        elif strategy == 'fastest_wins':
-            # Prioritize quick, important tasks
-            score = (efficiency * 0.40) + (importance * 0.35) + (urgency * 0.15) + (dependency * 0.10)
-        
-        elif strategy == 'high_impact':
-            # Prioritize important tasks that unblock others
-            score = (importance * 0.45) + (dependency * 0.25) + (urgency * 0.20) + (efficiency * 0.10)
-        
-        elif strategy == 'deadline_driven':
-            # Prioritize by deadline
-            score = (urgency * 0.50) + (importance * 0.25) + (dependency * 0.15) + (efficiency * 0.10)
-        
-        else:
-            score = (urgency * 0.25) + (importance * 0.35) + (efficiency * 0.25) + (dependency * 0.15)
+        return self.combine_scores(urgency, importance, efficiency, dependency, strategy)
+    
+    def combine_scores(self, urgency, importance, efficiency, dependency, strategy='smart_balance'):
+        """Weight the four score components according to the strategy"""
+        weights = STRATEGY_WEIGHTS.get(strategy, STRATEGY_WEIGHTS['smart_balance'])
+        score = (
+            (urgency * weights[0]) + (importance * weights[1]) +
+            (efficiency * weights[2]) + (dependency * weights[3])
+        )
         
         return max(0, min(100, score))
     
+    def create_session(self, tasks, graph=None, workers=None, parallel_threshold=None, k=0, strategy='smart_balance'):
+        """
+        Build the dependency graph once and score every component for tasks
+        workers/parallel_threshold override the parallel scoring settings for this call;
+        k/strategy name the top k a caller will ask for, so parallel shards can return it
+        """
+        return ScoringSession(self, tasks, graph, workers, parallel_threshold, k, strategy)
+    
     def sort_by_strategy(self, tasks, strategy='smart_balance'):
         """Sort tasks by priority score"""
-        scored_tasks = []
-        
-        for task in tasks:
-            score = self.calculate_priority_score(task, strategy, all_tasks=tasks)
-            scored_tasks.append((task, score))
-        
-        # Sort by score descending (highest priority first)
-        scored_tasks.sort(key=lambda x: x[1], reverse=True)
-        
-        return scored_tasks
+        return self.create_session(tasks).sort_by_strategy(strategy)
+    
+    def get_top_tasks(self, tasks, count=3, strategy='smart_balance'):
+        """Top count (task, score) pairs using partial selection instead of a full sort"""
+        return self.create_session(tasks, k=count, strategy=strategy).top_k(count, strategy)
     
     def detect_circular_dependencies(self, tasks):
         """Detect circular dependencies"""
-        self.graph.build_graph(tasks)
-        cycles = self.graph.detect_cycles(tasks)
+        self.graph = DependencyGraph.from_database(task_ids=[t.id for t in tasks])
+        cycles = self.graph.find_cycles()
         
         if cycles:
-            cycle_strings = []
-            for cycle in cycles:
-                task_ids = cycle[:-1]  # Remove last item (duplicate)
-                task_titles = []
-                for task_id in task_ids:
-                    task = next((t for t in tasks if t.id == task_id), None)
-                    if task:
-                        task_titles.append(task.title)
-                if task_titles:
-                    cycle_strings.append(' → '.join(task_titles))
-            return cycle_strings
+            titles = {t.id: t.title for t in tasks}
+            return [
+                ' → '.join(titles[task_id] for task_id in cycle)
+                for cycle in cycles
+            ]
         
         return None
     
@@ -192,4 +207,176 @@ class PriorityCalculator:
             'label': get_urgency_label(days_until),
             'is_holiday': holiday_info['is_holiday'],
             'holiday_name': holiday_info['name']
-        }
\ No newline at end of file
+        }
+
+
+# Rows of the compact input matrix built by score_inputs()
+INPUT_ROWS = ['days_until_due', 'has_due', 'importance', 'hours', 'dependents', 'dependencies']
+
+
+def score_inputs(tasks, graph, today):
+    """
+    Compact float64 matrix (one row per INPUT_ROWS entry, one column per
+    task) holding everything the component scores need, so scoring can run
+    without model instances
+    """
+    n = len(tasks)
+    inputs = np.empty((len(INPUT_ROWS), n), dtype=np.float64)
+    inputs[0] = np.fromiter(
+        (t.due_date.toordinal() if t.due_date else 0 for t in tasks), dtype=np.int64, count=n
+    ) - today.toordinal()
+    inputs[1] = np.fromiter((t.due_date is not None for t in tasks), dtype=bool, count=n)
+    inputs[2] = np.fromiter((t.importance for t in tasks), dtype=np.int64, count=n)
+    inputs[3] = np.fromiter((t.estimated_hours for t in tasks), dtype=np.float64, count=n)
+    inputs[4] = np.fromiter((len(graph.reverse_graph.get(t.id, ())) for t in tasks), dtype=np.int64, count=n)
+    inputs[5] = np.fromiter((len(graph.graph.get(t.id, ())) for t in tasks), dtype=np.int64, count=n)
+    return inputs
+
+
+def score_components(inputs):
+    """
+    Component matrix (n x 4, int64) and score matrix (n x strategies) for
+    the columns of an input matrix.
+    The thresholds mirror the per-task PriorityCalculator methods.
+    """
+    days, has_due, importance, hours, dependents, dependencies = inputs
+    has_due = has_due.astype(bool)
+    urgency = np.select(
+        [~has_due, days < 0, days == 0, days <= 1, days <= 3, days <= 7],
+        [20, 100, 95, 90, 80, 50],
+        default=20
+    )
+    efficiency = np.select(
+        [hours <= 0, hours <= 1, hours <= 2, hours <= 4],
+        [50, 100, 80, 60],
+        default=40
+    )
+    dependency = np.clip(dependents * 40 - dependencies * 15 + 40, 0, 100)
+    
+    components = np.column_stack([urgency, importance * 10, efficiency, dependency]).astype(np.int64)
+    return components, np.clip(components @ WEIGHT_MATRIX.T, 0, 100)
+
+
+class BatchScorer:
+    """
+    Vectorized scorer for a whole task set.
+    Builds the four component vectors as NumPy arrays and multiplies them
+    by the strategy weight matrix once, giving an n x strategies score matrix.
+    Sets of at least parallel_threshold tasks are scored on a process pool
+    of workers processes (see parallel_scoring); both default to settings.
+    With k, pool workers also return their shard's top k for strategy and
+    top_k() answers from the merged winners instead of a second pass.
+    source tags the scoring metrics (see metrics.SCORING_SOURCES).
+    """
+    
+    def __init__(self, tasks, graph, today=None, workers=None, parallel_threshold=None,
+                 k=0, strategy='smart_balance', source='request'):
+        started = time.perf_counter()
+        if today is None:
+            today = datetime.now().date()
+        
+        n = len(tasks)
+        self.task_ids = np.fromiter((t.id for t in tasks), dtype=np.int64, count=n)
+        self.index = {task_id: row for row, task_id in enumerate(self.task_ids.tolist())}
+        
+        inputs = score_inputs(tasks, graph, today)
+        
+        from .parallel_scoring import use_parallel, score_parallel
+        self.workers = use_parallel(n, workers, parallel_threshold)
+        # strategy -> merged shard winners, a prefix of ranking(strategy)
+        self.merged_top = {}
+        if self.workers:
+            if strategy not in STRATEGY_WEIGHTS:
+                strategy = 'smart_balance'
+            self.components, self.scores, top = score_parallel(inputs, self.workers, max(0, k), strategy)
+            if top is not None:
+                self.merged_top[strategy] = top
+        else:
+            self.components, self.scores = score_components(inputs)
+        record_scoring(n, time.perf_counter() - started, source)
+    
+    def strategy_scores(self, strategy='smart_balance'):
+        """Score vector for one strategy (unknown strategies fall back to smart_balance)"""
+        if strategy not in STRATEGY_WEIGHTS:
+            strategy = 'smart_balance'
+        return self.scores[:, STRATEGIES.index(strategy)]
+    
+    def ranking(self, strategy='smart_balance'):
+        """Row indices ordered by score, highest first (ties keep input order)"""
+        return np.argsort(-self.strategy_scores(strategy), kind='stable')
+    
+    def top_k(self, k, strategy='smart_balance'):
+        """
+        Row indices of the k best scores, highest first.
+        Uses a linear-time partition and only sorts the winners; ties at the
+        cut-off are broken by input order so the result matches ranking()[:k].
+        """
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        if strategy not in STRATEGY_WEIGHTS:
+            strategy = 'smart_balance'
+        merged = self.merged_top.get(strategy)
+        if merged is not None and (k <= len(merged) or len(merged) == len(self.task_ids)):
+            return merged[:k]
+        
+        scores = self.strategy_scores(strategy)
+        n = len(scores)
+        if k >= n:
+            return self.ranking(strategy)
+        
+        kth_score = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:k - len(above)]
+        rows = np.concatenate([above, ties])
+        
+        return rows[np.lexsort((rows, -scores[rows]))]
+
+
+class ScoringSession:
+    """
+    Scoring context for one analysis run.
+    The dependency graph is built once and every component score is
+    computed in a single pass, so callers can rank, break down and
+    explain the whole task set without rebuilding anything per task.
+    """
+    
+    def __init__(self, calculator, tasks, graph=None, workers=None, parallel_threshold=None,
+                 k=0, strategy='smart_balance'):
+        self.calculator = calculator
+        self.tasks = list(tasks)
+        self.today = datetime.now().date()
+        
+        if graph is None:
+            # One query over the through table rather than one per task
+            with stage('graph'):
+                graph = DependencyGraph.from_database(task_ids=[task.id for task in self.tasks])
+        self.graph = graph
+        
+        with stage('score'):
+            self.batch = BatchScorer(self.tasks, self.graph, self.today, workers, parallel_threshold, k, strategy)
+    
+    def get_task_score_breakdown(self, task):
+        """Get individual score components computed for this session"""
+        urgency, importance, efficiency, dependency = self.batch.components[self.batch.index[task.id]].tolist()
+        return {
+            'urgency_score': urgency,
+            'importance_score': importance,
+            'efficiency_score': efficiency,
+            'dependency_score': dependency
+        }
+    
+    def calculate_priority_score(self, task, strategy='smart_balance'):
+        """Priority score for a task using the precomputed components"""
+        return float(self.batch.strategy_scores(strategy)[self.batch.index[task.id]])
+    
+    def sort_by_strategy(self, strategy='smart_balance'):
+        """Sort the session's tasks by priority score, highest first"""
+        with stage('rank'):
+            scores = self.batch.strategy_scores(strategy).tolist()
+            return [(self.tasks[row], scores[row]) for row in self.batch.ranking(strategy).tolist()]
+    
+    def top_k(self, k, strategy='smart_balance'):
+        """The k highest priority (task, score) pairs without sorting the whole set"""
+        with stage('rank'):
+            scores = self.batch.strategy_scores(strategy)
+            return [(self.tasks[row], float(scores[row])) for row in self.batch.top_k(k, strategy).tolist()]
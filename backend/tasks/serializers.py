@@ -11,8 +11,15 @@ class TaskSerializer(serializers.ModelSerializer):
     
     def get_blocking_count(self, obj):
         # Tasks that depend on this task (tasks waiting for this one)
+        # Use the precomputed count from the queryset or graph when present
+        count = getattr(obj, 'num_dependents', None)
+        if count is not None:
+            return count
         return obj.dependent_tasks.count()
     
     def get_blocked_by_count(self, obj):
         # Tasks this one depends on (tasks blocking this one)
+        count = getattr(obj, 'num_dependencies', None)
+        if count is not None:
+            return count
         return obj.dependencies.count()
\ No newline at end of file
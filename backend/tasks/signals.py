@@ -0,0 +1,55 @@
+from django.db.models import Q
+from django.db.models.signals import post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Task
+from .stored_scores import rescore_tasks
+from .dependencies import invalidate_reachability_index
+from .result_cache import bump_dataset_version
+
+
+def _neighbour_ids(task_id):
+    through = Task.dependencies.through
+    ids = set()
+    for from_id, to_id in through.objects.filter(
+        Q(from_task_id=task_id) | Q(to_task_id=task_id)
+    ).values_list('from_task_id', 'to_task_id'):
+        ids.add(from_id)
+        ids.add(to_id)
+    ids.discard(task_id)
+    return ids
+
+
+@receiver(post_save, sender=Task)
+def rescore_saved_task(sender, instance, raw=False, **kwargs):
+    # Field changes only affect the task's own components
+    if raw:
+        return
+    bump_dataset_version()
+    rescore_tasks([instance.pk])
+
+
+@receiver(m2m_changed, sender=Task.dependencies.through)
+def rescore_dependency_change(sender, instance, action, pk_set, **kwargs):
+    # Adding or removing an edge changes fan-in/fan-out on both ends
+    if action in ('post_clear', 'post_add', 'post_remove'):
+        invalidate_reachability_index()
+        bump_dataset_version()
+    
+    if action == 'pre_clear':
+        instance._cleared_neighbour_ids = _neighbour_ids(instance.pk)
+    elif action == 'post_clear':
+        rescore_tasks({instance.pk} | getattr(instance, '_cleared_neighbour_ids', set()))
+    elif action in ('post_add', 'post_remove'):
+        rescore_tasks({instance.pk} | set(pk_set or ()))
+
+
+@receiver(pre_delete, sender=Task)
+def remember_deleted_neighbours(sender, instance, **kwargs):
+    instance._deleted_neighbour_ids = _neighbour_ids(instance.pk)
+
+
+@receiver(post_delete, sender=Task)
+def rescore_deleted_neighbours(sender, instance, **kwargs):
+    invalidate_reachability_index()
+    bump_dataset_version()
+    rescore_tasks(getattr(instance, '_deleted_neighbour_ids', set()))
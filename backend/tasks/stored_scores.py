@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.db.models import Q
+from .models import Task
+from .dependencies import DependencyGraph
+from .scoring import BatchScorer, STRATEGIES
+
+
+SCORE_FIELDS = {strategy: f'score_{strategy}' for strategy in STRATEGIES}
+
+# Days-until-due values where the urgency score changes bucket
+# (see PriorityCalculator.calculate_urgency_score)
+URGENCY_BOUNDARIES = [0, 1, 2, 4, 8]
+
+RESCORE_BATCH_SIZE = 500
+
+
+def score_field(strategy):
+    """Model field holding the persisted score for a strategy"""
+    return SCORE_FIELDS.get(strategy, SCORE_FIELDS['smart_balance'])
+
+
+def rescore_tasks(task_ids, today=None, source='signal'):
+    """
+    Recompute and store every strategy score for the given tasks.
+    The dependency score only needs direct fan-in/fan-out, so the graph
+    is limited to edges touching the tasks being rescored.
+    Returns: number of tasks rescored
+    """
+    if today is None:
+        today = datetime.now().date()
+    
+    task_ids = list(set(task_ids))
+    rescored = 0
+    
+    for start in range(0, len(task_ids), RESCORE_BATCH_SIZE):
+        chunk = task_ids[start:start + RESCORE_BATCH_SIZE]
+        tasks = list(Task.objects.filter(id__in=chunk))
+        if not tasks:
+            continue
+        
+        graph = DependencyGraph.from_neighbourhood(chunk)
+        batch = BatchScorer(tasks, graph, today, source=source)
+        scores = batch.scores.tolist()
+        
+        for row, task in enumerate(tasks):
+            for column, strategy in enumerate(STRATEGIES):
+                setattr(task, SCORE_FIELDS[strategy], scores[row][column])
+            task.scored_on = today
+        
+        Task.objects.bulk_update(tasks, [*SCORE_FIELDS.values(), 'scored_on'])
+        rescored += len(tasks)
+    
+    return rescored
+
+
+def rescore_with_neighbours(task_ids, today=None, source='signal'):
+    """Rescore tasks plus every task directly depending on or depended on by them"""
+    graph = DependencyGraph.from_neighbourhood(task_ids)
+    affected = set(task_ids)
+    for task_id in task_ids:
+        affected.update(graph.graph.get(task_id, ()))
+        affected.update(graph.reverse_graph.get(task_id, ()))
+    
+    return rescore_tasks(affected, today, source)
+
+
+def rollover_scores(today=None):
+    """
+    Daily rollover: rescore only tasks never scored or whose due date
+    crossed an urgency bucket boundary since they were last scored.
+    Every other task keeps its scores and is stamped with today.
+    Returns: number of tasks rescored
+    """
+    if today is None:
+        today = datetime.now().date()
+    
+    stale = Q(scored_on__isnull=True)
+    scored_dates = Task.objects.filter(scored_on__lt=today).values_list('scored_on', flat=True).distinct()
+    for since in scored_dates:
+        crossed = Q()
+        for boundary in URGENCY_BOUNDARIES:
+            # days_until was >= boundary on `since` and is < boundary today
+            crossed |= Q(
+                due_date__gte=since + timedelta(days=boundary),
+                due_date__lte=today + timedelta(days=boundary - 1)
+            )
+        stale |= Q(scored_on=since) & crossed
+    
+    task_ids = list(Task.objects.filter(stale).values_list('id', flat=True))
+    rescored = rescore_tasks(task_ids, today, 'rollover')
+    Task.objects.filter(scored_on__lt=today).update(scored_on=today)
+    
+    return rescored
+
+
+def ensure_scores_current(today=None, limit=None):
+    """
+    Request-path fallback: score at most limit (TASK_LAZY_RESCORE_LIMIT)
+    tasks that were never scored, e.g. rows written around the signals.
+    The daily date rollover is the rollover_scores management command's job,
+    run once a day after midnight; it is a write pass over every task that
+    crossed an urgency boundary, so requests never run it and several
+    workers never race to. Until it runs, scores lag by the missed days.
+    Returns: number of tasks rescored
+    """
+    if limit is None:
+        limit = getattr(settings, 'TASK_LAZY_RESCORE_LIMIT', RESCORE_BATCH_SIZE)
+    
+    task_ids = list(Task.objects.filter(scored_on__isnull=True).values_list('id', flat=True)[:limit])
+    if not task_ids:
+        return 0
+    return rescore_tasks(task_ids, today, 'rollover')
@@ -1,8 +1,40 @@
+import asyncio
+import gzip
+import json
+import os
+import pstats
+import cProfile
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+from asgiref.sync import async_to_sync
+import numpy as np
 import pytest
-from datetime import datetime, date
-from django.test import TestCase
+from datetime import datetime, date, timedelta
+from django.db import connection
+from django.test import TestCase, SimpleTestCase, override_settings
 from tasks.models import Task
-from tasks.scoring import PriorityCalculator
+from tasks.scoring import PriorityCalculator, BatchScorer, STRATEGIES, score_inputs
+from tasks.parallel_scoring import use_parallel, score_parallel, parallel_top_k, shutdown_pools
+from tasks.dependencies import DependencyGraph, extract_subgraph
+from tasks.result_cache import get_cache, cache_stats, reset_cache_stats, dataset_version
+from tasks.benchmarks import BenchmarkRunner, generate_tasks, compare_reports, parallel_speedup, SHAPES
+from tasks.instrumentation import stage, profile_request
+from tasks.metrics import metrics, CACHE_HITS, ROWS_SCORED
+from tasks.profiling import collapsed_stacks
+from tasks.database import DEFAULT_SQLITE_PRAGMAS
+from tasks.offload import BoundedExecutor, ExecutorSaturated, reset_executor
+from tasks.stored_scores import rollover_scores, ensure_scores_current
+from tasks.critical_path import CriticalPath
+from tasks.scheduler import ScheduleSimulator, MAX_WORKERS
+from tasks.layout import barnes_hut_repulsion
+from tasks.holidays import (
+    calculate_business_days, calculate_business_days_batch, is_indian_holiday, is_weekend,
+    add_business_days, HolidayCalendar
+)
 
 class PriorityCalculatorTestCase(TestCase):
     """Test cases for the PriorityCalculator scoring algorithm"""
@@ -175,4 +207,1297 @@ class PriorityCalculatorTestCase(TestCase):
         }
         
         calculator = PriorityCalculator(weights=custom_weights)
-        self.assertEqual(calculator.weights, custom_weights, "Custom weights should be set")
\ No newline at end of file
+        self.assertEqual(calculator.weights, custom_weights, "Custom weights should be set")
+
+class ScoringSessionTestCase(TestCase):
+    """Test cases for scoring a whole task set against one dependency graph"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.calculator = PriorityCalculator()
+        
+        self.task1 = Task.objects.create(title="Base task", estimated_hours=1, importance=8)
+        self.task2 = Task.objects.create(title="Follow-up", estimated_hours=3, importance=5)
+        self.task3 = Task.objects.create(title="Independent", estimated_hours=6, importance=9)
+        self.task2.dependencies.add(self.task1)
+        
+        self.tasks = [self.task1, self.task2, self.task3]
+    
+    def test_session_matches_per_task_scores(self):
+        """Session scores should equal the per-task calculation"""
+        session = self.calculator.create_session(self.tasks)
+        
+        for strategy in ['smart_balance', 'fastest_wins', 'high_impact', 'deadline_driven']:
+            for task in self.tasks:
+                expected = self.calculator.calculate_priority_score(task, strategy, all_tasks=self.tasks)
+                self.assertAlmostEqual(session.calculate_priority_score(task, strategy), expected)
+    
+    def test_session_breakdown(self):
+        """Breakdown should expose all four components"""
+        session = self.calculator.create_session(self.tasks)
+        breakdown = session.get_task_score_breakdown(self.task1)
+        
+        self.assertEqual(breakdown, self.calculator.get_task_score_breakdown(self.task1, self.tasks))
+    
+    def test_sort_by_strategy_builds_graph_once(self):
+        """Sorting should load the dependency graph in one query, not one per task"""
+        with self.assertNumQueries(1):
+            sorted_tasks = self.calculator.sort_by_strategy(self.tasks, 'smart_balance')
+        
+        scores = [score for _, score in sorted_tasks]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+    
+    def test_default_graph_query_count_is_constant(self):
+        """The session's own graph costs one query however many tasks there are"""
+        extra = Task.objects.bulk_create([Task(title=f"Extra {i}", estimated_hours=1) for i in range(20)])
+        for task in extra:
+            task.dependencies.add(self.task1)
+        
+        with self.assertNumQueries(1):
+            session = self.calculator.create_session(self.tasks + extra)
+        self.assertEqual(session.graph.reverse_graph[self.task1.id], {self.task2.id} | {task.id for task in extra})
+
+
+class DependencyGraphTestCase(TestCase):
+    """Test cases for building the dependency graph"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.task1 = Task.objects.create(title="Schema", estimated_hours=2, importance=7)
+        self.task2 = Task.objects.create(title="API", estimated_hours=4, importance=6)
+        self.task3 = Task.objects.create(title="UI", estimated_hours=5, importance=5)
+        self.task2.dependencies.add(self.task1)
+        self.task3.dependencies.add(self.task1, self.task2)
+    
+    def test_from_database_single_query(self):
+        """Bulk constructor should read the through table in one query"""
+        with self.assertNumQueries(1):
+            graph = DependencyGraph.from_database()
+        
+        self.assertEqual(graph.graph[self.task3.id], {self.task1.id, self.task2.id})
+        self.assertEqual(graph.reverse_graph[self.task1.id], {self.task2.id, self.task3.id})
+    
+    def test_from_database_matches_build_graph(self):
+        """Bulk constructor should agree with the per-task builder"""
+        tasks = [self.task1, self.task2, self.task3]
+        bulk = DependencyGraph.from_database(task_ids=[t.id for t in tasks])
+        legacy = DependencyGraph()
+        legacy.build_graph(tasks)
+        
+        self.assertEqual(bulk.graph, legacy.graph)
+        self.assertEqual(bulk.reverse_graph, legacy.reverse_graph)
+    
+    def test_from_database_restricted_to_task_ids(self):
+        """Edges to tasks outside task_ids should be dropped"""
+        graph = DependencyGraph.from_database(task_ids=[self.task2.id, self.task3.id])
+        
+        self.assertEqual(graph.graph[self.task3.id], {self.task2.id})
+        self.assertNotIn(self.task1.id, graph.graph)
+
+
+class HolidayCalendarTestCase(SimpleTestCase):
+    """Test cases for the compiled holiday and business-day index"""
+    
+    def test_business_days_skip_weekends_and_holidays(self):
+        """Diwali week (20-21 Oct 2025 are holidays) has three business days"""
+        self.assertEqual(calculate_business_days(date(2025, 10, 20), date(2025, 10, 27)), 3)
+        self.assertEqual(calculate_business_days(date(2025, 10, 13), date(2025, 10, 20)), 5)
+    
+    def test_business_days_across_years(self):
+        """Counting across a year boundary should match a day-by-day walk"""
+        from_date, to_date = date(2024, 12, 20), date(2026, 1, 10)
+        expected = 0
+        current = from_date
+        while current < to_date:
+            if not is_weekend(current) and not is_indian_holiday(current)['is_holiday']:
+                expected += 1
+            current = date.fromordinal(current.toordinal() + 1)
+        
+        self.assertEqual(calculate_business_days(from_date, to_date), expected)
+    
+    def test_business_days_past_date(self):
+        """Past due dates have zero business days left"""
+        self.assertEqual(calculate_business_days('2025-11-28', '2025-11-01'), 0)
+    
+    def test_business_days_batch(self):
+        """Batch lookup should agree with single lookups"""
+        due_dates = [date(2025, 12, 31), None, date(2026, 3, 1), date(2025, 1, 1)]
+        expected = [calculate_business_days(date(2025, 6, 1), d) if d else None for d in due_dates]
+        
+        self.assertEqual(calculate_business_days_batch(date(2025, 6, 1), due_dates), expected)
+    
+    def test_holiday_lookup(self):
+        """Holiday names should be returned for holidays only"""
+        self.assertEqual(is_indian_holiday('2025-01-26'), {'is_holiday': True, 'name': 'Republic Day'})
+        self.assertEqual(is_indian_holiday(date(2025, 1, 27)), {'is_holiday': False, 'name': None})
+    
+    def test_far_dates_match_a_day_walk(self):
+        """Dates centuries from the compiled cycle count exactly, without a per-year index"""
+        calendar = HolidayCalendar()
+        for from_date in [date(1987, 2, 27), date(2425, 10, 13), date(9998, 12, 1)]:
+            walked, current = 0, from_date
+            while walked < 40:
+                if calendar.is_business_day(current):
+                    walked += 1
+                current += timedelta(days=1)
+            
+            self.assertEqual(calendar.add_business_days(from_date, 40), current - timedelta(days=1))
+            self.assertEqual(calendar.business_days_between(from_date, current), 40)
+    
+    def test_end_of_calendar(self):
+        """Year 9999 due dates are cheap and counting past date.max stops there"""
+        self.assertGreater(calculate_business_days(date(2025, 1, 1), date(9999, 12, 31)), 1900000)
+        self.assertEqual(add_business_days(date(9999, 12, 1), 100), date.max)
+
+
+class CycleDetectionTestCase(TestCase):
+    """Test cases for strongly-connected-component cycle detection"""
+    
+    def test_reports_every_cycle_by_id(self):
+        """Two disjoint cycles should both be reported, with duplicate titles kept apart"""
+        a = Task.objects.create(title="Same title")
+        b = Task.objects.create(title="Same title")
+        c = Task.objects.create(title="Loop C")
+        d = Task.objects.create(title="Loop D")
+        e = Task.objects.create(title="Same title")
+        a.dependencies.add(b)
+        b.dependencies.add(a)
+        c.dependencies.add(d)
+        d.dependencies.add(c)
+        e.dependencies.add(a)
+        
+        response = self.client.get('/api/tasks/check_cycles/')
+        data = response.json()
+        
+        self.assertEqual(data['cycle_count'], 2)
+        self.assertEqual(sorted(sorted(cycle['task_ids']) for cycle in data['cycles']),
+                         [sorted([a.id, b.id]), sorted([c.id, d.id])])
+        self.assertNotIn(e.id, data['affected_tasks'])
+    
+    def test_self_dependency_is_a_cycle(self):
+        """A task depending on itself is cyclic, a plain chain is not"""
+        graph = DependencyGraph()
+        graph.load_edges([(1, 1), (2, 1), (3, 2)])
+        
+        self.assertEqual(graph.find_cycles(), [[1]])
+    
+    def test_long_chain_does_not_recurse(self):
+        """A 100k-long chain closed into a loop should be found without hitting the recursion limit"""
+        size = 100000
+        edges = [(i, i + 1) for i in range(size - 1)] + [(size - 1, 0)]
+        graph = DependencyGraph()
+        graph.load_edges(edges)
+        
+        cycles = graph.find_cycles()
+        
+        self.assertEqual(len(cycles), 1)
+        self.assertEqual(len(cycles[0]), size)
+    
+    def test_calculator_reports_titles(self):
+        """detect_circular_dependencies should keep returning readable cycle strings"""
+        first = Task.objects.create(title="Circular 1")
+        second = Task.objects.create(title="Circular 2")
+        first.dependencies.add(second)
+        second.dependencies.add(first)
+        
+        cycles = PriorityCalculator().detect_circular_dependencies([first, second])
+        
+        self.assertEqual(len(cycles), 1)
+        self.assertIn('Circular 1', cycles[0])
+        self.assertIn('Circular 2', cycles[0])
+
+
+class QueryCountTestCase(TestCase):
+    """Test cases for keeping list and analyze query counts flat"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", estimated_hours=i, importance=(i % 10) + 1)
+            for i in range(12)
+        ]
+        for i in range(1, 12):
+            self.tasks[i].dependencies.add(self.tasks[i - 1])
+    
+    def test_list_counts_are_annotated(self):
+        """Listing tasks should not run a COUNT per row (plus two ETag fingerprint queries)"""
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/tasks/')
+        
+        results = {row['id']: row for row in response.json()['results']}
+        middle = self.tasks[5]
+        self.assertEqual(results[middle.id]['blocking_count'], 1)
+        self.assertEqual(results[middle.id]['blocked_by_count'], 1)
+    
+    def test_update_returns_fresh_counts(self):
+        """PATCHing dependencies reports the new counts, not the pre-update annotation"""
+        task = Task.objects.create(title="Loose")
+        response = self.client.patch(
+            f'/api/tasks/{task.id}/', {'dependencies': [self.tasks[0].id, self.tasks[1].id]}, content_type='application/json'
+        )
+        
+        self.assertEqual(response.json()['blocked_by_count'], 2)
+        self.assertEqual(response.json(), self.client.get(f'/api/tasks/{task.id}/').json())
+    
+    def test_hub_counts(self):
+        """Counts stay exact for tasks with both many dependents and many dependencies"""
+        hub = self.tasks[0]
+        hub.dependencies.add(*self.tasks[6:])
+        for task in self.tasks[2:6]:
+            task.dependencies.add(hub)
+        
+        data = self.client.get(f'/api/tasks/{hub.id}/').json()
+        self.assertEqual(data['blocking_count'], 5)
+        self.assertEqual(data['blocked_by_count'], 6)
+    
+    def test_analyze_query_count_is_constant(self):
+        """Analyze should load tasks and edges once regardless of task count (plus the ETag fingerprint)"""
+        with self.assertNumQueries(4):
+            response = self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'},
+                                        content_type='application/json')
+        
+        data = {row['id']: row for row in response.json()['tasks']}
+        self.assertEqual(data[self.tasks[0].id]['blocking_count'], 1)
+        self.assertEqual(data[self.tasks[0].id]['blocked_count'], 0)
+        self.assertEqual(data[self.tasks[0].id]['blocked_by_count'], 0)
+
+
+class BatchScorerTestCase(TestCase):
+    """Test cases for the vectorized batch scorer"""
+    
+    def test_matches_per_task_scoring(self):
+        """Every strategy column should equal the per-task calculation"""
+        today = datetime.now().date()
+        tasks = [
+            Task.objects.create(title=f"Task {offset}", due_date=today + timedelta(days=offset) if offset < 10 else None,
+                                estimated_hours=offset % 6, importance=(offset % 10) + 1)
+            for offset in range(-2, 12)
+        ]
+        for i in range(1, 5):
+            tasks[i].dependencies.add(tasks[0])
+        tasks[0].dependencies.add(tasks[7])
+        
+        calculator = PriorityCalculator()
+        graph = DependencyGraph.from_database()
+        batch = BatchScorer(tasks, graph, today)
+        
+        self.assertEqual(batch.scores.shape, (len(tasks), len(STRATEGIES)))
+        for column, strategy in enumerate(STRATEGIES):
+            for row, task in enumerate(tasks):
+                expected = calculator.calculate_priority_score(task, strategy, all_tasks=tasks)
+                self.assertAlmostEqual(batch.scores[row, column], expected)
+
+
+class TopTasksTestCase(TestCase):
+    """Test cases for top-k selection"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.calculator = PriorityCalculator()
+        today = datetime.now().date()
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", due_date=today + timedelta(days=i % 9),
+                                estimated_hours=i % 5, importance=(i * 7 % 10) + 1)
+            for i in range(40)
+        ]
+    
+    def test_top_k_matches_full_sort(self):
+        """Top-k should return the same prefix as a full sort, ties included"""
+        for strategy in STRATEGIES:
+            for count in [1, 3, 10, 40, 50]:
+                expected = self.calculator.sort_by_strategy(self.tasks, strategy)[:count]
+                top = self.calculator.get_top_tasks(self.tasks, count, strategy)
+                self.assertEqual([(t.id, s) for t, s in top], [(t.id, s) for t, s in expected])
+    
+    def test_suggest_returns_count(self):
+        """Suggest should return the requested number of tasks with breakdowns"""
+        response = self.client.post('/api/tasks/suggest/', {'count': 3, 'strategy': 'high_impact'},
+                                    content_type='application/json')
+        data = response.json()
+        
+        self.assertEqual(len(data['suggested_tasks']), 3)
+        self.assertIn('score_breakdown', data['suggested_tasks'][0])
+
+
+class StoredScoresTestCase(TestCase):
+    """Test cases for persisted, incrementally maintained priority scores"""
+    
+    def assertScoresCurrent(self, *tasks):
+        """Stored scores should equal a fresh calculation over all tasks"""
+        all_tasks = list(Task.objects.all())
+        calculator = PriorityCalculator()
+        for task in tasks:
+            task.refresh_from_db()
+            for strategy in STRATEGIES:
+                expected = calculator.calculate_priority_score(task, strategy, all_tasks=all_tasks)
+                self.assertAlmostEqual(getattr(task, f'score_{strategy}'), expected)
+    
+    def test_scores_follow_saves_and_dependencies(self):
+        """Saving a task or changing an edge should rescore it and its neighbours"""
+        base = Task.objects.create(title="Base", estimated_hours=1, importance=6)
+        child = Task.objects.create(title="Child", estimated_hours=3, importance=4)
+        self.assertScoresCurrent(base, child)
+        
+        child.dependencies.add(base)
+        self.assertScoresCurrent(base, child)
+        
+        base.importance = 10
+        base.save()
+        self.assertScoresCurrent(base, child)
+        
+        child.dependencies.clear()
+        self.assertScoresCurrent(base, child)
+        
+        child.dependencies.add(base)
+        child.delete()
+        self.assertScoresCurrent(base)
+    
+    def test_rollover_only_rescores_crossed_boundaries(self):
+        """Rollover should rescore tasks whose urgency bucket changed and nothing else"""
+        today = datetime.now().date()
+        yesterday = today - timedelta(days=1)
+        crossing = Task.objects.create(title="Now due in a week", due_date=today + timedelta(days=7))
+        steady = Task.objects.create(title="Still far away", due_date=today + timedelta(days=30))
+        Task.objects.update(scored_on=yesterday, score_deadline_driven=0)
+        
+        rescored = rollover_scores(today)
+        
+        self.assertEqual(rescored, 1)
+        crossing.refresh_from_db()
+        steady.refresh_from_db()
+        self.assertGreater(crossing.score_deadline_driven, 0)
+        self.assertEqual(steady.score_deadline_driven, 0)
+        self.assertEqual(steady.scored_on, today)
+    
+    def test_request_path_skips_the_date_rollover(self):
+        """ensure_scores_current only scores never-scored tasks, a bounded batch at a time"""
+        today = datetime.now().date()
+        dated = Task.objects.create(title="Now due in a week", due_date=today + timedelta(days=7))
+        Task.objects.filter(id=dated.id).update(scored_on=today - timedelta(days=1), score_deadline_driven=0)
+        Task.objects.bulk_create([Task(title=f"Raw {i}") for i in range(5)])
+        
+        self.assertEqual(ensure_scores_current(today, limit=3), 3)
+        self.assertEqual(ensure_scores_current(today, limit=3), 2)
+        self.assertEqual(ensure_scores_current(today), 0)
+        dated.refresh_from_db()
+        self.assertEqual(dated.score_deadline_driven, 0)
+    
+    def test_suggest_uses_stored_ranking(self):
+        """Suggest should match the full calculation"""
+        today = datetime.now().date()
+        tasks = [
+            Task.objects.create(title=f"Task {i}", due_date=today + timedelta(days=i),
+                                estimated_hours=i % 4, importance=(i * 3 % 10) + 1)
+            for i in range(15)
+        ]
+        expected = PriorityCalculator().get_top_tasks(tasks, 3, 'deadline_driven')
+        
+        response = self.client.post('/api/tasks/suggest/', {'count': 3, 'strategy': 'deadline_driven'},
+                                    content_type='application/json')
+        
+        self.assertEqual([row['id'] for row in response.json()['suggested_tasks']],
+                         [task.id for task, _ in expected])
+
+
+class StreamingImportTestCase(TestCase):
+    """Test cases for batched NDJSON/CSV import"""
+    
+    def test_ndjson_import_resolves_forward_refs(self):
+        """Dependencies may reference rows later in the same file"""
+        body = '\n'.join([
+            '{"ref": "ui", "title": "UI", "estimated_hours": 3, "dependencies": ["api"]}',
+            '{"ref": "api", "title": "API", "importance": 8, "dependencies": ["db"]}',
+            'not json',
+            '{"ref": "db", "title": "Schema", "due_date": "2025-12-01"}',
+            '{"title": ""}',
+        ])
+        
+        response = self.client.post('/api/tasks/stream_import/?import_format=ndjson&batch_size=2',
+                                    body, content_type='application/x-ndjson')
+        data = response.json()
+        
+        self.assertEqual(data['created_count'], 3)
+        self.assertEqual([f['index'] for f in data['failed_tasks']], [3, 5])
+        ui = Task.objects.get(title="UI")
+        api = Task.objects.get(title="API")
+        self.assertEqual(list(ui.dependencies.all()), [api])
+        self.assertEqual(api.dependencies.get().title, "Schema")
+    
+    def test_csv_import_and_unknown_dependency(self):
+        """CSV dependencies are ';' separated; unknown ones are warnings, not failures"""
+        existing = Task.objects.create(title="Existing")
+        body = (
+            'ref,title,due_date,estimated_hours,importance,dependencies\n'
+            f'a,First,,1,4,{existing.id}\n'
+            'b,Second,2025-12-10,2,7,a;missing\n'
+        )
+        
+        response = self.client.post('/api/tasks/stream_import/?import_format=csv', body, content_type='text/csv')
+        data = response.json()
+        
+        self.assertEqual(data['created_count'], 2)
+        self.assertEqual(data['failed_count'], 0)
+        self.assertIsNone(data['failed_tasks'])
+        self.assertEqual(data['warnings'][0]['ref'], 'b')
+        self.assertEqual(data['warnings'][0]['id'], Task.objects.get(title="Second").id)
+        second = Task.objects.get(title="Second")
+        self.assertEqual(second.dependencies.get().title, "First")
+        self.assertEqual(Task.objects.get(title="First").dependencies.get(), existing)
+    
+    def test_bulk_import_has_no_row_cap(self):
+        """bulk_import should accept more than 100 tasks"""
+        tasks = [{'title': f'Task {i}', 'importance': 15} for i in range(150)]
+        
+        response = self.client.post('/api/tasks/bulk_import/', {'tasks': tasks}, content_type='application/json')
+        data = response.json()
+        
+        self.assertEqual(data['created_count'], 150)
+        self.assertEqual(Task.objects.filter(importance=10).count(), 150)
+
+
+class StreamingExportTestCase(TestCase):
+    """Test cases for chunked NDJSON/CSV export"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.tasks = [Task.objects.create(title=f"Task {i}", estimated_hours=i, importance=5) for i in range(7)]
+        for i in range(1, 7):
+            self.tasks[i].dependencies.add(self.tasks[i - 1])
+    
+    def test_ndjson_export_round_trips(self):
+        """Exported NDJSON should re-import with the same dependency chain"""
+        response = self.client.get('/api/tasks/export/?format=ndjson&chunk_size=3')
+        body = b''.join(response.streaming_content)
+        
+        Task.objects.all().delete()
+        result = self.client.post('/api/tasks/stream_import/', body, content_type='application/x-ndjson').json()
+        
+        self.assertEqual(result['created_count'], 7)
+        self.assertIsNone(result['failed_tasks'])
+        self.assertEqual(Task.objects.get(title="Task 6").dependencies.get().title, "Task 5")
+    
+    def test_csv_export_queries_per_chunk(self):
+        """CSV export should issue the fingerprint, one streaming task query and one edge query per chunk"""
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/tasks/export/?format=csv&chunk_size=4')
+            lines = b''.join(response.streaming_content).decode().splitlines()
+        
+        self.assertEqual(lines[0], 'ref,title,due_date,estimated_hours,importance,dependencies')
+        self.assertEqual(len(lines), 8)
+    
+    def test_gzip_export(self):
+        """gzip=true should compress the stream"""
+        response = self.client.get('/api/tasks/export/?format=ndjson&gzip=true')
+        body = gzip.decompress(b''.join(response.streaming_content)).decode()
+        
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertEqual(len(body.splitlines()), 7)
+    
+    def test_json_export_unchanged(self):
+        """JSON export keeps its original shape"""
+        data = self.client.get('/api/tasks/export/?format=json').json()
+        
+        self.assertEqual(data['count'], 7)
+        self.assertEqual(set(data['tasks'][0]), {'title', 'due_date', 'estimated_hours', 'importance', 'dependencies'})
+
+
+class ReachabilityIndexTestCase(TestCase):
+    """Test cases for transitive upstream/downstream queries"""
+    
+    def test_chain_with_cycle(self):
+        """Closure should follow chains and collapse cycles"""
+        graph = DependencyGraph()
+        # 4 -> 3 -> 2 <-> 5, 2 -> 1, 6 isolated
+        graph.load_edges([(4, 3), (3, 2), (2, 5), (5, 2), (2, 1)], task_ids=[1, 2, 3, 4, 5, 6])
+        
+        self.assertEqual(sorted(graph.get_blocked_tasks(4)), [1, 2, 3, 5])
+        self.assertEqual(sorted(graph.get_blocked_tasks(2)), [1, 5])
+        self.assertEqual(sorted(graph.get_blocking_tasks(1)), [2, 3, 4, 5])
+        self.assertEqual(sorted(graph.get_blocking_tasks(5)), [2, 3, 4])
+        self.assertEqual(graph.get_blocking_tasks(6), [])
+        self.assertEqual(graph.get_blocked_tasks(99), [])
+    
+    def test_deep_chain(self):
+        """A long chain should not hit the recursion limit"""
+        graph = DependencyGraph()
+        graph.load_edges([(i + 1, i) for i in range(20000)])
+        
+        self.assertEqual(len(graph.get_blocked_tasks(20000)), 20000)
+        self.assertEqual(len(graph.get_blocking_tasks(0)), 20000)
+    
+    def test_dependency_info_endpoint_and_invalidation(self):
+        """dependency_info should report transitive tasks and see new edges"""
+        a = Task.objects.create(title="A")
+        b = Task.objects.create(title="B")
+        c = Task.objects.create(title="C")
+        b.dependencies.add(a)
+        
+        data = self.client.get(f'/api/tasks/{a.id}/dependency_info/').json()
+        self.assertEqual(data['blocking_count'], 1)
+        
+        c.dependencies.add(b)
+        data = self.client.get(f'/api/tasks/{a.id}/dependency_info/').json()
+        
+        self.assertEqual(data['blocking_count'], 2)
+        self.assertEqual({t['title'] for t in data['all_blocking_tasks']}, {"B", "C"})
+        self.assertEqual(self.client.get(f'/api/tasks/{c.id}/dependency_info/').json()['blocked_count'], 2)
+    
+    def test_dependency_info_sees_imported_edges(self):
+        """Edges written by bulk_import (no m2m_changed) and raw writes reach the cached index"""
+        a = Task.objects.create(title="A")
+        self.assertEqual(self.client.get(f'/api/tasks/{a.id}/dependency_info/').json()['blocking_count'], 0)
+        
+        rows = [{'ref': 'b', 'title': 'B', 'dependencies': [str(a.id)]}]
+        self.client.post('/api/tasks/bulk_import/', {'tasks': rows}, content_type='application/json')
+        self.assertEqual(self.client.get(f'/api/tasks/{a.id}/dependency_info/').json()['blocking_count'], 1)
+        
+        # bulk_create on the through table stands in for another process's write
+        c = Task.objects.bulk_create([Task(title="C")])[0]
+        Task.dependencies.through.objects.bulk_create([Task.dependencies.through(from_task_id=c.id, to_task_id=a.id)])
+        self.assertEqual(self.client.get(f'/api/tasks/{a.id}/dependency_info/').json()['blocking_count'], 2)
+
+
+class CriticalPathTestCase(TestCase):
+    """Test cases for the estimated-hours critical path"""
+    
+    def test_longest_chain_and_float(self):
+        """The heaviest chain is critical; the short branch has float"""
+        graph = DependencyGraph()
+        # design(8) -> build(16) -> ship(4); design -> docs(2) -> ship
+        graph.load_edges([(2, 1), (3, 1), (4, 2), (4, 3)])
+        tasks = [
+            (1, 'Design', 8, None),
+            (2, 'Build', 16, None),
+            (3, 'Docs', 2, None),
+            (4, 'Ship', 4, date(2025, 10, 24)),
+        ]
+        
+        path = CriticalPath(tasks, graph, today=date(2025, 10, 13), hours_per_day=8)
+        details = {row['id']: row for row in path.task_details()}
+        
+        self.assertEqual(path.path, [1, 2, 4])
+        self.assertEqual(path.total_hours, 28)
+        self.assertEqual(details[3]['float_hours'], 14)
+        self.assertTrue(details[2]['is_critical'])
+        self.assertFalse(details[3]['is_critical'])
+        # 13-24 Oct 2025 has 8 business days (Diwali 20-21 Oct); 28h needs 3.5
+        self.assertEqual(details[4]['slack_business_days'], 4.5)
+    
+    def test_cycles_are_excluded(self):
+        """Tasks in a cycle and tasks waiting on one cannot be scheduled and are reported apart"""
+        graph = DependencyGraph()
+        graph.load_edges([(1, 2), (2, 1), (3, 1)])
+        path = CriticalPath([(1, 'A', 1, None), (2, 'B', 1, None), (3, 'C', 1, None), (4, 'D', 5, None)], graph)
+        
+        self.assertEqual(sorted(path.cyclic_task_ids), [1, 2])
+        self.assertEqual(path.blocked_task_ids, [3])
+        self.assertEqual(path.path, [4])
+    
+    def test_endpoint(self):
+        """critical_path action should return the chain with titles"""
+        first = Task.objects.create(title="First", estimated_hours=3)
+        second = Task.objects.create(title="Second", estimated_hours=5)
+        second.dependencies.add(first)
+        
+        data = self.client.get('/api/tasks/critical_path/').json()
+        
+        self.assertEqual([row['title'] for row in data['critical_path']], ["First", "Second"])
+        self.assertEqual(data['total_hours'], 8)
+        self.assertEqual(data['business_days'], 1)
+    
+    def test_edge_pairs_and_at_risk(self):
+        """Raw (task, dependency) pairs match a DependencyGraph; unknown ids are ignored"""
+        tasks = [(1, 'A', 24, date(2025, 10, 14)), (2, 'B', 8, None), (3, 'C', 4, date(2025, 12, 1))]
+        graph = DependencyGraph()
+        graph.load_edges([(2, 1), (3, 2)])
+        
+        from_graph = CriticalPath(tasks, graph, today=date(2025, 10, 13), hours_per_day=8)
+        from_pairs = CriticalPath(tasks, [(2, 1), (3, 2), (3, 99)], today=date(2025, 10, 13), hours_per_day=8)
+        
+        self.assertEqual(from_pairs.path, from_graph.path)
+        self.assertEqual(from_pairs.task_details(), from_graph.task_details())
+        self.assertEqual(from_pairs.at_risk_ids(), [1])
+    
+    def test_due_date_at_end_of_calendar(self):
+        """date.max due dates have slack instead of overflowing the day after"""
+        path = CriticalPath([(1, 'A', 2, date.max), (2, 'B', 8, date(2025, 10, 13))], [], today=date(2025, 10, 13),
+                            hours_per_day=8)
+        details = {row['id']: row for row in path.task_details()}
+        
+        self.assertEqual(path.at_risk_ids(), [])
+        self.assertGreater(details[1]['slack_business_days'], 0)
+        # Today is a business day and the whole 8 hours fit in it
+        self.assertEqual(details[2]['slack_business_days'], 0)
+        
+        Task.objects.create(title="Forever", estimated_hours=2, due_date=date.max)
+        self.assertEqual(self.client.get('/api/tasks/critical_path/').status_code, 200)
+    
+    def test_endpoint_details_only_shown_rows(self):
+        """Without include_all only path and at-risk rows are built, matching the full rows"""
+        late = Task.objects.create(title="Late", estimated_hours=40, due_date=date.today())
+        Task.objects.create(title="Side", estimated_hours=1)
+        
+        data = self.client.get('/api/tasks/critical_path/').json()
+        full = self.client.get('/api/tasks/critical_path/?include_all=true').json()
+        
+        self.assertNotIn('tasks', data)
+        self.assertEqual([row['id'] for row in data['at_risk_tasks']], [late.id])
+        self.assertEqual(data['at_risk_tasks'], full['at_risk_tasks'])
+        self.assertEqual(data['critical_path'], full['critical_path'])
+        self.assertEqual(len(full['tasks']), 2)
+
+
+class ScheduleSimulatorTestCase(TestCase):
+    """Test cases for the capacity-aware list scheduler"""
+    
+    def test_priority_capacity_and_dependencies(self):
+        """Two workers take the best ready tasks; dependents wait for their dependencies"""
+        graph = DependencyGraph()
+        graph.load_edges([(3, 1)])
+        tasks = [
+            (1, 'Blocker', 8, None, 50),
+            (2, 'Urgent', 4, None, 90),
+            (3, 'After blocker', 8, date(2025, 10, 14), 99),
+            (4, 'Low', 4, None, 10),
+        ]
+        
+        # Mon 13 Oct 2025 start, one business day is 8h
+        simulator = ScheduleSimulator(tasks, graph, workers=2, hours_per_day=8, start_date=date(2025, 10, 13))
+        plan = {row['id']: row for row in simulator.task_plan()}
+        
+        self.assertEqual(plan[2]['start_date'], '2025-10-13')
+        self.assertEqual(plan[1]['start_date'], '2025-10-13')
+        self.assertEqual(plan[4]['start_date'], '2025-10-13')
+        self.assertEqual(plan[4]['worker'], plan[2]['worker'])
+        self.assertEqual(plan[3]['start_date'], '2025-10-14')
+        self.assertEqual(plan[3]['finish_date'], '2025-10-14')
+        self.assertFalse(plan[3]['slips'])
+    
+    def test_slips_skip_holidays(self):
+        """Work spills over holidays and reports the slipped deadline"""
+        tasks = [(1, 'Big job', 24, date(2025, 10, 17), 50)]
+        
+        simulator = ScheduleSimulator(tasks, DependencyGraph(), hours_per_day=8, start_date=date(2025, 10, 16))
+        plan = simulator.task_plan()[0]
+        
+        # Thu 16, Fri 17, then Diwali (20-21) -> finishes Wed 22
+        self.assertEqual(plan['finish_date'], '2025-10-22')
+        self.assertTrue(plan['slips'])
+        self.assertEqual(plan['slip_business_days'], 1)
+        self.assertEqual([day['date'] for day in simulator.daily_plan()], ['2025-10-16', '2025-10-17', '2025-10-22'])
+    
+    def test_schedule_endpoint(self):
+        """schedule action should plan every task"""
+        first = Task.objects.create(title="First", estimated_hours=3)
+        second = Task.objects.create(title="Second", estimated_hours=5)
+        second.dependencies.add(first)
+        
+        data = self.client.post('/api/tasks/schedule/', {'workers': 2, 'include_daily_plan': True},
+                                content_type='application/json').json()
+        
+        self.assertEqual(data['scheduled_count'], 2)
+        self.assertEqual([row['title'] for row in data['tasks']], ["First", "Second"])
+        self.assertEqual(len(data['daily_plan']), 1)
+    
+    def test_daily_plan_stops_at_horizon(self):
+        """An oversized task fills the horizon's days and slips instead of listing every day"""
+        tasks = [(1, 'Huge', 8e6, date(2025, 12, 31), 50)]
+        simulator = ScheduleSimulator(tasks, DependencyGraph(), hours_per_day=8,
+                                      start_date=date(2025, 10, 13), horizon_days=20)
+        
+        self.assertLessEqual(len(simulator.daily_plan()), 20)
+        self.assertTrue(simulator.task_plan()[0]['slips'])
+    
+    def test_schedule_rejects_out_of_range_sizes(self):
+        """workers and horizon_days outside their bounds are a 400, not a huge allocation"""
+        Task.objects.create(title="Only", estimated_hours=3)
+        for body in [{'workers': 10 ** 9}, {'workers': 0}, {'horizon_days': 10 ** 9}, {'horizon_days': -5}]:
+            response = self.client.post('/api/tasks/schedule/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+        with self.assertRaises(ValueError):
+            ScheduleSimulator([], DependencyGraph(), workers=MAX_WORKERS + 1)
+
+
+class GraphLayoutTestCase(TestCase):
+    """Test cases for the server-side Barnes-Hut layout"""
+    
+    def test_repulsion_matches_exact_forces(self):
+        """Barnes-Hut repulsion should stay close to the exact all-pairs sum"""
+        positions = np.random.default_rng(3).random((400, 2)) * 0.999
+        delta = positions[:, None, :] - positions[None, :, :]
+        dist_sq = (delta ** 2).sum(axis=2)
+        np.fill_diagonal(dist_sq, np.inf)
+        exact = (delta / dist_sq[..., None]).sum(axis=1)
+        
+        approx = barnes_hut_repulsion(positions, 1.0)
+        error = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+        
+        self.assertLess(np.median(error), 0.05)
+    
+    def test_layout_endpoint_is_cached_by_version(self):
+        """Layout arrays line up and are reused until the graph changes"""
+        first = Task.objects.create(title="First")
+        second = Task.objects.create(title="Second")
+        third = Task.objects.create(title="Third")
+        second.dependencies.add(first)
+        third.dependencies.add(second)
+        
+        data = self.client.get('/api/tasks/graph_layout/').json()
+        
+        self.assertEqual(len(data['ids']), 3)
+        self.assertEqual(len(data['x']), 3)
+        self.assertEqual(len(data['edges']), 2)
+        depth = dict(zip(data['ids'], data['depth']))
+        self.assertEqual([depth[first.id], depth[second.id], depth[third.id]], [0, 1, 2])
+        self.assertTrue(all(0 <= x <= data['width'] for x in data['x']))
+        self.assertEqual(self.client.get('/api/tasks/graph_layout/').json()['version'], data['version'])
+        
+        first.dependencies.add(third)
+        changed = self.client.get('/api/tasks/graph_layout/').json()
+        
+        self.assertNotEqual(changed['version'], data['version'])
+        self.assertTrue(all(changed['in_cycle']))
+
+
+class SubgraphTestCase(TestCase):
+    """Test cases for k-hop subgraph extraction"""
+    
+    def setUp(self):
+        """Chain t0 <- t1 <- t2 <- t3 <- t4 plus an unrelated task"""
+        self.tasks = [Task.objects.create(title=f"Step {i}") for i in range(5)]
+        for i in range(1, 5):
+            self.tasks[i].dependencies.add(self.tasks[i - 1])
+        self.other = Task.objects.create(title="Unrelated")
+    
+    def test_directions_and_hops(self):
+        """Upstream follows dependencies, downstream follows dependents"""
+        t = [task.id for task in self.tasks]
+        
+        _, up, _ = extract_subgraph([t[2]], hops=1, direction='upstream')
+        _, down, _ = extract_subgraph([t[2]], hops=2, direction='downstream')
+        graph, both, _ = extract_subgraph([t[2]], hops=1, direction='both')
+        
+        self.assertEqual(up, {t[2]: 0, t[1]: 1})
+        self.assertEqual(down, {t[2]: 0, t[3]: 1, t[4]: 2})
+        self.assertEqual(set(both), {t[1], t[2], t[3]})
+        self.assertEqual(graph.graph[t[3]], {t[2]})
+    
+    def test_queries_scale_with_hops(self):
+        """One query per hop and direction plus one for the induced edges"""
+        with self.assertNumQueries(3):
+            extract_subgraph([self.tasks[0].id], hops=2, direction='downstream')
+    
+    def test_endpoint(self):
+        """subgraph action returns nodes with hop distance and an edge list"""
+        data = self.client.get(f'/api/tasks/subgraph/?ids={self.tasks[4].id}&hops=10&direction=upstream').json()
+        
+        self.assertEqual(data['node_count'], 5)
+        self.assertEqual(len(data['edges']), 4)
+        self.assertNotIn(self.other.id, [node['id'] for node in data['nodes']])
+        
+        truncated = self.client.get(f'/api/tasks/subgraph/?ids={self.tasks[4].id}&hops=10&max_nodes=2').json()
+        self.assertTrue(truncated['truncated'])
+        self.assertEqual(truncated['node_count'], 2)
+
+
+class ResultCacheTestCase(TestCase):
+    """Test cases for the versioned analyze/suggest result cache"""
+    
+    def setUp(self):
+        get_cache().clear()
+        reset_cache_stats()
+        self.task = Task.objects.create(title="Cached", importance=5, estimated_hours=2)
+    
+    def test_repeat_calls_hit(self):
+        """Unchanged data is served from cache; only the ETag fingerprint touches the database"""
+        first = self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'}, content_type='application/json')
+        with self.assertNumQueries(2):
+            second = self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'}, content_type='application/json')
+        
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(cache_stats()['hits'], 1)
+        self.assertEqual(cache_stats()['misses'], 1)
+    
+    def test_writes_invalidate(self):
+        """Saves, edge changes and deletes move to a new dataset version"""
+        versions = [dataset_version()]
+        other = Task.objects.create(title="Other")
+        versions.append(dataset_version())
+        self.task.dependencies.add(other)
+        versions.append(dataset_version())
+        other.delete()
+        versions.append(dataset_version())
+        
+        self.assertEqual(len(set(versions)), 4)
+    
+    def test_suggest_reflects_updates(self):
+        """A cached suggestion is recomputed after the task changes"""
+        self.client.post('/api/tasks/suggest/', {'count': 1}, content_type='application/json')
+        self.task.title = "Renamed"
+        self.task.save()
+        response = self.client.post('/api/tasks/suggest/', {'count': 1}, content_type='application/json')
+        
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['suggested_tasks'][0]['title'], "Renamed")
+    
+    def test_writes_outside_this_process_invalidate(self):
+        """Writes that skip this process's signals (another worker, bulk paths) still miss"""
+        url = '/api/tasks/analyze/'
+        self.client.post(url, {'strategy': 'smart_balance'}, content_type='application/json')
+        version = dataset_version()
+        
+        # bulk_create sends no post_save, so only the database fingerprint sees it
+        Task.objects.bulk_create([Task(title="Elsewhere", importance=3, estimated_hours=1)])
+        response = self.client.post(url, {'strategy': 'smart_balance'}, content_type='application/json')
+        
+        self.assertEqual(dataset_version(), version)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['count'], 2)
+
+
+class ETagTestCase(TestCase):
+    """Test cases for conditional requests on list, analyze and export"""
+    
+    def setUp(self):
+        self.task = Task.objects.create(title="Tagged", importance=6, estimated_hours=3)
+    
+    def test_list_not_modified(self):
+        """A matching If-None-Match costs only the fingerprint queries"""
+        etag = self.client.get('/api/tasks/')['ETag']
+        
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+    
+    def test_etag_changes_with_data_and_strategy(self):
+        """Edits and a different strategy both produce a fresh tag"""
+        url = '/api/tasks/analyze/'
+        etag = self.client.post(url, {'strategy': 'smart_balance'}, content_type='application/json')['ETag']
+        
+        other = self.client.post(url, {'strategy': 'high_impact'}, content_type='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(other.status_code, 200)
+        
+        same = self.client.post(url, {'strategy': 'smart_balance'}, content_type='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(same.status_code, 304)
+        
+        self.task.importance = 9
+        self.task.save()
+        changed = self.client.post(url, {'strategy': 'smart_balance'}, content_type='application/json', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+    
+    def test_export_and_retrieve(self):
+        """Streaming export and detail views honour If-None-Match"""
+        export_url = '/api/tasks/export/?format=ndjson'
+        etag = self.client.get(export_url)['ETag']
+        self.assertEqual(self.client.get(export_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        
+        detail_url = f'/api/tasks/{self.task.id}/'
+        etag = self.client.get(detail_url)['ETag']
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=f'W/{etag}').status_code, 304)
+
+
+class BenchmarkSuiteTestCase(TestCase):
+    """Test cases for the synthetic graph generators and benchmark runner"""
+    
+    def _graph(self, rows):
+        graph = DependencyGraph()
+        graph.load_edges(
+            [(int(row['ref']), int(dep)) for row in rows for dep in row['dependencies']],
+            task_ids=[int(row['ref']) for row in rows]
+        )
+        return graph
+    
+    def test_generated_shapes(self):
+        """Only the planted-cycle shape contains cycles; generation is deterministic"""
+        for shape in SHAPES:
+            rows = generate_tasks(shape, 2000, seed=1)
+            self.assertEqual(len(rows), 2000)
+            self.assertEqual(bool(self._graph(rows).find_cycles()), shape == 'cycles', shape)
+        
+        self.assertEqual(generate_tasks('random_dag', 100, seed=3), generate_tasks('random_dag', 100, seed=3))
+        fan_out = self._graph(generate_tasks('fan_out', 2000))
+        self.assertEqual(len(fan_out.reverse_graph[0]), 999)
+    
+    def test_runner_stays_within_query_ceilings(self):
+        """Every timed operation records queries under its ceiling and rows are rolled back"""
+        runner = BenchmarkRunner(repeat=1)
+        runner.run_case('cycles', 120)
+        report = runner.report()
+        
+        operations = {r['operation'] for r in report['results']}
+        self.assertIn('bulk_import', operations)
+        self.assertIn('calculate_business_days', operations)
+        for result in report['results']:
+            self.assertTrue(result['within_budget'], result)
+        self.assertEqual(Task.objects.count(), 0)
+        
+        diff = compare_reports(report, report)
+        self.assertTrue(all(row['queries_delta'] == 0 for row in diff))
+
+
+class InstrumentationTestCase(TestCase):
+    """Test cases for Server-Timing request instrumentation"""
+    
+    def setUp(self):
+        get_cache().clear()
+        a = Task.objects.create(title="A", importance=5, estimated_hours=2)
+        Task.objects.create(title="B", importance=7, estimated_hours=1).dependencies.add(a)
+    
+    @override_settings(TASK_INSTRUMENTATION=True)
+    def test_analyze_stages_in_header(self):
+        """analyze reports its stages, SQL time and query count"""
+        response = self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'}, content_type='application/json')
+        timing = response['Server-Timing']
+        
+        for name in ('load', 'graph', 'score', 'rank', 'serialize', 'total'):
+            self.assertIn(f'{name};dur=', timing)
+        self.assertIn('desc="4 queries"', timing)
+    
+    @override_settings(TASK_INSTRUMENTATION=True, TASK_REQUEST_BUDGET_MS=0)
+    def test_slow_requests_logged(self):
+        """Requests over budget are logged with their breakdown"""
+        with self.assertLogs('tasks.instrumentation', level='WARNING') as logs:
+            self.client.get('/api/tasks/check_cycles/')
+        self.assertIn('/api/tasks/check_cycles/', logs.output[0])
+    
+    def test_disabled_by_default(self):
+        """With the setting off no header is added and stage() is a shared no-op"""
+        response = self.client.get('/api/tasks/check_cycles/')
+        
+        self.assertNotIn('Server-Timing', response)
+        self.assertIs(stage('load'), stage('graph'))
+
+
+class MetricsEndpointTestCase(TestCase):
+    """Test cases for the Prometheus metrics endpoint"""
+    
+    def _series(self, body, name):
+        for line in body.splitlines():
+            if line.startswith(name + ' '):
+                return float(line.split()[-1])
+        self.fail(f'{name} not exported')
+    
+    def test_latency_histogram_and_graph_size(self):
+        """Tracked actions feed the latency histogram; graph gauges count rows"""
+        before = metrics.snapshot().get('task_analyzer_request_duration_seconds_count{action="check_cycles"}', 0)
+        Task.objects.create(title="Metric").dependencies.add(Task.objects.create(title="Dep"))
+        self.client.get('/api/tasks/check_cycles/')
+        
+        response = self.client.get('/api/metrics')
+        body = response.content.decode()
+        
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertIn('# TYPE task_analyzer_request_duration_seconds histogram', body)
+        self.assertEqual(self._series(body, 'task_analyzer_request_duration_seconds_count{action="check_cycles"}'), before + 1)
+        self.assertEqual(self._series(body, 'task_analyzer_graph_tasks'), 2)
+        self.assertEqual(self._series(body, 'task_analyzer_graph_edges'), 1)
+    
+    def test_scoring_counted_by_source(self):
+        """Signal rescores and analyze requests are counted under separate source labels"""
+        signal_series = f'{ROWS_SCORED}{{source="signal"}}'
+        request_series = f'{ROWS_SCORED}{{source="request"}}'
+        before = metrics.snapshot()
+        Task.objects.create(title="Saved")
+        after_save = metrics.snapshot()
+        self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'}, content_type='application/json')
+        
+        body = self.client.get('/api/metrics').content.decode()
+        
+        self.assertEqual(after_save.get(signal_series, 0) - before.get(signal_series, 0), 1)
+        self.assertEqual(after_save.get(request_series, 0), before.get(request_series, 0))
+        self.assertEqual(self._series(body, request_series), before.get(request_series, 0) + 1)
+    
+    def test_aggregates_process_files(self):
+        """With TASK_METRICS_DIR set, counters from every live worker file are summed"""
+        with tempfile.TemporaryDirectory() as directory, self.settings(TASK_METRICS_DIR=directory):
+            with open(os.path.join(directory, f'metrics-{os.getppid()}-1.json'), 'w') as f:
+                json.dump({CACHE_HITS: 40}, f)
+            
+            body = self.client.get('/api/metrics').content.decode()
+            own = metrics.snapshot().get(CACHE_HITS, 0)
+            
+            self.assertEqual(self._series(body, CACHE_HITS), own + 40)
+            self.assertEqual(len([name for name in os.listdir(directory) if name.startswith(f'metrics-{os.getpid()}-')]), 1)
+    
+    def test_dead_worker_files_are_skipped(self):
+        """Files left by exited processes drop out; a process removes its own file at exit"""
+        process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        process.wait()
+        with tempfile.TemporaryDirectory() as directory, self.settings(TASK_METRICS_DIR=directory):
+            with open(os.path.join(directory, f'metrics-{process.pid}-1.json'), 'w') as f:
+                json.dump({CACHE_HITS: 40}, f)
+            
+            self.assertEqual(metrics.aggregate().get(CACHE_HITS, 0), metrics.snapshot().get(CACHE_HITS, 0))
+            metrics.remove_file()
+            self.assertEqual(os.listdir(directory), [f'metrics-{process.pid}-1.json'])
+    
+    def test_health_check_reachable(self):
+        """health/ is routed before the task detail route"""
+        self.assertEqual(self.client.get('/api/tasks/health/').json()['status'], 'healthy')
+
+
+class ProfilingHookTestCase(TestCase):
+    """Test cases for the opt-in per-request cProfile hook"""
+    
+    def setUp(self):
+        get_cache().clear()
+        a = Task.objects.create(title="A", due_date=date.today() + timedelta(days=3))
+        Task.objects.create(title="B").dependencies.add(a)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+    
+    def test_token_triggers_profile_dump(self):
+        """A matching token writes tagged .prof, .collapsed and .json files"""
+        with self.settings(TASK_PROFILING_DIR=self.directory, TASK_PROFILING_TOKEN='secret'):
+            response = self.client.post('/api/tasks/analyze/', {'strategy': 'high_impact'},
+                                        content_type='application/json', HTTP_X_PROFILE_TOKEN='secret')
+        
+        stem = response['X-Profile-Id']
+        self.assertTrue(stem.endswith('-analyze-high_impact-2tasks'))
+        self.assertEqual(sorted(os.listdir(self.directory)), [stem + ext for ext in ('.collapsed', '.json', '.prof')])
+        
+        with open(os.path.join(self.directory, stem + '.collapsed')) as f:
+            collapsed = f.read()
+        self.assertIn(':analyze;', collapsed)
+        self.assertIn(':calculate_business_days', collapsed)
+    
+    def test_wrong_or_missing_token_is_ignored(self):
+        """Without the exact token nothing is profiled"""
+        with self.settings(TASK_PROFILING_DIR=self.directory, TASK_PROFILING_TOKEN='secret'):
+            response = self.client.get('/api/tasks/check_cycles/?profile=guess')
+        
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(os.listdir(self.directory), [])
+    
+    def test_async_views_pass_through(self):
+        """A token on an async endpoint leaves the view to run normally"""
+        with self.settings(TASK_PROFILING_DIR=self.directory, TASK_PROFILING_TOKEN='secret'):
+            response = self.client.post('/api/tasks/async/analyze/?profile=secret', {'strategy': 'high_impact'},
+                                        content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(os.listdir(self.directory), [])
+    
+    def test_collapsed_stacks_keep_call_paths(self):
+        """Callee frames are nested under their callers"""
+        def leaf():
+            return sum(range(20000))
+        
+        def outer():
+            return [leaf() for _ in range(20)]
+        
+        profiler = cProfile.Profile()
+        profiler.runcall(outer)
+        lines = collapsed_stacks(pstats.Stats(profiler))
+        
+        self.assertTrue(any(':outer;' in line and ':leaf' in line for line in lines))
+
+
+class MemoryInstrumentationTestCase(TestCase):
+    """Test cases for tracemalloc stage tracking and memory budgets"""
+    
+    def setUp(self):
+        get_cache().clear()
+        for i in range(30):
+            Task.objects.create(title=f"Memory {i}", importance=5, estimated_hours=2)
+    
+    def test_stage_peak_and_retained(self):
+        """Each stage reports its own peak; nested peaks reach the enclosing stage"""
+        with profile_request(memory=True) as profile:
+            with stage('outer'):
+                with stage('inner'):
+                    transient = bytearray(2 * 1024 * 1024)
+                    del transient
+                kept = bytearray(512 * 1024)
+            summary = profile.memory_summary()
+        
+        self.assertGreaterEqual(summary['stages']['inner']['peak_kb'], 2048)
+        self.assertLess(summary['stages']['inner']['retained_kb'], 64)
+        self.assertGreaterEqual(summary['stages']['outer']['peak_kb'], 2048)
+        self.assertGreaterEqual(summary['stages']['outer']['retained_kb'], 512)
+        del kept
+    
+    @override_settings(TASK_MEMORY_BUDGET_MB=0.01)
+    def test_budget_returns_clean_error(self):
+        """Exceeding the budget aborts the request with a 503 instead of a crash"""
+        with self.assertLogs('tasks.instrumentation', level='ERROR'):
+            response = self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'}, content_type='application/json')
+        
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()['budget_mb'], 0.01)
+    
+    @override_settings(TASK_MEMORY_TRACKING=True)
+    def test_memory_logged_per_request(self):
+        """Tracked requests log per-stage memory for load, graph, score and serialize"""
+        with self.assertLogs('tasks.instrumentation', level='INFO') as logs:
+            response = self.client.post('/api/tasks/analyze/', {'strategy': 'smart_balance'}, content_type='application/json')
+        
+        self.assertEqual(response.status_code, 200)
+        for name in ('load', 'graph', 'score', 'serialize'):
+            self.assertIn(f"'{name}'", logs.output[0])
+
+
+class SQLiteProfileTestCase(TestCase):
+    """Test cases for the SQLite connection pragmas and hot-path indexes"""
+    
+    def test_connection_pragmas(self):
+        """New connections run with synchronous=NORMAL and the configured caches"""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], DEFAULT_SQLITE_PRAGMAS['cache_size'])
+    
+    def test_hot_path_indexes(self):
+        """Ordering, due date and reverse dependency lookups are indexed"""
+        with connection.cursor() as cursor:
+            task_indexes = connection.introspection.get_constraints(cursor, Task._meta.db_table)
+            through_indexes = connection.introspection.get_constraints(cursor, Task.dependencies.through._meta.db_table)
+        
+        self.assertIn('task_created_at_desc_idx', task_indexes)
+        self.assertEqual(task_indexes['task_due_importance_idx']['columns'], ['due_date', 'importance'])
+        self.assertEqual(through_indexes['task_deps_reverse_idx']['columns'], ['to_task_id', 'from_task_id'])
+        
+        task = Task.objects.create(title="Hub")
+        plan = Task.objects.filter(dependencies=task).values('id').explain()
+        self.assertIn('task_deps_reverse_idx', plan)
+
+
+class AsyncEndpointsTestCase(TestCase):
+    """Test cases for the async analyze, suggest and check_cycles endpoints"""
+    
+    def setUp(self):
+        get_cache().clear()
+        self.first = Task.objects.create(title="First", due_date=date.today(), estimated_hours=2, importance=7)
+        self.second = Task.objects.create(title="Second", due_date=date.today() + timedelta(days=3), estimated_hours=4, importance=5)
+        self.second.dependencies.add(self.first)
+    
+    def tearDown(self):
+        reset_executor()
+    
+    async def test_analyze_matches_sync_endpoint(self):
+        """The async analyze returns the same ranking and payload as the DRF view"""
+        body = {'strategy': 'deadline_driven'}
+        response = await self.async_client.post('/api/tasks/async/analyze/', body, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        
+        await get_cache().aclear()
+        expected = await self.async_client.post('/api/tasks/analyze/', body, content_type='application/json')
+        self.assertEqual(response.json(), json.loads(expected.content))
+        
+        cached = await self.async_client.post(
+            '/api/tasks/async/analyze/', body, content_type='application/json', headers={'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(cached.status_code, 304)
+    
+    async def test_suggest_and_check_cycles(self):
+        """suggest ranks through the stored scores and check_cycles finds planted cycles"""
+        response = await self.async_client.post('/api/tasks/async/suggest/', {'count': 1}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['suggested_tasks']), 1)
+        
+        await self.first.dependencies.aadd(self.second)
+        response = await self.async_client.get('/api/tasks/async/check_cycles/')
+        self.assertTrue(response.json()['has_cycles'])
+        self.assertEqual(sorted(response.json()['affected_tasks']), sorted([self.first.id, self.second.id]))
+    
+    def test_invalid_strategy_rejected(self):
+        response = self.client.post('/api/tasks/async/analyze/', {'strategy': 'bogus'}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class BoundedExecutorTestCase(SimpleTestCase):
+    """Test cases for the bounded CPU executor behind the async endpoints"""
+    
+    def test_rejects_jobs_beyond_queue_depth(self):
+        """With every worker busy and the queue full, further jobs fail fast"""
+        executor = BoundedExecutor('thread', workers=1, queue_depth=1)
+        release = threading.Event()
+        
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(sum, [1, 2]))
+            await asyncio.sleep(0)
+            with self.assertRaises(ExecutorSaturated):
+                await executor.run(sum, [3])
+            release.set()
+            return await running, await queued, await executor.run(sum, [4])
+        
+        try:
+            self.assertEqual(async_to_sync(scenario)(), (True, 3, 4))
+        finally:
+            release.set()
+            executor.shutdown()
+
+
+class ParallelScoringTestCase(SimpleTestCase):
+    """Test cases for process-pool batch scoring over shared memory"""
+    
+    @classmethod
+    def tearDownClass(cls):
+        shutdown_pools()
+        super().tearDownClass()
+    
+    def setUp(self):
+        self.today = date(2025, 11, 28)
+        hours = [0, 0.5, 1, 2, 3, 8]
+        self.tasks = [
+            Task(
+                id=i + 1, title=f"Task {i}", importance=i % 10 + 1, estimated_hours=hours[i % len(hours)],
+                due_date=None if i % 9 == 0 else self.today + timedelta(days=i % 12 - 2)
+            )
+            for i in range(120)
+        ]
+        self.graph = DependencyGraph()
+        self.graph.load_edges([(i, i // 3) for i in range(2, 121)])
+    
+    def test_parallel_matches_in_process(self):
+        """Sharded scoring reproduces the in-process components and scores exactly"""
+        serial = BatchScorer(self.tasks, self.graph, self.today, workers=1)
+        parallel = BatchScorer(self.tasks, self.graph, self.today, workers=3, parallel_threshold=10)
+        
+        self.assertEqual(serial.workers, 0)
+        self.assertEqual(parallel.workers, 3)
+        np.testing.assert_array_equal(parallel.components, serial.components)
+        np.testing.assert_array_equal(parallel.scores, serial.scores)
+    
+    def test_merged_shard_top_k_matches_ranking(self):
+        """Per-shard winners merge into the same order as a full ranking, ties included"""
+        batch = BatchScorer(self.tasks, self.graph, self.today)
+        inputs = score_inputs(self.tasks, self.graph, self.today)
+        for strategy in STRATEGIES:
+            for k in (1, 7, 40, 500):
+                expected = batch.ranking(strategy)[:k]
+                np.testing.assert_array_equal(parallel_top_k(inputs, k, strategy, workers=4), expected)
+    
+    def test_session_top_k_uses_merged_shards(self):
+        """A parallel session asked for its top k answers from the merged shard winners"""
+        calculator = PriorityCalculator()
+        serial = calculator.create_session(self.tasks, self.graph, workers=1)
+        session = calculator.create_session(self.tasks, self.graph, workers=3, parallel_threshold=10,
+                                            k=8, strategy='deadline_driven')
+        
+        self.assertIn('deadline_driven', session.batch.merged_top)
+        with patch.object(np, 'partition', side_effect=AssertionError('full-vector partition')):
+            top = session.top_k(5, 'deadline_driven')
+        self.assertEqual(top, serial.top_k(5, 'deadline_driven'))
+        self.assertEqual(session.top_k(20, 'deadline_driven'), serial.top_k(20, 'deadline_driven'))
+    
+    def test_selection_by_threshold_and_workers(self):
+        self.assertEqual(use_parallel(50000, workers=4, threshold=100000), 0)
+        self.assertEqual(use_parallel(200000, workers=4, threshold=100000), 4)
+        self.assertEqual(use_parallel(200000, workers=1, threshold=0), 0)
+        with override_settings(TASK_SCORING_WORKERS=2, TASK_PARALLEL_SCORING_THRESHOLD=100):
+            self.assertEqual(use_parallel(100), 2)
+    
+    def test_speedup_benchmark_report(self):
+        rows = parallel_speedup(sizes=[2000], worker_counts=[2], repeat=1)
+        self.assertEqual([row['workers'] for row in rows], [1, 2])
+        self.assertEqual(rows[0]['speedup'], 1.0)
@@ -1,11 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import views, async_views
 
 router = DefaultRouter()
 router.register(r'', views.TaskViewSet, basename='task')
 
 urlpatterns = [
-    path('', include(router.urls)),
+    # Before the router, whose detail route would otherwise capture 'health' as a pk
     path('health/', views.health_check, name='health_check'),
+    # Async variants for ASGI servers; CPU work runs on tasks.offload's bounded executor
+    path('async/analyze/', async_views.analyze, name='async-analyze'),
+    path('async/suggest/', async_views.suggest, name='async-suggest'),
+    path('async/check_cycles/', async_views.check_cycles, name='async-check-cycles'),
+    path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,35 +1,38 @@
 from datetime import datetime, timedelta, date
 from .holidays import is_indian_holiday, get_urgency_label, calculate_business_days
-from .dependencies import DependencyGraph
+from .dependencies import DependencyGraph, get_reachability_index
+from .models import Task
 
 def check_circular_dependencies(tasks):
     """
     Check if there are any circular dependencies among tasks
     Returns: dict with cycle detection results
     """
-    graph = DependencyGraph(tasks)
-    cycles = graph.get_all_cycles()
+    graph = DependencyGraph.from_database(task_ids=[t.id for t in tasks])
+    cycles = graph.find_cycles()
     
     return {
         'has_cycles': len(cycles) > 0,
         'cycle_count': len(cycles),
         'cycles': cycles,
-        'affected_task_ids': graph.has_cycle()
+        'affected_task_ids': sorted(graph.get_cycle_nodes())
     }
 
 
-def get_task_dependency_info(task, all_tasks):
+def get_task_dependency_info(task, all_tasks=None):
     """
     Get detailed dependency information for a task
     Returns: dict with blocking and blocked task info
     """
-    graph = DependencyGraph(all_tasks)
+    index = get_reachability_index()
     
-    blocking_ids = graph.get_blocking_tasks(task.id)
-    blocked_ids = graph.get_blocked_tasks(task.id)
+    blocking_ids = index.downstream(task.id)
+    blocked_ids = index.upstream(task.id)
     
-    blocking_tasks = [t for t in all_tasks if t.id in blocking_ids]
-    blocked_tasks = [t for t in all_tasks if t.id in blocked_ids]
+    titles = {}
+    reachable_ids = list(set(blocking_ids) | set(blocked_ids))
+    for start in range(0, len(reachable_ids), 500):
+        titles.update(Task.objects.filter(id__in=reachable_ids[start:start + 500]).values_list('id', 'title'))
     
     return {
         'task_id': task.id,
@@ -37,8 +40,8 @@ def get_task_dependency_info(task, all_tasks):
         'direct_dependencies': list(task.dependencies.values_list('id', flat=True)),
         'blocking_count': len(blocking_ids),
         'blocked_count': len(blocked_ids),
-        'all_blocking_tasks': [{'id': t.id, 'title': t.title} for t in blocking_tasks],
-        'all_blocked_tasks': [{'id': t.id, 'title': t.title} for t in blocked_tasks]
+        'all_blocking_tasks': [{'id': task_id, 'title': titles[task_id]} for task_id in blocking_ids if task_id in titles],
+        'all_blocked_tasks': [{'id': task_id, 'title': titles[task_id]} for task_id in blocked_ids if task_id in titles]
     }
 
 
@@ -47,8 +50,8 @@ def flag_circular_dependencies(tasks):
     Flag tasks that are part of circular dependencies
     Returns: dict mapping task_id to bool (True if in cycle)
     """
-    graph = DependencyGraph(tasks)
-    cycle_nodes = graph.has_cycle()
+    graph = DependencyGraph.from_database(task_ids=[t.id for t in tasks])
+    cycle_nodes = graph.get_cycle_nodes()
     
     flagged = {}
     for task in tasks:
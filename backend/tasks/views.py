@@ -1,16 +1,39 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse, HttpResponse
+from django.core.cache import cache
+from rest_framework.settings import api_settings
 from .models import Task
 from .serializers import TaskSerializer
-from .scoring import PriorityCalculator
-from .dependencies import DependencyGraph
+from .scoring import PriorityCalculator, STRATEGIES
+from .dependencies import DependencyGraph, graph_version, extract_subgraph, SUBGRAPH_DIRECTIONS
+from .result_cache import get_or_compute, result_key
+from .etags import dataset_etag, etag_matches, not_modified
+from .instrumentation import stage
+from .metrics import metrics as metrics_store, render_prometheus
 from .utils import check_circular_dependencies, flag_circular_dependencies, get_task_dependency_info
 from .holidays import is_indian_holiday, calculate_business_days
+from .stored_scores import ensure_scores_current, score_field
+from .importer import TaskImporter, iter_rows
+from .exporter import DEFAULT_CHUNK_SIZE, iter_task_chunks, iter_ndjson, iter_csv, gzip_stream
+from .renderers import NDJSONRenderer, CSVRenderer
+from .critical_path import CriticalPath
+from .scheduler import ScheduleSimulator, DEFAULT_HORIZON_DAYS, check_schedule_bounds
+from .layout import compute_graph_layout
+from datetime import datetime
 import traceback
 import json
 
 
+# Layouts are keyed by graph version, so this only bounds how long stale versions linger
+LAYOUT_CACHE_SECONDS = 60 * 60
+
+SUBGRAPH_MAX_NODES = 5000
+
+
 @api_view(['GET'])
 def health_check(request):
     return Response({
@@ -19,6 +42,18 @@ def health_check(request):
     }, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+def metrics(request):
+    # Prometheus scrapes plain text, so bypass DRF rendering
+    totals = metrics_store.aggregate()
+    body = render_prometheus(
+        totals,
+        task_count=Task.objects.count(),
+        edge_count=Task.dependencies.through.objects.count()
+    )
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def generate_explanation(task, score, calculator):
     urgency = calculator.calculate_urgency_score(task)
     importance = calculator.calculate_importance_score(task)
@@ -44,10 +79,153 @@ def generate_explanation(task, score, calculator):
     return " • ".join(explanations) if explanations else "Task ready to start"
 
 
+def build_analysis(tasks, graph, strategy):
+    """
+    CPU half of analyze: score, rank and serialize already loaded tasks
+    Shared by the sync view and the async view's executor
+    """
+    calculator = PriorityCalculator()
+    session = calculator.create_session(tasks, graph)
+    scored_tasks = session.sort_by_strategy(strategy)
+
+    with stage('serialize'):
+        response_tasks = []
+        for task, score in scored_tasks:
+            score_breakdown = session.get_task_score_breakdown(task)
+            urgency_info = calculator.get_urgency_info(task)
+        
+            # Counts come from the already built graph, not per-row queries
+            blocked_count = len(session.graph.graph.get(task.id, ()))
+            blocking_count = len(session.graph.reverse_graph.get(task.id, ()))
+            task.num_dependencies = blocked_count
+            task.num_dependents = blocking_count
+            
+            task_data = TaskSerializer(task).data
+            task_data.update({
+                'priority_score': score,
+                'score_breakdown': score_breakdown,
+                'blocked_count': blocked_count,
+                'blocking_count': blocking_count,
+                'is_critical': score >= 80,
+                'explanation': f'{urgency_info["label"]} • Importance: {task.importance}/10 • Effort: {task.estimated_hours}h'
+            })
+            
+            response_tasks.append(task_data)
+
+    return {
+        'strategy': strategy,
+        'count': len(response_tasks),
+        'tasks': response_tasks,
+        'circular_dependencies': {}
+    }
+
+
+def build_suggestions(winners, graph, strategy):
+    """CPU half of suggest: breakdowns and explanations for the stored-score winners"""
+    field = score_field(strategy)
+    calculator = PriorityCalculator()
+    session = calculator.create_session(winners, graph)
+    top_tasks = [(task, getattr(task, field)) for task in winners]
+    
+    with stage('serialize'):
+        tasks_data = []
+        for task, score in top_tasks:
+            breakdown = session.get_task_score_breakdown(task)
+            blocking_count = len(session.graph.reverse_graph.get(task.id, ()))
+            blocked_count = len(session.graph.graph.get(task.id, ()))
+            
+            tasks_data.append({
+                'id': task.id,
+                'title': task.title,
+                'due_date': str(task.due_date) if task.due_date else None,
+                'estimated_hours': float(task.estimated_hours),
+                'importance': task.importance,
+                'priority_score': float(score),
+                'explanation': generate_explanation(task, score, calculator),
+                'blocking_count': blocking_count,
+                'blocked_count': blocked_count,
+                'is_critical': blocked_count > 0,
+                'business_days_until_due': calculator.get_business_days_until(task.due_date),
+                'score_breakdown': {
+                    'urgency_score': float(breakdown['urgency_score']),
+                    'importance_score': float(breakdown['importance_score']),
+                    'efficiency_score': float(breakdown['efficiency_score']),
+                    'dependency_score': float(breakdown['dependency_score'])
+                }
+            })
+    
+    return {
+        'success': True,
+        'strategy': strategy,
+        'suggested_tasks': tasks_data
+    }
+
+
+def build_cycle_report(titles, graph):
+    """Cycles in graph with task titles; shared by the sync and async check_cycles"""
+    with stage('cycles'):
+        cycles = graph.find_cycles()
+    
+    affected_task_ids = []
+    cycle_data = []
+    
+    for cycle in cycles:
+        cycle_data.append({
+            'task_ids': cycle,
+            'tasks': [titles[task_id] for task_id in cycle]
+        })
+        affected_task_ids.extend(cycle)
+    
+    return {
+        'has_cycles': len(cycles) > 0,
+        'cycle_count': len(cycle_data),
+        'cycles': cycle_data,
+        'affected_tasks': affected_task_ids
+    }
+
+
+def edge_count(column):
+    """Subquery counting dependency rows whose column points at the outer task"""
+    through = Task.dependencies.through
+    rows = (
+        through.objects.filter(**{column: OuterRef('pk')})
+        .order_by().values(column).annotate(count=Count('pk')).values('count')
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
 class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     
+    def get_queryset(self):
+        # Annotate both dependency counts so the serializer needs no per-row COUNT.
+        # Correlated subqueries rather than two joined COUNTs, which would
+        # multiply fan-in by fan-out rows for every hub task.
+        return super().get_queryset().annotate(
+            num_dependents=edge_count('to_task'),
+            num_dependencies=edge_count('from_task')
+        ).order_by(*Task._meta.ordering)
+    
+    def list(self, request, *args, **kwargs):
+        # Query string covers pagination, search and ordering
+        etag = dataset_etag('list', request.get_full_path())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+    
+    def retrieve(self, request, *args, **kwargs):
+        etag = dataset_etag('retrieve', kwargs.get('pk'))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+    
     def create(self, request, *args, **kwargs):
         try:
             data = request.data.copy()
@@ -85,6 +263,8 @@ class TaskViewSet(viewsets.ModelViewSet):
             
             if dependencies is not None:
                 instance.dependencies.set(dependencies)
+                # The annotated counts predate set(), so re-read them
+                return Response(self.get_serializer(self.get_queryset().get(pk=instance.pk)).data)
             
             return Response(serializer.data)
         except Exception as e:
@@ -106,58 +286,46 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    def _analyze_payload(self, strategy):
+        """Score every task for strategy; cached per dataset version by analyze"""
+        with stage('load'):
+            tasks = list(Task.objects.all())
+        if not tasks:
+            return {
+                'strategy': strategy,
+                'count': 0,
+                'tasks': [],
+                'message': 'No tasks to analyze'
+            }
+    
+        with stage('graph'):
+            graph = DependencyGraph.from_database()
+        return build_analysis(tasks, graph, strategy)
+    
     @action(detail=False, methods=['post'])
     def analyze(self, request):
         try:
             strategy = request.data.get('strategy', 'smart_balance')
-            valid_strategies = ['smart_balance', 'fastest_wins', 'high_impact', 'deadline_driven']
+            valid_strategies = STRATEGIES
             if strategy not in valid_strategies:
                 return Response(
                     {'message': f'Invalid strategy. Choose from: {", ".join(valid_strategies)}'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            tasks = list(Task.objects.all())
-            if not tasks:
-                return Response({
-                    'strategy': strategy,
-                    'count': 0,
-                    'tasks': [],
-                    'message': 'No tasks to analyze'
-                })
-        
-            calculator = PriorityCalculator()
-            scored_tasks = calculator.sort_by_strategy(tasks, strategy)
-        
-            response_tasks = []
-            for task, score in scored_tasks:
-                score_breakdown = calculator.get_task_score_breakdown(task, tasks)
-                urgency_info = calculator.get_urgency_info(task)
-            
-                try:
-                    blocked_count = task.dependencies.count()
-                except:
-                    blocked_count = 0
-                blocking_count = Task.objects.filter(dependencies=task).count()
-                
-                task_data = TaskSerializer(task).data
-                task_data.update({
-                    'priority_score': score,
-                    'score_breakdown': score_breakdown,
-                    'blocked_count': blocked_count,
-                    'blocking_count': blocking_count,
-                    'is_critical': score >= 80,
-                    'explanation': f'{urgency_info["label"]} • Importance: {task.importance}/10 • Effort: {task.estimated_hours}h'
-                })
-                
-                response_tasks.append(task_data)
-            
-            return Response({
-                'strategy': strategy,
-                'count': len(response_tasks),
-                'tasks': response_tasks,
-                'circular_dependencies': {}
-            })
+            # analyze only reads, so a matching tag short-circuits like a GET
+            fingerprint = graph_version()
+            etag = dataset_etag('analyze', strategy, fingerprint=fingerprint)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            
+            result, hit = get_or_compute(
+                result_key('analyze', strategy, fingerprint=fingerprint), lambda: self._analyze_payload(strategy)
+            )
+            response = Response(result)
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            response['ETag'] = etag
+            return response
             
         except Exception as e:
             print(f"Error in analyze endpoint: {str(e)}")
@@ -169,55 +337,90 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=False, methods=['post'])
-    def suggest(self, request):
+    def schedule(self, request):
         try:
-            count = request.data.get('count', 3)
             strategy = request.data.get('strategy', 'smart_balance')
+            if strategy not in STRATEGIES:
+                return Response(
+                    {'message': f'Invalid strategy. Choose from: {", ".join(STRATEGIES)}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             
-            all_tasks = list(Task.objects.all())
+            start_date = request.data.get('start_date')
+            if start_date:
+                start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            # Reject out-of-range sizes before any loading
+            workers, horizon_days = check_schedule_bounds(
+                request.data.get('workers', 1),
+                request.data.get('horizon_days', DEFAULT_HORIZON_DAYS)
+            )
             
-            if not all_tasks:
-                return Response({
-                    'success': True,
-                    'suggested_tasks': [],
-                    'message': 'No tasks available'
-                }, status=status.HTTP_200_OK)
-            
-            calculator = PriorityCalculator()
-            graph = DependencyGraph()
-            dependency_info = graph.get_dependency_info(all_tasks)
-            sorted_tasks = calculator.sort_by_strategy(all_tasks, strategy)
-            top_tasks = sorted_tasks[:count]
-            
-            tasks_data = []
-            for task, score in top_tasks:
-                breakdown = calculator.get_task_score_breakdown(task, tasks=all_tasks)
-                
-                tasks_data.append({
-                    'id': task.id,
-                    'title': task.title,
-                    'due_date': str(task.due_date) if task.due_date else None,
-                    'estimated_hours': float(task.estimated_hours),
-                    'importance': task.importance,
-                    'priority_score': float(score),
-                    'explanation': generate_explanation(task, score, calculator),
-                    'blocking_count': dependency_info[task.id]['blocking_count'],
-                    'blocked_count': dependency_info[task.id]['blocked_count'],
-                    'is_critical': dependency_info[task.id]['blocked_count'] > 0,
-                    'business_days_until_due': calculator.get_business_days_until(task.due_date),
-                    'score_breakdown': {
-                        'urgency_score': float(breakdown['urgency_score']),
-                        'importance_score': float(breakdown['importance_score']),
-                        'efficiency_score': float(breakdown['efficiency_score']),
-                        'dependency_score': float(breakdown['dependency_score'])
-                    }
-                })
+            ensure_scores_current()
+            tasks = Task.objects.values_list('id', 'title', 'estimated_hours', 'due_date', score_field(strategy))
+            simulator = ScheduleSimulator(
+                tasks.iterator(chunk_size=2000),
+                DependencyGraph.from_database(),
+                workers=workers,
+                hours_per_day=request.data.get('hours_per_day'),
+                start_date=start_date,
+                horizon_days=horizon_days
+            )
             
-            return Response({
-                'success': True,
+            plan = simulator.task_plan()
+            response = simulator.summary()
+            response.update({
                 'strategy': strategy,
-                'suggested_tasks': tasks_data
-            }, status=status.HTTP_200_OK)
+                'tasks': plan,
+                'slipped_tasks': [row for row in plan if row['slips']],
+            })
+            if request.data.get('include_daily_plan', False):
+                response['daily_plan'] = simulator.daily_plan()
+            
+            return Response(response)
+        
+        except (TypeError, ValueError) as e:
+            return Response(
+                {'message': f'Invalid parameter: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {'message': f'Scheduling failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    def _suggest_payload(self, strategy, count):
+        """Top count tasks for strategy; cached per dataset version by suggest"""
+        # Persisted scores turn the ranking into one indexed ORDER BY ... LIMIT
+        with stage('load'):
+            ensure_scores_current()
+            field = score_field(strategy)
+            winners = list(Task.objects.order_by(f'-{field}', '-created_at')[:max(count, 0)])
+        
+        if not winners:
+            return {
+                'success': True,
+                'suggested_tasks': [],
+                'message': 'No tasks available'
+            }
+        
+        with stage('graph'):
+            graph = DependencyGraph.from_neighbourhood([task.id for task in winners])
+        return build_suggestions(winners, graph, strategy)
+    
+    @action(detail=False, methods=['post'])
+    def suggest(self, request):
+        try:
+            count = int(request.data.get('count', 3))
+            strategy = request.data.get('strategy', 'smart_balance')
+            
+            result, hit = get_or_compute(
+                result_key('suggest', strategy, count), lambda: self._suggest_payload(strategy, count)
+            )
+            response = Response(result, status=status.HTTP_200_OK)
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
         
         except Exception as e:
             traceback.print_exc()
@@ -229,9 +432,10 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def check_cycles(self, request):
         try:
-            tasks = list(Task.objects.all())
+            with stage('load'):
+                titles = dict(Task.objects.values_list('id', 'title'))
             
-            if not tasks:
+            if not titles:
                 return Response({
                     'has_cycles': False,
                     'cycle_count': 0,
@@ -239,43 +443,146 @@ class TaskViewSet(viewsets.ModelViewSet):
                     'affected_tasks': []
                 })
         
-            calculator = PriorityCalculator()
-            cycles = calculator.detect_circular_dependencies(tasks)
+            with stage('graph'):
+                graph = DependencyGraph.from_database()
+            return Response(build_cycle_report(titles, graph))
+            
+        except Exception as e:
+            print(f"Error in check_cycles endpoint: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return Response(
+                {'message': f'Cycle check failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'])
+    def critical_path(self, request):
+        try:
+            tasks = Task.objects.values_list('id', 'title', 'estimated_hours', 'due_date')
+            # Raw edge pairs: CriticalPath builds its own flat adjacency, no DependencyGraph needed
+            edges = Task.dependencies.through.objects.values_list('from_task_id', 'to_task_id')
+            path = CriticalPath(
+                tasks.iterator(chunk_size=2000),
+                edges,
+                hours_per_day=request.query_params.get('hours_per_day')
+            )
+            
+            include_all = request.query_params.get('include_all', 'false').lower() == 'true'
+            at_risk = path.at_risk_ids()
+            # Only the rows the response shows get full details
+            details = path.task_details(None if include_all else list(dict.fromkeys(path.path + at_risk)))
+            by_id = {row['id']: row for row in details}
+            
+            response = path.summary()
+            response.update({
+                'critical_path': [by_id[task_id] for task_id in path.path],
+                'at_risk_tasks': [by_id[task_id] for task_id in at_risk],
+            })
+            if include_all:
+                response['tasks'] = details
+            
+            return Response(response)
+        
+        except ValueError as e:
+            return Response(
+                {'message': f'Invalid parameter: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {'message': f'Critical path failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'])
+    def graph_layout(self, request):
+        try:
+            version = graph_version()
+            cache_key = f'graph_layout:{version}'
+            layout = cache.get(cache_key)
+            
+            if layout is None:
+                layout = compute_graph_layout(
+                    DependencyGraph.from_database(),
+                    Task.objects.values_list('id', 'title').iterator(chunk_size=2000)
+                )
+                cache.set(cache_key, layout, LAYOUT_CACHE_SECONDS)
+            
+            return Response(dict(layout, version=version))
+        
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {'message': f'Graph layout failed: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['get'])
+    def subgraph(self, request):
+        try:
+            seed_ids = [int(task_id) for task_id in request.query_params.get('ids', '').split(',') if task_id.strip()]
+            hops = int(request.query_params.get('hops', 1))
+            direction = request.query_params.get('direction', 'both').lower()
+            max_nodes = int(request.query_params.get('max_nodes', SUBGRAPH_MAX_NODES))
+            
+            if not seed_ids:
+                return Response(
+                    {'message': 'ids must list at least one task id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if direction not in SUBGRAPH_DIRECTIONS:
+                return Response(
+                    {'message': f'Invalid direction. Choose from: {", ".join(SUBGRAPH_DIRECTIONS)}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            seed_ids = list(Task.objects.filter(id__in=seed_ids).values_list('id', flat=True))
+            graph, distance, truncated = extract_subgraph(seed_ids, max(0, hops), direction, max_nodes)
             
-            affected_task_ids = []
-            cycle_data = []
+            node_ids = list(distance)
+            tasks = {}
+            for start in range(0, len(node_ids), 500):
+                for row in Task.objects.filter(id__in=node_ids[start:start + 500]).values(
+                    'id', 'title', 'due_date', 'estimated_hours', 'importance'
+                ):
+                    tasks[row['id']] = row
             
-            if cycles:
-                for cycle in cycles:
-                    cycle_data.append({'tasks': cycle.split(' → ')})
-                    for task_id in Task.objects.filter(
-                        title__in=cycle.split(' → ')
-                    ).values_list('id', flat=True):
-                        if task_id not in affected_task_ids:
-                            affected_task_ids.append(task_id)
+            nodes = []
+            for task_id in node_ids:
+                row = tasks[task_id]
+                row['hops'] = distance[task_id]
+                nodes.append(row)
             
             return Response({
-                'has_cycles': len(cycles) > 0 if cycles else False,
-                'cycle_count': len(cycle_data),
-                'cycles': cycle_data,
-                'affected_tasks': affected_task_ids
+                'seed_ids': seed_ids,
+                'hops': hops,
+                'direction': direction,
+                'truncated': truncated,
+                'node_count': len(nodes),
+                'nodes': nodes,
+                'edges': [[dep_id, task_id] for task_id, deps in graph.graph.items() for dep_id in deps],
+                'cycles': graph.find_cycles(),
             })
-            
+        
+        except ValueError as e:
+            return Response(
+                {'message': f'Invalid parameter: {str(e)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
-            print(f"Error in check_cycles endpoint: {str(e)}")
-            import traceback
             traceback.print_exc()
             return Response(
-                {'message': f'Cycle check failed: {str(e)}'},
+                {'message': f'Subgraph extraction failed: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
     @action(detail=True, methods=['get'])
     def dependency_info(self, request, pk=None):
         task = self.get_object()
-        all_tasks = self.get_queryset()
         
-        dep_info = get_task_dependency_info(task, all_tasks)
+        dep_info = get_task_dependency_info(task)
         
         return Response(dep_info)
 
@@ -296,71 +603,18 @@ class TaskViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            if len(tasks_data) > 100:
-                return Response(
-                    {'success': False, 'message': 'Maximum 100 tasks per import'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            created_tasks = []
-            failed_tasks = []
-            
-            for index, task_data in enumerate(tasks_data):
-                try:
-                    if 'title' not in task_data or not task_data['title'].strip():
-                        failed_tasks.append({
-                            'index': index,
-                            'title': task_data.get('title', 'Untitled'),
-                            'error': 'Title is required'
-                        })
-                        continue
-                    
-                    dependencies = task_data.pop('dependencies', [])
-                    task_data.pop('description', None)
-                    
-                    cleaned_data = {
-                        'title': task_data.get('title', '').strip(),
-                        'due_date': task_data.get('due_date') or None,
-                        'estimated_hours': float(task_data.get('estimated_hours', 0)) if task_data.get('estimated_hours') else 0,
-                        'importance': int(task_data.get('importance', 5)) if task_data.get('importance') else 5,
-                    }
-                    
-                    if not (1 <= cleaned_data['importance'] <= 10):
-                        cleaned_data['importance'] = max(1, min(10, cleaned_data['importance']))
-                    
-                    task = Task.objects.create(**cleaned_data)
-                    
-                    if dependencies:
-                        valid_deps = Task.objects.filter(id__in=dependencies).values_list('id', flat=True)
-                        if valid_deps:
-                            task.dependencies.set(valid_deps)
-                    
-                    created_tasks.append({
-                        'id': task.id,
-                        'title': task.title,
-                        'created': True
-                    })
-                
-                except ValueError as e:
-                    failed_tasks.append({
-                        'index': index,
-                        'title': task_data.get('title', 'Untitled'),
-                        'error': f'Invalid data type: {str(e)}'
-                    })
-                except Exception as e:
-                    failed_tasks.append({
-                        'index': index,
-                        'title': task_data.get('title', 'Untitled'),
-                        'error': str(e)
-                    })
+            importer = TaskImporter(collect_created=True)
+            with stage('import'):
+                result = importer.run(enumerate(tasks_data))
         
             return Response({
                 'success': True,
-                'created_count': len(created_tasks),
-                'failed_count': len(failed_tasks),
-                'created_tasks': created_tasks,
-                'failed_tasks': failed_tasks if failed_tasks else None,
-                'message': f'Successfully imported {len(created_tasks)} of {len(tasks_data)} tasks'
+                'created_count': result['created_count'],
+                'failed_count': result['failed_count'],
+                'created_tasks': result['created_tasks'],
+                'failed_tasks': result['failed_tasks'],
+                'warnings': result['warnings'],
+                'message': f'Successfully imported {result["created_count"]} of {len(tasks_data)} tasks'
             }, status=status.HTTP_200_OK)
     
         except json.JSONDecodeError:
@@ -375,37 +629,89 @@ class TaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['post'])
+    def stream_import(self, request):
+        """Import NDJSON or CSV from the raw request body without a row cap"""
+        try:
+            # ?format= is reserved by DRF for renderer selection
+            format_type = request.query_params.get('import_format', 'ndjson').lower()
+            if format_type not in ['ndjson', 'csv']:
+                return Response(
+                    {'success': False, 'message': 'Format must be ndjson or csv'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            importer = TaskImporter(batch_size=request.query_params.get('batch_size'))
+            result = importer.run(iter_rows(request.stream or [], format_type))
+            
+            return Response({
+                'success': True,
+                'format': format_type,
+                'created_count': result['created_count'],
+                'failed_count': result['failed_count'],
+                'failed_tasks': result['failed_tasks'],
+                'warnings': result['warnings'],
+                'message': f'Successfully imported {result["created_count"]} of {result["total_rows"]} tasks'
+            }, status=status.HTTP_200_OK)
+        
+        except ValueError as e:
+            return Response(
+                {'success': False, 'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            traceback.print_exc()
+            return Response(
+                {'success': False, 'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+    @action(detail=False, methods=['get'],
+            renderer_classes=api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer, CSVRenderer])
     def export(self, request):
         try:
             format_type = request.query_params.get('format', 'json').lower()
             include_deps = request.query_params.get('include_dependencies', 'true').lower() == 'true'
             
-            tasks = self.get_queryset()
+            etag = dataset_etag('export', request.get_full_path())
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            
+            if format_type in ['ndjson', 'csv']:
+                chunk_size = int(request.query_params.get('chunk_size', DEFAULT_CHUNK_SIZE))
+                chunks = iter_task_chunks(Task.objects.all(), include_deps, chunk_size)
+                if format_type == 'ndjson':
+                    body = iter_ndjson(chunks)
+                    content_type = 'application/x-ndjson'
+                else:
+                    body = iter_csv(chunks, include_deps)
+                    content_type = 'text/csv'
+                
+                filename = f'tasks.{format_type}'
+                if request.query_params.get('gzip', 'false').lower() == 'true':
+                    body = gzip_stream(body)
+                    content_type = 'application/gzip'
+                    filename += '.gz'
+                
+                response = StreamingHttpResponse(body, content_type=content_type)
+                response['Content-Disposition'] = f'attachment; filename="{filename}"'
+                response['ETag'] = etag
+                return response
             
-            if format_type == 'json':
+            elif format_type == 'json':
                 tasks_data = []
-                for task in tasks:
-                    task_dict = {
-                        'title': task.title,
-                        'due_date': str(task.due_date) if task.due_date else None,
-                        'estimated_hours': float(task.estimated_hours) if task.estimated_hours else 0,
-                        'importance': int(task.importance)
-                    }
-                    
-                    if include_deps:
-                        task_dict['dependencies'] = list(
-                            task.dependencies.values_list('id', flat=True)
-                        )
-                    
-                    tasks_data.append(task_dict)
+                with stage('load'):
+                    for rows in iter_task_chunks(Task.objects.all(), include_deps):
+                        for row in rows:
+                            del row['id']
+                            tasks_data.append(row)
                 
                 return Response({
                     'success': True,
                     'format': 'json',
                     'count': len(tasks_data),
                     'tasks': tasks_data
-                }, status=status.HTTP_200_OK)
+                }, status=status.HTTP_200_OK, headers={'ETag': etag})
             
             else:
                 return Response(
@@ -1,12 +1,32 @@
 const API_URL = 'http://localhost:8000/api/tasks/';
 let allTasks = [];
 
+// Last ETag and payload per request, so unchanged data comes back as a bodyless 304
+const conditionalCache = {};
+
+async function fetchConditional(url, options = {}, cacheKey = url) {
+    const cached = conditionalCache[cacheKey];
+    const headers = { ...(options.headers || {}) };
+    if (cached) headers['If-None-Match'] = cached.etag;
+    
+    const response = await fetch(url, { ...options, headers });
+    if (response.status === 304 && cached) {
+        return { response, data: cached.data, notModified: true };
+    }
+    
+    const data = await response.json();
+    const etag = response.headers.get('ETag');
+    if (response.ok && etag) conditionalCache[cacheKey] = { etag, data };
+    return { response, data, notModified: false };
+}
+
 async function loadTasks() {
     try {
-        const response = await fetch(API_URL);
-        if (!response.ok) throw new Error('Failed to load tasks');
+        const { response, data, notModified } = await fetchConditional(API_URL);
+        if (!response.ok && !notModified) throw new Error('Failed to load tasks');
         
-        const data = await response.json();
+        // Nothing changed since the last load, keep the rendered list
+        if (notModified && allTasks.length) return;
         
         if (data.results) {
             allTasks = data.results;  
@@ -355,14 +375,13 @@ async function analyzeTasks(e) {
         }
         
         resultsDiv.innerHTML = '<div class="loading">⏳ Analyzing tasks...</div>';
-        const response = await fetch(`${API_URL}analyze/`, {
+        const { response, data, notModified } = await fetchConditional(`${API_URL}analyze/`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ strategy })
-        });
-        const data = await response.json();
+        }, `analyze:${strategy}`);
         
-        if (!response.ok) {
+        if (!response.ok && !notModified) {
             throw new Error(data.message || 'Analysis failed');
         }
         
@@ -509,100 +528,6 @@ function drawArrow(svg, from, to, color, width) {
     svg.appendChild(path);
 }
 
-function calculateForceDirectedLayout(tasks) {
-    if (tasks.length === 0) return {};
-    
-    const positions = {};
-    const velocity = {};
-    const width = 900;
-    const height = 450;
-    const padding = 50;
-    
-    tasks.forEach((task) => {
-        positions[task.id] = {
-            x: padding + 50 + Math.random() * (width - 2 * padding - 100),
-            y: padding + 50 + Math.random() * (height - 2 * padding - 100)
-        };
-        velocity[task.id] = { x: 0, y: 0 };
-    });
-    
-   
-    const iterations = 50;
-    const k = 100; 
-    const c = 0.5; 
-    const repelForce = 500;
-    
-    for (let iter = 0; iter < iterations; iter++) {
-        tasks.forEach((task) => {
-            velocity[task.id] = { x: 0, y: 0 };
-        });
-        
-        for (let i = 0; i < tasks.length; i++) {
-            for (let j = i + 1; j < tasks.length; j++) {
-                const task1 = tasks[i];
-                const task2 = tasks[j];
-                
-                const dx = positions[task2.id].x - positions[task1.id].x;
-                const dy = positions[task2.id].y - positions[task1.id].y;
-                let dist = Math.sqrt(dx * dx + dy * dy);
-                
-                if (dist < 1) dist = 1;
-                
-                const force = repelForce / (dist * dist);
-                const fx = (dx / dist) * force;
-                const fy = (dy / dist) * force;
-                
-                velocity[task1.id].x -= fx;
-                velocity[task1.id].y -= fy;
-                velocity[task2.id].x += fx;
-                velocity[task2.id].y += fy;
-            }
-        }
-        
-        tasks.forEach((task) => {
-            if (task.dependencies && task.dependencies.length > 0) {
-                task.dependencies.forEach(depId => {
-                    const source = tasks.find(t => t.id === depId);
-                    if (source && positions[depId]) {
-                        const dx = positions[depId].x - positions[task.id].x;
-                        const dy = positions[depId].y - positions[task.id].y;
-                        let dist = Math.sqrt(dx * dx + dy * dy);
-                    
-                        if (dist < 1) dist = 1;
-                        
-                        const force = (dist * dist) / k;
-                        const fx = (dx / dist) * force;
-                        const fy = (dy / dist) * force;
-                        
-                        velocity[task.id].x += fx;
-                        velocity[task.id].y += fy;
-                        velocity[depId].x -= fx;
-                        velocity[depId].y -= fy;
-                    }
-                });
-            }
-        });
-        
-        tasks.forEach((task) => {
-            velocity[task.id].x *= c;
-            velocity[task.id].y *= c;
-            
-            positions[task.id].x += velocity[task.id].x;
-            positions[task.id].y += velocity[task.id].y;
-            
-           
-            positions[task.id].x = Math.max(padding + 40, Math.min(width - padding - 40, positions[task.id].x));
-            positions[task.id].y = Math.max(padding + 40, Math.min(height - padding - 40, positions[task.id].y));
-            
-            
-            if (isNaN(positions[task.id].x)) positions[task.id].x = width / 2;
-            if (isNaN(positions[task.id].y)) positions[task.id].y = height / 2;
-        });
-    }
-    
-    return positions;
-}
-
 function visualizeDependencyGraph(tasks) {
     
     if (!tasks || tasks.length === 0) {
@@ -653,41 +578,41 @@ function visualizeDependencyGraph(tasks) {
     defs.appendChild(marker);
     svg.appendChild(defs);
     
-    const positions = calculateForceDirectedLayout(tasks);
-    
+    // Layout (Barnes-Hut, cached per graph version) is computed by the backend
+    loadGraphLayout().then(layout => drawGraphLayout(svg, layout)).catch(error => {
+        console.error('Error loading graph layout:', error);
+        svg.innerHTML += '<text x="500" y="250" text-anchor="middle" fill="#999">Unable to calculate positions</text>';
+    });
     
-    const validTasks = tasks.filter(task => positions[task.id] && !isNaN(positions[task.id].x) && !isNaN(positions[task.id].y));
+    return container;
+}
+
+async function loadGraphLayout() {
+    const response = await fetch(`${API_URL}graph_layout/`);
+    if (!response.ok) throw new Error('Failed to load graph layout');
+    return response.json();
+}
+
+function drawGraphLayout(svg, layout) {
+    svg.setAttribute('viewBox', `0 0 ${layout.width} ${layout.height}`);
     
-    if (validTasks.length === 0) {
-        svg.innerHTML = '<text x="500" y="250" text-anchor="middle" fill="#999">Unable to calculate positions</text>';
-        return container;
+    if (layout.ids.length === 0) {
+        svg.innerHTML += `<text x="${layout.width / 2}" y="${layout.height / 2}" text-anchor="middle" fill="#999">No tasks to visualize</text>`;
+        return;
     }
     
-    
-    validTasks.forEach((task) => {
-        if (task.dependencies && task.dependencies.length > 0) {
-            task.dependencies.forEach(depId => {
-                const source = validTasks.find(t => t.id === depId);
-                if (source && positions[task.id] && positions[depId]) {
-                    try {
-                        drawArrow(svg, positions[depId], positions[task.id], '#cbd5e1', 2);
-                    } catch (e) {
-                        console.warn('Error drawing arrow:', e);
-                    }
-                }
-            });
+    // edges are [dependency index, dependent index] pairs into the coordinate arrays
+    layout.edges.forEach(([from, to]) => {
+        try {
+            drawArrow(svg, { x: layout.x[from], y: layout.y[from] }, { x: layout.x[to], y: layout.y[to] }, '#cbd5e1', 2);
+        } catch (e) {
+            console.warn('Error drawing arrow:', e);
         }
     });
     
-
-    validTasks.forEach((task) => {
-        if (positions[task.id]) {
-            const isInCycle = detectCycleForTask(task, validTasks);
-            drawNode(svg, task, positions[task.id].x, positions[task.id].y, 40, isInCycle);
-        }
+    layout.ids.forEach((id, index) => {
+        drawNode(svg, { id, title: layout.titles[index] }, layout.x[index], layout.y[index], 40, layout.in_cycle[index]);
     });
-    
-    return container;
 }
 
 function drawNode(svg, task, x, y, radius, isInCycle) {
@@ -752,59 +677,6 @@ function drawNode(svg, task, x, y, radius, isInCycle) {
     svg.appendChild(group);
 }
 
-function calculateTaskDepth(tasks) {
-    const depths = {};
-    
-    function getDepth(taskId, visited = new Set()) {
-        if (visited.has(taskId)) return 0;
-        if (depths[taskId] !== undefined) return depths[taskId];
-        
-        visited.add(taskId);
-        const task = tasks.find(t => t.id === taskId);
-        
-        if (!task || !task.dependencies || task.dependencies.length === 0) {
-            depths[taskId] = 0;
-            return 0;
-        }
-        
-        const maxDepth = Math.max(
-            ...task.dependencies.map(depId => getDepth(depId, new Set(visited)))
-        );
-        depths[taskId] = maxDepth + 1;
-        return depths[taskId];
-    }
-    
-    tasks.forEach(task => getDepth(task.id));
-    return depths;
-}
-
-function detectCycleForTask(task, allTasks) {
-    const visited = new Set();
-    const recursionStack = new Set();
-    
-    function hasCycle(taskId) {
-        visited.add(taskId);
-        recursionStack.add(taskId);
-        
-        const currentTask = allTasks.find(t => t.id === taskId);
-        if (currentTask && currentTask.dependencies) {
-            for (const depId of currentTask.dependencies) {
-                if (!visited.has(depId)) {
-                    if (hasCycle(depId)) return true;
-                } else if (recursionStack.has(depId)) {
-                    return true;
-                }
-            }
-        }
-        
-        recursionStack.delete(taskId);
-        return false;
-    }
-    
-    return hasCycle(task.id);
-}
-
-
 function displayResults(result) {
     const resultsSection = document.getElementById('resultsSection');
     const resultsDiv = document.getElementById('results');
@@ -1180,6 +1052,17 @@ async function validateAndImportTasks() {
             statusDiv.className = 'bulk-import-status show import-success';
         }
         
+        if (result.warnings && result.warnings.length > 0) {
+            html += '<div style="margin-top: 15px; padding-top: 15px; border-top: 1px solid rgba(0,0,0,0.1);"><strong>⚠️ Imported with warnings:</strong><ul style="margin: 5px 0 0 20px;">';
+            result.warnings.slice(0, 3).forEach(warned => {
+                html += `<li>"${warned.title}" (Row ${warned.index + 1}): ${warned.warning}</li>`;
+            });
+            if (result.warnings.length > 3) {
+                html += `<li>... and ${result.warnings.length - 3} more warnings</li>`;
+            }
+            html += '</ul></div>';
+        }
+        
         statusDiv.innerHTML = html;
         
         document.getElementById('bulkImportJson').value = '';